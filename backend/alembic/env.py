@@ -3,7 +3,7 @@ import sys
 from logging.config import fileConfig
 from pathlib import Path
 
-from sqlalchemy import engine_from_config, create_engine
+from sqlalchemy import engine_from_config, create_engine, event
 from sqlalchemy import pool
 
 from alembic import context
@@ -25,8 +25,12 @@ if config.config_file_name is not None:
 from models import Base
 target_metadata = Base.metadata
 
+import migration_utils
+
 # Get the database URL from environment
 database_url = os.environ.get('DATABASE_URL')
+# SQLite cannot ALTER most constraints in place; batch mode rebuilds the table
+render_as_batch = database_url.startswith('sqlite')
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
@@ -35,6 +39,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=render_as_batch,
     )
 
     with context.begin_transaction():
@@ -43,14 +48,43 @@ def run_migrations_offline() -> None:
 def run_migrations_online() -> None:
     """Run migrations in 'online' mode."""
     connectable = create_engine(database_url, poolclass=pool.NullPool)
+    dry_run = migration_utils.dry_run()
+    if dry_run and render_as_batch:
+        # pysqlite only opens transactions for DML; the dry run needs DDL rolled back too
+        @event.listens_for(connectable, 'connect')
+        def _manual_transactions(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(connectable, 'begin')
+        def _begin(connection):
+            connection.exec_driver_sql('BEGIN')
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        if not dry_run:
+            context.configure(
+                connection=connection, target_metadata=target_metadata,
+                render_as_batch=render_as_batch
+            )
+            with context.begin_transaction():
+                context.run_migrations()
+            return
 
-        with context.begin_transaction():
+        # Large-table helpers only report; everything else runs and is rolled back.
+        # Begun before configure() so Alembic treats it as external and never commits it
+        with connection.begin() as transaction:
+            context.configure(
+                connection=connection, target_metadata=target_metadata,
+                render_as_batch=render_as_batch
+            )
+            if connection.dialect.name == 'postgresql':
+                connection.exec_driver_sql(f"SET LOCAL lock_timeout = '{migration_utils.LOCK_TIMEOUT}'")
             context.run_migrations()
+            transaction.rollback()
+        total = migration_utils.estimated_total()
+        migration_utils.logger.info(
+            "[dry run] rolled back; %d large-table operations, ~%.2fs blocking writes, ~%.2fs in total",
+            total['operations'], total['blocking_seconds'], total['duration_seconds']
+        )
 
 if context.is_offline_mode():
     run_migrations_offline()
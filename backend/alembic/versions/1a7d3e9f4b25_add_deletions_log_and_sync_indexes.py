@@ -0,0 +1,72 @@
+"""Add deletions log and updated_at indexes for delta sync
+
+Revision ID: 1a7d3e9f4b25
+Revises: f2c84a9d5e61
+Create Date: 2026-10-18 14:20:12.442761
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_utils import create_index, drop_index
+from sync import SYNCED_TABLES
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a7d3e9f4b25'
+down_revision: Union[str, Sequence[str], None] = 'f2c84a9d5e61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _trigger_ddl(table: str, entity_type: str) -> str:
+    if op.get_bind().dialect.name == 'postgresql':
+        return (
+            f"CREATE TRIGGER {table}_log_deletion AFTER DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION log_deletion('{entity_type}')"
+        )
+    # SQLite has no trigger functions: each table gets the insert inline
+    return (
+        f"CREATE TRIGGER {table}_log_deletion AFTER DELETE ON {table} "
+        f"BEGIN INSERT INTO deletions (entity_type, entity_id, deleted_at) "
+        f"VALUES ('{entity_type}', OLD.id, strftime('%Y-%m-%d %H:%M:%f', 'now')); END"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('deletions',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=False),
+    sa.Column('entity_id', sa.String(length=36), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_deletions_deleted_at'), 'deletions', ['deleted_at'], unique=False)
+    
+    # A trigger also records rows removed by ON DELETE CASCADE and by archival
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            CREATE OR REPLACE FUNCTION log_deletion() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO deletions (entity_type, entity_id, deleted_at) VALUES (TG_ARGV[0], OLD.id, now());
+                RETURN OLD;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+    for table, entity_type in SYNCED_TABLES.items():
+        op.execute(_trigger_ddl(table, entity_type))
+        create_index(op.f(f'ix_{table}_updated_at'), table, ['updated_at'], unique=False)
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    for table in SYNCED_TABLES:
+        drop_index(op.f(f'ix_{table}_updated_at'), table)
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_log_deletion" + (f" ON {table}" if postgres else ""))
+    if postgres:
+        op.execute("DROP FUNCTION IF EXISTS log_deletion()")
+    op.drop_index(op.f('ix_deletions_deleted_at'), table_name='deletions')
+    op.drop_table('deletions')
@@ -0,0 +1,35 @@
+"""Add version columns for optimistic concurrency
+
+Revision ID: 2b8e6f0c4d17
+Revises: 1a7d3e9f4b25
+Create Date: 2026-10-18 16:02:37.918406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_utils import add_column, drop_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b8e6f0c4d17'
+down_revision: Union[str, Sequence[str], None] = '1a7d3e9f4b25'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ['tools', 'founders', 'facebook_profiles', 'templates', 'outreach_records']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A constant server default lets Postgres add the column without a rewrite
+    for table in VERSIONED_TABLES:
+        add_column(table, sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(VERSIONED_TABLES):
+        drop_column(table, 'version')
@@ -0,0 +1,30 @@
+"""Store response headers with idempotency keys
+
+Revision ID: 3f8a6d2c9e41
+Revises: 9a5c2f7e1b38
+Create Date: 2026-10-19 09:12:37.481256
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_utils import add_column, drop_column
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8a6d2c9e41'
+down_revision: Union[str, Sequence[str], None] = '9a5c2f7e1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    add_column('idempotency_keys', sa.Column('response_headers', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_column('idempotency_keys', 'response_headers')
@@ -0,0 +1,71 @@
+"""Add outreach_events log partitioned by month
+
+Revision ID: 5b1e9a7c3d20
+Revises: ddfe42834cd8
+Create Date: 2026-10-18 09:12:41.530217
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from events import partition_ddl, upcoming_months
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1e9a7c3d20'
+down_revision: Union[str, Sequence[str], None] = 'ddfe42834cd8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    outreach_status = postgresql.ENUM(
+        'MESSAGE_GENERATED', 'MESSAGE_SENT', 'REPLIED', 'CLOSED', 'GIVEAWAY_RUNNING',
+        name='outreachstatus', create_type=False
+    )
+    op.create_table('outreach_events',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('outreach_id', sa.String(length=36), nullable=False),
+    sa.Column('founder_id', sa.String(length=36), nullable=False),
+    sa.Column('tool_id', sa.String(length=36), nullable=False),
+    sa.Column('fb_profile_id', sa.String(length=36), nullable=False),
+    sa.Column('from_status', outreach_status, nullable=True),
+    sa.Column('to_status', outreach_status, nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index('ix_outreach_events_created_at', 'outreach_events', ['created_at'], unique=False, postgresql_using='brin')
+    op.create_index('ix_outreach_events_outreach_id_created_at', 'outreach_events', ['outreach_id', 'created_at'], unique=False)
+    op.create_index('ix_outreach_events_to_status_created_at', 'outreach_events', ['to_status', 'created_at'], unique=False)
+    op.create_index('ix_outreach_events_fb_profile_id_to_status_created_at', 'outreach_events', ['fb_profile_id', 'to_status', 'created_at'], unique=False)
+    
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE TABLE outreach_events_default PARTITION OF outreach_events DEFAULT")
+        for month_start in upcoming_months(datetime.now(timezone.utc), 3):
+            op.execute(partition_ddl(month_start))
+        new_id, now = "gen_random_uuid()::text", "now()"
+    else:
+        new_id, now = "lower(hex(randomblob(16)))", "CURRENT_TIMESTAMP"
+    
+    # Seed one event per existing record so the funnel has a starting point;
+    # the history before this migration cannot be recovered
+    op.execute(
+        "INSERT INTO outreach_events (id, created_at, outreach_id, founder_id, tool_id, fb_profile_id, from_status, to_status) "
+        f"SELECT {new_id}, COALESCE(updated_at, created_at, {now}), id, founder_id, tool_id, fb_profile_id, NULL, "
+        "COALESCE(status, 'MESSAGE_GENERATED') FROM outreach_records"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_outreach_events_fb_profile_id_to_status_created_at', table_name='outreach_events')
+    op.drop_index('ix_outreach_events_to_status_created_at', table_name='outreach_events')
+    op.drop_index('ix_outreach_events_outreach_id_created_at', table_name='outreach_events')
+    op.drop_index('ix_outreach_events_created_at', table_name='outreach_events')
+    op.drop_table('outreach_events')
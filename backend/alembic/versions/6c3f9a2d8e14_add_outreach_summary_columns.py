@@ -0,0 +1,84 @@
+"""Add denormalized outreach summaries to founders and profiles
+
+Revision ID: 6c3f9a2d8e14
+Revises: 2b8e6f0c4d17
+Create Date: 2026-10-18 17:24:53.106728
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migration_utils import add_column, backfill, create_index, drop_column, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c3f9a2d8e14'
+down_revision: Union[str, Sequence[str], None] = '2b8e6f0c4d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The tables as of this revision, rather than the models, which keep changing
+founders = sa.table('founders', sa.column('id'), sa.column('outreach_count'), sa.column('last_outreach_at'),
+                    sa.column('latest_status'))
+facebook_profiles = sa.table('facebook_profiles', sa.column('id'), sa.column('outreach_count'),
+                             sa.column('last_outreach_at'))
+record_tables = [
+    sa.table(name, sa.column('founder_id'), sa.column('fb_profile_id'), sa.column('status'), sa.column('created_at'))
+    for name in ('outreach_records', 'outreach_records_archive')
+]
+
+
+def _records(owner, owner_column: str):
+    """Outreach records of the row being updated, archived ones included."""
+    return sa.union_all(*[
+        sa.select(records.c.status, records.c.created_at).where(records.c[owner_column] == owner.c.id).correlate(owner)
+        for records in record_tables
+    ]).subquery()
+
+
+def _summary_values(owner, owner_column: str) -> dict:
+    records = _records(owner, owner_column)
+    return dict(
+        outreach_count=sa.select(sa.func.count()).select_from(records).scalar_subquery(),
+        last_outreach_at=sa.select(sa.func.max(records.c.created_at)).scalar_subquery(),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    outreach_status = postgresql.ENUM(
+        'MESSAGE_GENERATED', 'MESSAGE_SENT', 'REPLIED', 'CLOSED', 'GIVEAWAY_RUNNING',
+        name='outreachstatus', create_type=False
+    )
+    add_column('founders', sa.Column('outreach_count', sa.Integer(), server_default='0', nullable=False))
+    add_column('founders', sa.Column('last_outreach_at', sa.DateTime(timezone=True), nullable=True))
+    add_column('founders', sa.Column('latest_status', outreach_status, nullable=True))
+    add_column('facebook_profiles', sa.Column('outreach_count', sa.Integer(), server_default='0', nullable=False))
+    add_column('facebook_profiles', sa.Column('last_outreach_at', sa.DateTime(timezone=True), nullable=True))
+    
+    # Same values summaries.py keeps current
+    records = _records(founders, 'founder_id')
+    backfill(founders, dict(
+        _summary_values(founders, 'founder_id'),
+        latest_status=sa.select(records.c.status).order_by(records.c.created_at.desc()).limit(1).scalar_subquery(),
+    ))
+    backfill(facebook_profiles, _summary_values(facebook_profiles, 'fb_profile_id'))
+    
+    create_index(op.f('ix_founders_outreach_count'), 'founders', ['outreach_count'], unique=False)
+    create_index(op.f('ix_founders_last_outreach_at'), 'founders', ['last_outreach_at'], unique=False)
+    create_index(op.f('ix_founders_latest_status'), 'founders', ['latest_status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index(op.f('ix_founders_latest_status'), 'founders')
+    drop_index(op.f('ix_founders_last_outreach_at'), 'founders')
+    drop_index(op.f('ix_founders_outreach_count'), 'founders')
+    drop_column('facebook_profiles', 'last_outreach_at')
+    drop_column('facebook_profiles', 'outreach_count')
+    drop_column('founders', 'latest_status')
+    drop_column('founders', 'last_outreach_at')
+    drop_column('founders', 'outreach_count')
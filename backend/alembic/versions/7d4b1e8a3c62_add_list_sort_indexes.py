@@ -0,0 +1,59 @@
+"""Add sort and filter indexes for the founder and tool lists
+
+Revision ID: 7d4b1e8a3c62
+Revises: 6c3f9a2d8e14
+Create Date: 2026-10-18 19:41:08.527310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from listing import name_key, nulls_low
+from migration_utils import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4b1e8a3c62'
+down_revision: Union[str, Sequence[str], None] = '6c3f9a2d8e14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    created_at = nulls_low(sa.column('created_at'))
+    create_index('ix_tools_created_at_id', 'tools', [created_at, 'id'], unique=False)
+    create_index('ix_tools_name_key_id', 'tools', [name_key(sa.column('tool_name')), 'id'], unique=False)
+    create_index('ix_tools_with_website_created_at_id', 'tools', [created_at, 'id'], unique=False,
+                 postgresql_where=sa.text('website_url IS NOT NULL'), sqlite_where=sa.text('website_url IS NOT NULL'))
+    create_index('ix_tools_without_website_created_at_id', 'tools', [created_at, 'id'], unique=False,
+                 postgresql_where=sa.text('website_url IS NULL'), sqlite_where=sa.text('website_url IS NULL'))
+
+    create_index('ix_founders_created_at_id', 'founders', [created_at, 'id'], unique=False)
+    create_index('ix_founders_name_key_id', 'founders', [name_key(sa.column('founder_name')), 'id'], unique=False)
+    create_index('ix_founders_tool_id_created_at_id', 'founders', ['tool_id', created_at, 'id'], unique=False)
+    create_index('ix_founders_without_tool_created_at_id', 'founders', [created_at, 'id'], unique=False,
+                 postgresql_where=sa.text('tool_id IS NULL'), sqlite_where=sa.text('tool_id IS NULL'))
+    # Replace the single-column summary indexes with (key, id) ones
+    create_index('ix_founders_last_outreach_at_id', 'founders', [nulls_low(sa.column('last_outreach_at')), 'id'], unique=False)
+    create_index('ix_founders_outreach_count_id', 'founders', ['outreach_count', 'id'], unique=False)
+    drop_index(op.f('ix_founders_last_outreach_at'), 'founders')
+    drop_index(op.f('ix_founders_outreach_count'), 'founders')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index(op.f('ix_founders_outreach_count'), 'founders', ['outreach_count'], unique=False)
+    create_index(op.f('ix_founders_last_outreach_at'), 'founders', ['last_outreach_at'], unique=False)
+    drop_index('ix_founders_outreach_count_id', 'founders')
+    drop_index('ix_founders_last_outreach_at_id', 'founders')
+    drop_index('ix_founders_without_tool_created_at_id', 'founders')
+    drop_index('ix_founders_tool_id_created_at_id', 'founders')
+    drop_index('ix_founders_name_key_id', 'founders')
+    drop_index('ix_founders_created_at_id', 'founders')
+    drop_index('ix_tools_without_website_created_at_id', 'tools')
+    drop_index('ix_tools_with_website_created_at_id', 'tools')
+    drop_index('ix_tools_name_key_id', 'tools')
+    drop_index('ix_tools_created_at_id', 'tools')
@@ -0,0 +1,66 @@
+"""Add outreach_records_archive table
+
+Revision ID: 8e2f4c61a9b7
+Revises: 5b1e9a7c3d20
+Create Date: 2026-10-18 10:03:17.284905
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migration_utils import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e2f4c61a9b7'
+down_revision: Union[str, Sequence[str], None] = '5b1e9a7c3d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    outreach_status = postgresql.ENUM(
+        'MESSAGE_GENERATED', 'MESSAGE_SENT', 'REPLIED', 'CLOSED', 'GIVEAWAY_RUNNING',
+        name='outreachstatus', create_type=False
+    )
+    op.create_table('outreach_records_archive',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('founder_id', sa.String(length=36), nullable=False),
+    sa.Column('tool_id', sa.String(length=36), nullable=False),
+    sa.Column('fb_profile_id', sa.String(length=36), nullable=False),
+    sa.Column('template_id', sa.String(length=36), nullable=True),
+    sa.Column('generated_message', sa.Text(), nullable=True),
+    sa.Column('note', sa.Text(), nullable=True),
+    sa.Column('status', outreach_status, nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['fb_profile_id'], ['facebook_profiles.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['founder_id'], ['founders.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['template_id'], ['templates.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['tool_id'], ['tools.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_outreach_records_archive_fb_profile_id'), 'outreach_records_archive', ['fb_profile_id'], unique=False)
+    op.create_index(op.f('ix_outreach_records_archive_founder_id'), 'outreach_records_archive', ['founder_id'], unique=False)
+    op.create_index(op.f('ix_outreach_records_archive_template_id'), 'outreach_records_archive', ['template_id'], unique=False)
+    op.create_index(op.f('ix_outreach_records_archive_tool_id'), 'outreach_records_archive', ['tool_id'], unique=False)
+    op.create_index(op.f('ix_outreach_records_archive_updated_at'), 'outreach_records_archive', ['updated_at'], unique=False)
+    # Lets the archival job find its next batch without scanning active records
+    create_index('ix_outreach_records_closed_updated_at', 'outreach_records', ['updated_at'], unique=False,
+                 postgresql_where=sa.text("status = 'CLOSED'"), sqlite_where=sa.text("status = 'CLOSED'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index('ix_outreach_records_closed_updated_at', 'outreach_records')
+    op.drop_index(op.f('ix_outreach_records_archive_updated_at'), table_name='outreach_records_archive')
+    op.drop_index(op.f('ix_outreach_records_archive_tool_id'), table_name='outreach_records_archive')
+    op.drop_index(op.f('ix_outreach_records_archive_template_id'), table_name='outreach_records_archive')
+    op.drop_index(op.f('ix_outreach_records_archive_founder_id'), table_name='outreach_records_archive')
+    op.drop_index(op.f('ix_outreach_records_archive_fb_profile_id'), table_name='outreach_records_archive')
+    op.drop_table('outreach_records_archive')
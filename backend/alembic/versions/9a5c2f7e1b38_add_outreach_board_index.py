@@ -0,0 +1,32 @@
+"""Add status board index on outreach_records
+
+Revision ID: 9a5c2f7e1b38
+Revises: 7d4b1e8a3c62
+Create Date: 2026-10-18 20:32:51.803164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from listing import nulls_low
+from migration_utils import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a5c2f7e1b38'
+down_revision: Union[str, Sequence[str], None] = '7d4b1e8a3c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index('ix_outreach_records_status_updated_at_id', 'outreach_records',
+                 ['status', nulls_low(sa.column('updated_at'), descending=True), sa.column('id').desc()], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index('ix_outreach_records_status_updated_at_id', 'outreach_records')
@@ -0,0 +1,49 @@
+"""Add normalized URL columns for duplicate-lead lookup
+
+Revision ID: a3d7f0e85c14
+Revises: 8e2f4c61a9b7
+Create Date: 2026-10-18 10:47:52.119364
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from leads import normalize_url
+from migration_utils import add_column, backfill_rows, create_index, drop_column, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d7f0e85c14'
+down_revision: Union[str, Sequence[str], None] = '8e2f4c61a9b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill(table: str, source: str, target: str) -> None:
+    # Normalization lives in Python, so the backfill does too
+    rows = sa.table(table, sa.column('id'), sa.column(source), sa.column(target))
+    backfill_rows(rows, [rows.c[source]], lambda row: {target: normalize_url(row[1])},
+                  where=sa.and_(rows.c[source].isnot(None), rows.c[target].is_(None)))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    add_column('tools', sa.Column('website_url_normalized', sa.String(length=500), nullable=True))
+    add_column('founders', sa.Column('social_profile_url_normalized', sa.String(length=500), nullable=True))
+    _backfill('tools', 'website_url', 'website_url_normalized')
+    _backfill('founders', 'social_profile_url', 'social_profile_url_normalized')
+    # Not unique: existing data may already contain duplicates
+    create_index('ix_tools_website_url_normalized', 'tools', ['website_url_normalized'], unique=False,
+                 postgresql_where=sa.text('website_url_normalized IS NOT NULL'), sqlite_where=sa.text('website_url_normalized IS NOT NULL'))
+    create_index('ix_founders_social_profile_url_normalized', 'founders', ['social_profile_url_normalized'], unique=False,
+                 postgresql_where=sa.text('social_profile_url_normalized IS NOT NULL'), sqlite_where=sa.text('social_profile_url_normalized IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index('ix_founders_social_profile_url_normalized', 'founders')
+    drop_index('ix_tools_website_url_normalized', 'tools')
+    drop_column('founders', 'social_profile_url_normalized')
+    drop_column('tools', 'website_url_normalized')
@@ -0,0 +1,44 @@
+"""Log deletions of archived outreach records
+
+Revision ID: a3f7c1e9d4b6
+Revises: e5a1c7f3b920
+Create Date: 2026-10-19 17:05:39.804122
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f7c1e9d4b6'
+down_revision: Union[str, Sequence[str], None] = 'e5a1c7f3b920'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Archived records are in snapshots, so one removed by ON DELETE CASCADE
+    # needs a tombstone as much as a hot one does. The entity type is the
+    # same: sync clients already dropped the record when it was archived and
+    # ignore the repeat
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE TRIGGER outreach_records_archive_log_deletion AFTER DELETE ON outreach_records_archive "
+            "FOR EACH ROW EXECUTE FUNCTION log_deletion('outreach')"
+        )
+    else:
+        op.execute(
+            "CREATE TRIGGER outreach_records_archive_log_deletion AFTER DELETE ON outreach_records_archive "
+            "BEGIN INSERT INTO deletions (entity_type, entity_id, deleted_at) "
+            "VALUES ('outreach', OLD.id, strftime('%Y-%m-%d %H:%M:%f', 'now')); END"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgres = op.get_bind().dialect.name == 'postgresql'
+    op.execute("DROP TRIGGER IF EXISTS outreach_records_archive_log_deletion"
+               + (" ON outreach_records_archive" if postgres else ""))
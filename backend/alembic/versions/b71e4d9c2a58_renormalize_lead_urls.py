@@ -0,0 +1,41 @@
+"""Renormalize lead URLs whose path case was folded by mistake
+
+Revision ID: b71e4d9c2a58
+Revises: 3f8a6d2c9e41
+Create Date: 2026-10-19 14:06:21.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from leads import normalize_url
+from migration_utils import backfill_rows
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71e4d9c2a58'
+down_revision: Union[str, Sequence[str], None] = '3f8a6d2c9e41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _renormalize(table: str, source: str, target: str) -> None:
+    # Hosts merely ending in a social domain (dropbox.com, netflix.com) had
+    # their paths lowercased; only URLs with upper case can have changed
+    rows = sa.table(table, sa.column('id'), sa.column(source), sa.column(target))
+    backfill_rows(rows, [rows.c[source]], lambda row: {target: normalize_url(row[1])},
+                  where=sa.and_(rows.c[source].isnot(None), rows.c[source] != sa.func.lower(rows.c[source])))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _renormalize('tools', 'website_url', 'website_url_normalized')
+    _renormalize('founders', 'social_profile_url', 'social_profile_url_normalized')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The corrected values are what the application writes either way
+    pass
@@ -0,0 +1,46 @@
+"""Add (key, id) indexes for the founder sorts within one tool or with a tool
+
+Revision ID: e5a1c7f3b920
+Revises: b71e4d9c2a58
+Create Date: 2026-10-19 16:22:47.193604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from listing import name_key, nulls_low
+from migration_utils import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c7f3b920'
+down_revision: Union[str, Sequence[str], None] = 'b71e4d9c2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    create_index('ix_founders_tool_id_name_key_id', 'founders',
+                 ['tool_id', name_key(sa.column('founder_name')), 'id'], unique=False)
+    create_index('ix_founders_tool_id_last_outreach_at_id', 'founders',
+                 ['tool_id', nulls_low(sa.column('last_outreach_at')), 'id'], unique=False)
+    create_index('ix_founders_tool_id_outreach_count_id', 'founders',
+                 ['tool_id', 'outreach_count', 'id'], unique=False)
+    # Replaces the created_at-only index, which left the id tie-break to a sort
+    create_index('ix_founders_with_tool_created_at_id', 'founders',
+                 [nulls_low(sa.column('created_at')), 'id'], unique=False,
+                 postgresql_where=sa.text('tool_id IS NOT NULL'), sqlite_where=sa.text('tool_id IS NOT NULL'))
+    drop_index('ix_founders_with_tool_created_at', 'founders')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    create_index('ix_founders_with_tool_created_at', 'founders', ['created_at'], unique=False,
+                 postgresql_where=sa.text('tool_id IS NOT NULL'), sqlite_where=sa.text('tool_id IS NOT NULL'))
+    drop_index('ix_founders_with_tool_created_at_id', 'founders')
+    drop_index('ix_founders_tool_id_outreach_count_id', 'founders')
+    drop_index('ix_founders_tool_id_last_outreach_at_id', 'founders')
+    drop_index('ix_founders_tool_id_name_key_id', 'founders')
@@ -0,0 +1,37 @@
+"""Add send-queue leases and per-profile send budget
+
+Revision ID: e5f19c7a2b43
+Revises: d4a8e3b16c92
+Create Date: 2026-10-18 12:51:09.214877
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migration_utils import add_column, create_index, drop_column, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f19c7a2b43'
+down_revision: Union[str, Sequence[str], None] = 'd4a8e3b16c92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    add_column('facebook_profiles', sa.Column('sends_per_hour', sa.Integer(), nullable=True))
+    add_column('outreach_records', sa.Column('leased_by', sa.String(length=100), nullable=True))
+    add_column('outreach_records', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+    create_index('ix_outreach_records_send_queue', 'outreach_records', ['fb_profile_id', 'created_at'], unique=False,
+                 postgresql_where=sa.text("status = 'MESSAGE_GENERATED'"), sqlite_where=sa.text("status = 'MESSAGE_GENERATED'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index('ix_outreach_records_send_queue', 'outreach_records')
+    drop_column('outreach_records', 'lease_expires_at')
+    drop_column('outreach_records', 'leased_by')
+    drop_column('facebook_profiles', 'sends_per_hour')
@@ -0,0 +1,73 @@
+"""Add founder/profile uniqueness and anti-join indexes
+
+Revision ID: f2c84a9d5e61
+Revises: e5f19c7a2b43
+Create Date: 2026-10-18 13:34:46.058132
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from migration_utils import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c84a9d5e61'
+down_revision: Union[str, Sequence[str], None] = 'e5f19c7a2b43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+ARCHIVED_COLUMNS = (
+    'id, founder_id, tool_id, fb_profile_id, template_id, generated_message, note, status, created_at, updated_at'
+)
+# Every record of a founder/profile pair but its most recently updated one
+OLDER_DUPLICATES = """
+    SELECT id FROM (
+        SELECT id, row_number() OVER (
+            PARTITION BY founder_id, fb_profile_id
+            ORDER BY updated_at IS NULL, updated_at DESC, id DESC
+        ) AS position
+        FROM outreach_records
+    ) AS ranked
+    WHERE position > 1
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Double-messages from before the constraint move to the archive, so the
+    # unique index can always be built and history is kept
+    archive = (
+        f"INSERT INTO outreach_records_archive ({ARCHIVED_COLUMNS}, archived_at) "
+        f"SELECT {ARCHIVED_COLUMNS}, CURRENT_TIMESTAMP FROM outreach_records WHERE id IN ({OLDER_DUPLICATES})"
+    )
+    remove = f"DELETE FROM outreach_records WHERE id IN ({OLDER_DUPLICATES})"
+    if context.is_offline_mode():
+        op.execute(archive)
+        op.execute(remove)
+    else:
+        bind = op.get_bind()
+        archived = bind.execute(sa.text(archive)).rowcount
+        bind.execute(sa.text(remove))
+        if archived:
+            logger.warning(
+                "Archived %d duplicate outreach records, keeping the latest per founder/profile pair", archived
+            )
+    create_index('uq_outreach_records_founder_id_fb_profile_id', 'outreach_records', ['founder_id', 'fb_profile_id'],
+                 unique=True)
+    create_index('ix_outreach_records_archive_founder_id_fb_profile_id', 'outreach_records_archive',
+                 ['founder_id', 'fb_profile_id'], unique=False)
+    create_index('ix_founders_with_tool_created_at', 'founders', ['created_at'], unique=False,
+                 postgresql_where=sa.text('tool_id IS NOT NULL'), sqlite_where=sa.text('tool_id IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    drop_index('ix_founders_with_tool_created_at', 'founders')
+    drop_index('ix_outreach_records_archive_founder_id_fb_profile_id', 'outreach_records_archive')
+    drop_index('uq_outreach_records_founder_id_fb_profile_id', 'outreach_records')
@@ -0,0 +1,87 @@
+from datetime import datetime, timezone, timedelta
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import select, insert, func
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models import OutreachRecord, OutreachRecordArchive, OutreachStatus
+
+ARCHIVED_COLUMNS = [
+    'id', 'founder_id', 'tool_id', 'fb_profile_id', 'template_id',
+    'generated_message', 'note', 'status', 'created_at', 'updated_at',
+]
+
+
+def archive_batch_statement(cutoff: datetime, batch_size: int):
+    """Move one batch of closed records into the archive in a single statement."""
+    hot = OutreachRecord.__table__
+    candidates = (
+        select(hot.c.id)
+        .where(hot.c.status == OutreachStatus.CLOSED, hot.c.updated_at < cutoff)
+        .order_by(hot.c.updated_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    moved = (
+        hot.delete()
+        .where(hot.c.id.in_(candidates.scalar_subquery()))
+        .returning(*[hot.c[name] for name in ARCHIVED_COLUMNS])
+        .cte('moved')
+    )
+    return insert(OutreachRecordArchive.__table__).from_select(
+        ARCHIVED_COLUMNS + ['archived_at'],
+        select(*[moved.c[name] for name in ARCHIVED_COLUMNS], func.now())
+    )
+
+
+async def _archive_batch_sqlite(session, cutoff: datetime, batch_size: int) -> int:
+    # SQLite has no data-modifying CTEs; its single writer keeps the three
+    # statements atomic without row locks
+    hot = OutreachRecord.__table__
+    result = await session.execute(
+        select(hot.c.id)
+        .where(hot.c.status == OutreachStatus.CLOSED, hot.c.updated_at < cutoff)
+        .order_by(hot.c.updated_at)
+        .limit(batch_size)
+    )
+    ids = result.scalars().all()
+    if ids:
+        await session.execute(insert(OutreachRecordArchive.__table__).from_select(
+            ARCHIVED_COLUMNS + ['archived_at'],
+            select(*[hot.c[name] for name in ARCHIVED_COLUMNS], func.now()).where(hot.c.id.in_(ids))
+        ))
+        await session.execute(hot.delete().where(hot.c.id.in_(ids)))
+    return len(ids)
+
+
+async def archive_closed_outreach(
+    session_factory: async_sessionmaker,
+    older_than_days: int,
+    batch_size: int = 500,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> tuple:
+    """Archive records closed for more than ``older_than_days``, one transaction per batch.
+
+    Returns ``(archived, batches)``. ``on_batch`` is awaited with the running
+    total after every committed batch.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    archived = 0
+    batches = 0
+    while True:
+        async with session_factory() as session:
+            if session.bind.dialect.name == 'sqlite':
+                moved = await _archive_batch_sqlite(session, cutoff, batch_size)
+            else:
+                result = await session.execute(archive_batch_statement(cutoff, batch_size))
+                moved = result.rowcount or 0
+            await session.commit()
+        if moved == 0:
+            break
+        archived += moved
+        batches += 1
+        if on_batch:
+            await on_batch(archived)
+        if moved < batch_size:
+            break
+    return archived, batches
@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote, urlencode
+
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.routing import Match, Router
+from starlette.types import Scope
+
+from database import AsyncSessionLocal, SHARED_SESSION_SCOPE_KEY, engine
+
+logger = logging.getLogger(__name__)
+
+REF_KEY = '$ref'
+# "{create_template.id}" in a path is replaced by that field of an earlier response
+PATH_REF_PATTERN = re.compile(r'\{([A-Za-z_][A-Za-z0-9_-]*(?:\.[A-Za-z0-9_-]+)+)\}')
+# Sub-response headers passed back to the caller
+FORWARDED_HEADERS = ('etag', 'location', 'retry-after')
+
+
+class BatchError(ValueError):
+    pass
+
+
+class UnresolvedReference(BatchError):
+    pass
+
+
+def match_route(router: Router, method: str, path: str) -> Optional[str]:
+    """Path template of the route that would serve ``method path``."""
+    scope = {'type': 'http', 'method': method, 'path': path, 'root_path': ''}
+    for route in router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return None
+
+
+def validate_operations(router: Router, operations, blocked: Dict[Tuple[str, str], str]) -> None:
+    """Reject the whole batch up front rather than failing halfway through."""
+    seen = set()
+    for index, operation in enumerate(operations):
+        if not operation.path.startswith('/api/') or '?' in operation.path:
+            raise BatchError(f"operation {index}: path must start with /api/ and pass parameters in 'query'")
+        reason = blocked.get((operation.method.value, match_route(router, operation.method.value, operation.path)))
+        if reason:
+            raise BatchError(f"operation {index}: {reason}")
+        if operation.id is not None:
+            if operation.id in seen:
+                raise BatchError(f"operation {index}: duplicate id '{operation.id}'")
+            seen.add(operation.id)
+
+
+def _lookup(reference: str, results: Dict[str, dict]) -> Any:
+    name, *fields = reference.split('.')
+    result = results.get(name)
+    if result is None:
+        raise UnresolvedReference(f"'{reference}' refers to no earlier operation")
+    if result['status'] >= 400:
+        raise UnresolvedReference(f"'{reference}' refers to an operation that failed")
+    value = result['body']
+    for field in fields:
+        try:
+            value = value[int(field)] if isinstance(value, list) else value[field]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise UnresolvedReference(f"'{reference}' is not in that operation's response")
+    return value
+
+
+def resolve(value: Any, results: Dict[str, dict]) -> Any:
+    """Replace ``{"$ref": "name.field"}`` objects with earlier response values."""
+    if isinstance(value, dict):
+        if set(value) == {REF_KEY}:
+            return _lookup(value[REF_KEY], results)
+        return {key: resolve(item, results) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve(item, results) for item in value]
+    return value
+
+
+def resolve_path(path: str, results: Dict[str, dict]) -> str:
+    return PATH_REF_PATTERN.sub(lambda match: quote(str(_lookup(match.group(1), results)), safe=''), path)
+
+
+def _query_string(query: Dict[str, Any]) -> bytes:
+    pairs = []
+    for key, value in query.items():
+        for item in value if isinstance(value, list) else [value]:
+            if item is None:
+                continue
+            pairs.append((key, str(item).lower() if isinstance(item, bool) else str(item)))
+    return urlencode(pairs).encode()
+
+
+async def _dispatch(router: Router, parent_scope: Scope, session, method: str, path: str,
+                    query: Dict[str, Any], headers: Dict[str, str], body: Any) -> dict:
+    payload = b'' if body is None else json.dumps(body).encode()
+    raw_headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers.items()]
+    if body is not None:
+        raw_headers.append((b'content-type', b'application/json'))
+    raw_headers.append((b'content-length', str(len(payload)).encode()))
+    scope = {
+        'type': 'http',
+        'asgi': parent_scope.get('asgi', {'version': '3.0'}),
+        'http_version': parent_scope.get('http_version', '1.1'),
+        'method': method,
+        'scheme': parent_scope.get('scheme', 'http'),
+        'server': parent_scope.get('server'),
+        'client': parent_scope.get('client'),
+        'root_path': '',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': _query_string(query),
+        'headers': raw_headers,
+        'state': {},
+        SHARED_SESSION_SCOPE_KEY: session,
+    }
+    # Lets HTTPException and validation errors render exactly as they do over HTTP
+    for key in ('app', 'starlette.exception_handlers'):
+        if key in parent_scope:
+            scope[key] = parent_scope[key]
+
+    complete = asyncio.Event()
+    request_sent = False
+    status = 500
+    response_headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': payload, 'more_body': False}
+        await complete.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+            for name, value in message.get('headers', []):
+                response_headers[name.decode('latin-1').lower()] = value.decode('latin-1')
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                complete.set()
+
+    try:
+        await router(scope, receive, send)
+    except StarletteHTTPException as exc:
+        # Raised by the router itself for unknown paths and wrong methods
+        return {'status': exc.status_code, 'headers': {}, 'body': {'detail': exc.detail}}
+    except Exception:
+        logger.exception(f"Batch operation {method} {path} failed")
+        return {'status': 500, 'headers': {}, 'body': {'detail': 'Internal Server Error'}}
+    finally:
+        complete.set()
+
+    content = b''.join(chunks)
+    if not content:
+        decoded = None
+    elif response_headers.get('content-type', '').startswith('application/json'):
+        decoded = json.loads(content)
+    else:
+        decoded = content.decode('utf-8', errors='replace')
+    forwarded = {name: response_headers[name] for name in FORWARDED_HEADERS if name in response_headers}
+    return {'status': status, 'headers': forwarded, 'body': decoded}
+
+
+async def _run(router: Router, parent_scope: Scope, session, operations, atomic: bool) -> Tuple[List[dict], bool]:
+    results: List[dict] = []
+    by_id: Dict[str, dict] = {}
+    failed = False
+    for operation in operations:
+        try:
+            path = resolve_path(operation.path, by_id)
+            query = resolve(operation.query, by_id)
+            body = resolve(operation.body, by_id)
+        except UnresolvedReference as exc:
+            result = {'status': 400, 'headers': {}, 'body': {'detail': str(exc)}}
+        else:
+            result = await _dispatch(
+                router, parent_scope, session, operation.method.value, path, query, operation.headers, body
+            )
+        result['id'] = operation.id
+        results.append(result)
+        if operation.id is not None:
+            by_id[operation.id] = result
+
+        if result['status'] >= 400:
+            failed = True
+            if atomic:
+                break
+            await session.rollback()
+        elif not atomic:
+            await session.commit()
+        # Each operation sees the database, not objects cached by the one before
+        session.expunge_all()
+    return results, failed
+
+
+async def execute_batch(router: Router, parent_scope: Scope, operations, atomic: bool) -> Tuple[bool, List[dict]]:
+    """Run ``operations`` in order through ``router`` on one shared session.
+
+    Non-atomic batches commit or roll back after every operation. Atomic
+    batches run inside one outer transaction: the endpoints' own commits and
+    rollbacks only touch savepoints, and the first failing operation rolls
+    the whole batch back and skips the rest. Returns whether the work of the
+    successful operations was committed, and one result per operation run.
+    """
+    if not atomic:
+        async with AsyncSessionLocal() as session:
+            results, _ = await _run(router, parent_scope, session, operations, atomic=False)
+        return True, results
+
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        async with AsyncSessionLocal(bind=connection, join_transaction_mode='create_savepoint') as session:
+            results, failed = await _run(router, parent_scope, session, operations, atomic=True)
+        if failed:
+            await transaction.rollback()
+        else:
+            await transaction.commit()
+    return not failed, results
@@ -0,0 +1,201 @@
+import asyncio
+import os
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.dml import Delete, UpdateBase
+from sqlalchemy.sql.elements import TextClause
+
+COALESCING_ENABLED = os.environ.get('COALESCING_ENABLED', '1') == '1'
+
+# Coalesced read paths and the tables each one reads. A commit that wrote
+# to any of them starts a new generation, so requests arriving after it
+# never join a read that began before it
+COALESCED_PATHS: Dict[str, Tuple[str, ...]] = {
+    '/api/stats': ('founders', 'outreach_records', 'outreach_records_archive'),
+    '/api/tools': ('tools',),
+    '/api/founders': ('founders', 'tools'),
+    '/api/profiles': ('facebook_profiles',),
+    '/api/templates': ('templates',),
+    '/api/outreach': (
+        'outreach_records', 'outreach_records_archive', 'founders', 'tools', 'facebook_profiles', 'templates'
+    ),
+    '/api/outreach/funnel': ('outreach_records', 'outreach_records_archive'),
+    '/api/outreach/board': ('outreach_records', 'founders', 'tools', 'facebook_profiles', 'templates'),
+}
+# Request headers that change the response body
+VARY_HEADERS = (b'accept-encoding',)
+
+_WRITTEN_TABLES = 'coalesce.written_tables'
+_ALL_TABLES = '*'
+# Foreign key actions through which a DELETE writes to other tables
+_CASCADING_ACTIONS = ('CASCADE', 'SET NULL', 'SET DEFAULT')
+
+
+def cascaded_tables(table) -> Set[str]:
+    """``table`` and every table its ON DELETE actions reach, transitively."""
+    reached = {table.name}
+    pending = [table]
+    while pending:
+        parent = pending.pop()
+        for child in parent.metadata.tables.values():
+            if child.name in reached:
+                continue
+            if any(
+                foreign_key.column.table is parent and (foreign_key.ondelete or '').upper() in _CASCADING_ACTIONS
+                for foreign_key in child.foreign_keys
+            ):
+                reached.add(child.name)
+                pending.append(child)
+    return reached
+
+
+class TableGenerations:
+    """Per-table counters, bumped when a transaction that wrote the table commits."""
+
+    def __init__(self):
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.everything = 0
+
+    def bump(self, table: str) -> None:
+        if table == _ALL_TABLES:
+            self.everything += 1
+        else:
+            self.counters[table] += 1
+
+    def snapshot(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return (self.everything, *(self.counters[table] for table in tables))
+
+    def track(self, engine: AsyncEngine) -> None:
+        @event.listens_for(engine.sync_engine, "after_execute")
+        def after_execute(connection, clauseelement, multiparams, params, execution_options, result):
+            if isinstance(clauseelement, Delete):
+                # The database deletes or updates the referencing rows too
+                tables = cascaded_tables(clauseelement.table)
+            elif isinstance(clauseelement, UpdateBase):
+                tables = {clauseelement.table.name}
+            elif isinstance(clauseelement, TextClause):
+                # Raw SQL could have written anything
+                tables = {_ALL_TABLES}
+            else:
+                return
+            connection.info.setdefault(_WRITTEN_TABLES, set()).update(tables)
+
+        @event.listens_for(engine.sync_engine, "commit")
+        def on_commit(connection):
+            for table in connection.info.pop(_WRITTEN_TABLES, ()):
+                self.bump(table)
+
+        @event.listens_for(engine.sync_engine, "rollback")
+        def on_rollback(connection):
+            connection.info.pop(_WRITTEN_TABLES, None)
+
+
+table_generations = TableGenerations()
+
+
+class CoalescingStats:
+    def __init__(self):
+        self.requests: Dict[str, int] = defaultdict(int)
+        self.executions: Dict[str, int] = defaultdict(int)
+        self.in_flight = 0
+
+    def snapshot(self) -> dict:
+        paths = {}
+        for path, requests in sorted(self.requests.items()):
+            executions = self.executions[path]
+            paths[path] = {
+                'requests': requests,
+                'executions': executions,
+                'coalesced': requests - executions,
+                'ratio': round((requests - executions) / requests, 4) if requests else 0.0,
+            }
+        total = sum(self.requests.values())
+        executed = sum(self.executions.values())
+        return {
+            'enabled': COALESCING_ENABLED,
+            'in_flight': self.in_flight,
+            'requests': total,
+            'executions': executed,
+            'ratio': round((total - executed) / total, 4) if total else 0.0,
+            'paths': paths,
+        }
+
+
+coalescing_stats = CoalescingStats()
+
+
+def coalescing_key(scope, tables: Tuple[str, ...]) -> tuple:
+    query = sorted(parse_qsl(scope.get('query_string', b'').decode('latin-1'), keep_blank_values=True))
+    headers = dict(scope.get('headers', []))
+    varies = tuple(headers.get(name, b'') for name in VARY_HEADERS)
+    return scope['path'], urlencode(query), varies, table_generations.snapshot(tables)
+
+
+class CoalescingMiddleware:
+    """Single-flight for identical concurrent GETs.
+
+    The first request for a key runs the endpoint and buffers its response;
+    requests with the same key that arrive meanwhile wait for it and replay
+    the same status, headers and body instead of running the queries again.
+    Nothing is kept once the response is out: this shares work, not results.
+    """
+
+    def __init__(self, app, paths: Optional[Dict[str, Tuple[str, ...]]] = None, stats: CoalescingStats = coalescing_stats):
+        self.app = app
+        self.paths = COALESCED_PATHS if paths is None else paths
+        self.stats = stats
+        self.in_flight: Dict[tuple, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        tables = self.paths.get(scope.get('path')) if scope['type'] == 'http' else None
+        if not COALESCING_ENABLED or tables is None or scope['method'] != 'GET':
+            await self.app(scope, receive, send)
+            return
+
+        path = scope['path']
+        self.stats.requests[path] += 1
+        key = coalescing_key(scope, tables)
+        leader = self.in_flight.get(key)
+        if leader is not None:
+            response = await asyncio.shield(leader)
+            if response is not None:
+                await self._replay(response, send)
+                return
+            # The leader failed or its client went away; run on our own
+            self.stats.executions[path] += 1
+            await self.app(scope, receive, send)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        self.stats.executions[path] += 1
+        self.stats.in_flight += 1
+        response = None
+        try:
+            response = await self._capture(scope, receive)
+        finally:
+            del self.in_flight[key]
+            self.stats.in_flight -= 1
+            future.set_result(response)
+        await self._replay(response, send)
+
+    async def _capture(self, scope, receive) -> dict:
+        response = {'start': None, 'body': []}
+
+        async def capture(message):
+            if message['type'] == 'http.response.start':
+                response['start'] = message
+            elif message['type'] == 'http.response.body':
+                response['body'].append(message.get('body', b''))
+
+        await self.app(scope, receive, capture)
+        return {'start': response['start'], 'body': b''.join(response['body'])}
+
+    @staticmethod
+    async def _replay(response: dict, send) -> None:
+        await send(response['start'])
+        await send({'type': 'http.response.body', 'body': response['body'], 'more_body': False})
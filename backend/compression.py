@@ -0,0 +1,245 @@
+import hashlib
+import os
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Brotli and zstd are used when installed; gzip is always available
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', '1') == '1'
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_CACHE_BYTES = int(os.environ.get('COMPRESSION_CACHE_BYTES', str(32 * 1024 * 1024)))
+GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6'))
+BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '5'))
+ZSTD_LEVEL = int(os.environ.get('COMPRESSION_ZSTD_LEVEL', '3'))
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+class _GzipStream:
+    def __init__(self):
+        self.compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # Sync-flush so every streamed chunk reaches the client right away
+        return self.compressor.compress(data) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self.compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.process(data) + self.compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self):
+        self.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self.compressor.compress(data) + self.compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self.compressor.flush()
+
+
+def _gzip(data: bytes) -> bytes:
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+# Server preference order, limited to what is installed
+ENCODINGS: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[], object]]] = {}
+if brotli is not None:
+    ENCODINGS['br'] = (lambda data: brotli.compress(data, quality=BROTLI_QUALITY), _BrotliStream)
+if zstandard is not None:
+    ENCODINGS['zstd'] = (lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), _ZstdStream)
+ENCODINGS['gzip'] = (_gzip, _GzipStream)
+_preferred = [name for name in os.environ.get('COMPRESSION_ENCODINGS', 'br,zstd,gzip').split(',') if name in ENCODINGS]
+ENCODINGS = {name: ENCODINGS[name] for name in _preferred}
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Most preferred available encoding the client accepts with a non-zero q."""
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for name in ENCODINGS:
+        if accepted.get(name, accepted.get('*', 0.0)) > 0:
+            return name
+    return None
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies, bounded by total compressed size.
+
+    Keyed on the encoding and a digest of the uncompressed body: hashing is
+    far cheaper than compressing, so a payload served again, whether to
+    another client or for an unchanged ETag, is not compressed again.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[tuple, bytes]' = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[bytes]:
+        body = self.entries.get(key)
+        if body is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return body
+
+    def put(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self.entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def snapshot(self) -> dict:
+        return {
+            'entries': len(self.entries),
+            'bytes': self.size,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+compressed_body_cache = CompressedBodyCache(COMPRESSION_CACHE_BYTES)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _compressible(headers: List[Tuple[bytes, bytes]]) -> bool:
+    if _header(headers, b'content-encoding') is not None:
+        return False
+    if b'no-transform' in (_header(headers, b'cache-control') or b'').lower():
+        return False
+    content_type = (_header(headers, b'content-type') or b'').decode('latin-1').lower()
+    return content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def _encoded_headers(headers: List[Tuple[bytes, bytes]], encoding: str, length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+    kept = [(key, value) for key, value in headers if key.lower() not in (b'content-length', b'vary')]
+    vary = _header(headers, b'vary')
+    kept.append((b'vary', vary + b', Accept-Encoding' if vary else b'Accept-Encoding'))
+    kept.append((b'content-encoding', encoding.encode()))
+    if length is not None:
+        kept.append((b'content-length', str(length).encode()))
+    return kept
+
+
+class CompressionMiddleware:
+    """Compresses JSON and text responses for clients that accept it.
+
+    Bodies with a Content-Length under ``minimum_size`` go out as they are;
+    larger ones are compressed once and cached. Streamed bodies, which have
+    no Content-Length, are compressed chunk by chunk with a flush after
+    each so NDJSON lines are not held back.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE, cache: CompressedBodyCache = compressed_body_cache):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if not COMPRESSION_ENABLED or scope['type'] != 'http' or scope['method'] == 'HEAD':
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate((_header(scope.get('headers', []), b'accept-encoding') or b'').decode('latin-1'))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        compress, stream_factory = ENCODINGS[encoding]
+        start = None
+        passthrough = False
+        # Set when Content-Length is known: the body is buffered and compressed
+        # whole, even if it arrives in chunks through BaseHTTPMiddleware
+        buffered: Optional[List[bytes]] = None
+        stream = None
+
+        async def compressing_send(message):
+            nonlocal start, passthrough, buffered, stream
+            if message['type'] == 'http.response.start':
+                start = message
+                headers = message.get('headers', [])
+                length = _header(headers, b'content-length')
+                passthrough = not _compressible(headers) or (length is not None and int(length) < self.minimum_size)
+                if passthrough:
+                    await send(message)
+                elif length is not None:
+                    buffered = []
+                return
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            headers = list(start.get('headers', []))
+            if buffered is not None:
+                buffered.append(body)
+                if more_body:
+                    return
+                body = b''.join(buffered)
+                key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+                compressed = self.cache.get(key)
+                if compressed is None:
+                    compressed = compress(body)
+                    self.cache.put(key, compressed)
+                await send({**start, 'headers': _encoded_headers(headers, encoding, len(compressed))})
+                await send({'type': 'http.response.body', 'body': compressed, 'more_body': False})
+                return
+
+            if stream is None:
+                stream = stream_factory()
+                await send({**start, 'headers': _encoded_headers(headers, encoding, None)})
+            chunk = stream.compress(body) if body else b''
+            if not more_body:
+                chunk += stream.finish()
+            if chunk or not more_body:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+
+        await self.app(scope, receive, compressing_send)
@@ -0,0 +1,95 @@
+import json
+import os
+from typing import NamedTuple, Optional, Sequence
+
+from fastapi import Response
+from sqlalchemy import BigInteger, cast, column, func, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from database import IS_SQLITE
+
+# Filtered sets the planner expects to be at most this big are counted exactly
+EXACT_COUNT_THRESHOLD = int(os.environ.get('EXACT_COUNT_THRESHOLD', '10000'))
+
+TOTAL_COUNT_HEADER = 'X-Total-Count'
+TOTAL_COUNT_TYPE_HEADER = 'X-Total-Count-Type'
+EXACT = 'exact'
+ESTIMATE = 'estimate'
+
+_pg_class = table('pg_class', column('oid'), column('reltuples'))
+
+
+class TotalCount(NamedTuple):
+    value: int
+    kind: str
+
+    def __add__(self, other: 'TotalCount') -> 'TotalCount':
+        kind = EXACT if self.kind == EXACT and other.kind == EXACT else ESTIMATE
+        return TotalCount(self.value + other.value, kind)
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, keeping its bound parameters."""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, 'postgresql')
+def _compile_explain(element, compiler, **kw):
+    return 'EXPLAIN (FORMAT JSON) ' + compiler.process(element.statement, **kw)
+
+
+def page_total(rows: Sequence, limit: Optional[int], offset: int) -> Optional[TotalCount]:
+    """The exact total when the page itself reveals it: the last page, or no paging at all."""
+    if limit is None or (len(rows) < limit and (rows or offset == 0)):
+        return TotalCount(offset + len(rows), EXACT)
+    return None
+
+
+async def _exact(db: AsyncSession, query) -> TotalCount:
+    result = await db.execute(select(func.count()).select_from(query.order_by(None).subquery()))
+    return TotalCount(result.scalar_one(), EXACT)
+
+
+async def _table_estimate(db: AsyncSession, table_name: str) -> Optional[int]:
+    # -1 until the table has been vacuumed or analyzed once
+    result = await db.execute(
+        select(cast(_pg_class.c.reltuples, BigInteger)).where(_pg_class.c.oid == func.to_regclass(table_name))
+    )
+    estimate = result.scalar_one_or_none()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+async def _plan_estimate(db: AsyncSession, query) -> int:
+    result = await db.execute(Explain(query.order_by(None)))
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def count_rows(db: AsyncSession, query, table_name: str, filtered: bool) -> TotalCount:
+    """Total rows ``query`` would return, without a full scan of big tables.
+
+    Unfiltered totals come from ``pg_class.reltuples`` and filtered ones from
+    the planner's row estimate; either is replaced by an exact COUNT(*) when
+    it says the set is small. SQLite has no cheap estimate and always counts.
+    """
+    if IS_SQLITE:
+        return await _exact(db, query)
+    if filtered:
+        estimate = await _plan_estimate(db, query)
+    else:
+        estimate = await _table_estimate(db, table_name)
+    if estimate is None or estimate <= EXACT_COUNT_THRESHOLD:
+        return await _exact(db, query)
+    return TotalCount(estimate, ESTIMATE)
+
+
+def set_total_count(response: Response, total: TotalCount) -> None:
+    response.headers[TOTAL_COUNT_HEADER] = str(total.value)
+    response.headers[TOTAL_COUNT_TYPE_HEADER] = total.kind
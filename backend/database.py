@@ -1,28 +1,128 @@
 import os
+import time
+from contextvars import ContextVar
 from pathlib import Path
 from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
+from slow_queries import SKIP_OPTION, slow_query_log
+
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 DATABASE_URL = os.environ.get('DATABASE_URL')
-ASYNC_DATABASE_URL = DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://')
-
-engine = create_async_engine(
-    ASYNC_DATABASE_URL,
-    pool_size=10,
-    max_overflow=5,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=False,
-    echo=False,
-    connect_args={
-        "statement_cache_size": 0,  # Required for transaction pooler
-        "command_timeout": 30,
-    }
-)
+IS_SQLITE = DATABASE_URL.startswith('sqlite')
+if IS_SQLITE:
+    ASYNC_DATABASE_URL = DATABASE_URL.replace('sqlite://', 'sqlite+aiosqlite://', 1)
+else:
+    ASYNC_DATABASE_URL = DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://')
+
+POOL_SIZE = 10
+MAX_OVERFLOW = 5
+POOL_TIMEOUT = 30
+
+# Applied to every SQLite connection. WAL lets readers run alongside the
+# single writer; synchronous=NORMAL is durable across crashes in WAL mode
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'foreign_keys': 'ON',
+    'busy_timeout': os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000'),
+    'cache_size': '-64000',
+    'temp_store': 'MEMORY',
+    'mmap_size': str(256 * 1024 * 1024),
+}
+
+
+def _configure_sqlite(engine: AsyncEngine, writer: bool) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy, not the driver, decide when transactions begin
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        if not writer:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def on_begin(connection):
+        # The writer takes the lock up front instead of failing to upgrade
+        # a read lock halfway through the transaction
+        connection.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
+
+
+if IS_SQLITE:
+    # SQLite allows one writer at a time: a single pooled connection queues
+    # writes in-process, while reads get their own pool
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=POOL_TIMEOUT,
+        echo=False
+    )
+    read_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=POOL_TIMEOUT,
+        echo=False
+    )
+    _configure_sqlite(engine, writer=True)
+    _configure_sqlite(read_engine, writer=False)
+else:
+    engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        pool_timeout=POOL_TIMEOUT,
+        pool_recycle=1800,
+        pool_pre_ping=False,
+        echo=False,
+        connect_args={
+            "statement_cache_size": 0,  # Required for transaction pooler
+            "command_timeout": 30,
+        }
+    )
+    read_engine = engine
+
+# "METHOD /route/{template}" of the request a statement runs for, for the slow-query log
+current_route: ContextVar[str] = ContextVar('current_route', default=None)
+
+
+def _log_slow_queries(engine: AsyncEngine, explain_engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault('query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - connection.info['query_started'].pop()) * 1000
+        if elapsed_ms < slow_query_log.threshold_ms or executemany:
+            return
+        if context is not None and context.execution_options.get(SKIP_OPTION):
+            return
+        slow_query_log.record(explain_engine, statement, parameters, elapsed_ms, current_route.get())
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context):
+        if exception_context.connection is not None:
+            started = exception_context.connection.info.get('query_started')
+            if started:
+                started.pop()
+
+
+# EXPLAIN runs on the reader: on SQLite the writer is a single shared connection
+_log_slow_queries(engine, read_engine)
+if read_engine is not engine:
+    _log_slow_queries(read_engine, read_engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -32,10 +132,36 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False
 )
 
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False
+)
+
 Base = declarative_base()
 
-async def get_db():
-    async with AsyncSessionLocal() as session:
+READ_METHODS = ('GET', 'HEAD')
+# Set by POST /api/batch so its sub-requests share one session
+SHARED_SESSION_SCOPE_KEY = 'db.shared_session'
+
+
+def dialect_insert(table):
+    """INSERT supporting ``on_conflict_do_*`` for the configured backend."""
+    return sqlite_insert(table) if IS_SQLITE else pg_insert(table)
+
+
+async def get_db(request: Request):
+    route = request.scope.get('route')
+    current_route.set(f"{request.method} {route.path}" if route is not None else request.url.path)
+    shared = request.scope.get(SHARED_SESSION_SCOPE_KEY)
+    if shared is not None:
+        # The batch owns this session's transaction and lifetime
+        yield shared
+        return
+    session_factory = ReadSessionLocal if request.method in READ_METHODS else AsyncSessionLocal
+    async with session_factory() as session:
         try:
             yield session
         finally:
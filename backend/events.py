@@ -0,0 +1,88 @@
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import OutreachEvent, OutreachRecord, OutreachStatus, generate_uuid
+
+logger = logging.getLogger(__name__)
+
+EVENTS_TABLE = OutreachEvent.__tablename__
+
+
+def record_status_change(db: AsyncSession, outreach: OutreachRecord, from_status: Optional[OutreachStatus]) -> None:
+    """Queue an event for the record's current status on the caller's session.
+
+    The event is flushed with the caller's commit, so it lands in the same
+    transaction as the status change itself.
+    """
+    if from_status == outreach.status:
+        return
+    db.add(OutreachEvent(
+        outreach_id=outreach.id,
+        founder_id=outreach.founder_id,
+        tool_id=outreach.tool_id,
+        fb_profile_id=outreach.fb_profile_id,
+        from_status=from_status,
+        to_status=outreach.status,
+        created_at=outreach.updated_at or datetime.now(timezone.utc),
+    ))
+
+
+def created_event_rows(records: List[dict]) -> List[dict]:
+    """Event rows for freshly inserted outreach records, for a bulk insert."""
+    return [
+        dict(
+            id=generate_uuid(),
+            outreach_id=record['id'],
+            founder_id=record['founder_id'],
+            tool_id=record['tool_id'],
+            fb_profile_id=record['fb_profile_id'],
+            from_status=None,
+            to_status=record['status'],
+            created_at=record['created_at'],
+        )
+        for record in records
+    ]
+
+
+def _month_start(year: int, month: int) -> datetime:
+    year += (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def partition_name(month_start: datetime) -> str:
+    return f"{EVENTS_TABLE}_y{month_start.year:04d}m{month_start.month:02d}"
+
+
+def partition_ddl(month_start: datetime) -> str:
+    month_end = _month_start(month_start.year, month_start.month + 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month_start)} PARTITION OF {EVENTS_TABLE} "
+        f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{month_end.isoformat()}')"
+    )
+
+
+def upcoming_months(now: datetime, months_ahead: int) -> List[datetime]:
+    return [_month_start(now.year, now.month + offset) for offset in range(months_ahead + 1)]
+
+
+async def ensure_event_partitions(db: AsyncSession, months_ahead: int = 3) -> None:
+    """Create the monthly partitions for the current month and the next few.
+
+    Rows for months without a partition fall into the default partition, so a
+    missed run never loses events.
+    """
+    if db.bind.dialect.name != 'postgresql':
+        return
+    for month_start in upcoming_months(datetime.now(timezone.utc), months_ahead):
+        try:
+            async with db.begin_nested():
+                await db.execute(text(partition_ddl(month_start)))
+        except Exception as exc:
+            # Typically the default partition already holds rows for that month
+            logger.warning("Could not create partition %s: %s", partition_name(month_start), exc)
+    await db.commit()
@@ -0,0 +1,160 @@
+import asyncio
+import hashlib
+import logging
+import os
+from datetime import datetime, timezone, timedelta
+from typing import List
+from urllib.parse import parse_qsl, urlencode
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy import select, delete, update, or_, and_
+
+from database import AsyncSessionLocal, dialect_insert
+from models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_TTL = timedelta(hours=int(os.environ.get('IDEMPOTENCY_TTL_HOURS', '24')))
+# How long a claim may stay in progress before a retry is allowed to take it over
+IDEMPOTENCY_LOCK = timedelta(seconds=int(os.environ.get('IDEMPOTENCY_LOCK_SECONDS', '60')))
+IDEMPOTENCY_CLEANUP_INTERVAL = int(os.environ.get('IDEMPOTENCY_CLEANUP_INTERVAL_SECONDS', '3600'))
+MAX_KEY_LENGTH = 255
+# Describe the stored body as it was sent; the replay sets its own
+UNSTORED_HEADERS = {'content-length', 'content-type', 'content-encoding', 'transfer-encoding'}
+
+
+async def _claim(key: str, scope: str, request_hash: str) -> bool:
+    """Atomically take ownership of a key; the unique (key, scope) row arbitrates races."""
+    now = datetime.now(timezone.utc)
+    values = dict(
+        key=key, scope=scope, request_hash=request_hash,
+        status_code=None, content_type=None, response_headers=None, response_body=None,
+        locked_until=now + IDEMPOTENCY_LOCK, created_at=now, expires_at=now + IDEMPOTENCY_TTL,
+    )
+    stmt = dialect_insert(IdempotencyKey).values(**values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key, IdempotencyKey.scope],
+        set_={name: stmt.excluded[name] for name in values if name not in ('key', 'scope')},
+        where=or_(
+            IdempotencyKey.expires_at < now,
+            and_(IdempotencyKey.status_code.is_(None), IdempotencyKey.locked_until < now)
+        )
+    ).returning(IdempotencyKey.key)
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(stmt)
+        await session.commit()
+        return result.scalar_one_or_none() is not None
+
+
+async def _load(key: str, scope: str):
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.scope == scope)
+        )
+        return result.scalar_one_or_none()
+
+
+async def _store(key: str, scope: str, status_code: int, content_type: str, headers: List[list], body: bytes) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.key == key, IdempotencyKey.scope == scope)
+            .values(status_code=status_code, content_type=content_type, response_headers=headers, response_body=body)
+        )
+        await session.commit()
+
+
+async def _release(key: str, scope: str) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.scope == scope)
+        )
+        await session.commit()
+
+
+async def idempotency_middleware(request: Request, call_next):
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if request.method != 'POST' or not key or not request.url.path.startswith('/api/'):
+        return await call_next(request)
+    if len(key) > MAX_KEY_LENGTH:
+        return JSONResponse(status_code=400, content={"detail": f"{IDEMPOTENCY_HEADER} is too long"})
+    
+    scope = f"{request.method} {request.url.path}"
+    request_hash = hashlib.sha256(await request.body())
+    query = urlencode(sorted(parse_qsl(request.url.query, keep_blank_values=True)))
+    if query:
+        # Parameters such as fb_profile_id change what the request does
+        request_hash.update(b'\0' + query.encode())
+    request_hash = request_hash.hexdigest()
+    
+    if not await _claim(key, scope, request_hash):
+        stored = await _load(key, scope)
+        if stored is None:
+            # Purged between the claim attempt and the read; treat as in flight
+            return JSONResponse(status_code=409, content={"detail": "Request with this key is in progress"},
+                                headers={"Retry-After": "1"})
+        if stored.request_hash != request_hash:
+            return JSONResponse(status_code=422, content={"detail": f"{IDEMPOTENCY_HEADER} was reused with a different request"})
+        if stored.status_code is None:
+            return JSONResponse(status_code=409, content={"detail": "Request with this key is in progress"},
+                                headers={"Retry-After": "1"})
+        replay = Response(content=stored.response_body, status_code=stored.status_code, media_type=stored.content_type)
+        for name, value in stored.response_headers or []:
+            replay.headers.append(name, value)
+        replay.headers["Idempotent-Replayed"] = "true"
+        return replay
+    
+    try:
+        response = await call_next(request)
+        body = b"".join([chunk async for chunk in response.body_iterator])
+    except Exception:
+        await _release(key, scope)
+        raise
+    
+    if response.status_code >= 500:
+        # Let the client retry a failed attempt for real
+        await _release(key, scope)
+    else:
+        # Raw pairs keep repeated headers such as Set-Cookie, in their order
+        headers = [[name.decode('latin-1'), value.decode('latin-1')] for name, value in response.raw_headers
+                   if name.decode('latin-1') not in UNSTORED_HEADERS]
+        await _store(key, scope, response.status_code, response.headers.get('content-type'), headers, body)
+    
+    passthrough = Response(content=body, status_code=response.status_code)
+    passthrough.raw_headers = response.raw_headers
+    return passthrough
+
+
+async def purge_expired_idempotency_keys(batch_size: int = 5000) -> int:
+    purged = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            now = datetime.now(timezone.utc)
+            expired = (
+                select(IdempotencyKey.key)
+                .where(IdempotencyKey.expires_at < now)
+                .limit(batch_size)
+            )
+            result = await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.expires_at < now,
+                    IdempotencyKey.key.in_(expired.scalar_subquery())
+                )
+            )
+            await session.commit()
+        purged += result.rowcount or 0
+        if (result.rowcount or 0) < batch_size:
+            return purged
+
+
+async def idempotency_cleanup_loop() -> None:
+    while True:
+        try:
+            purged = await purge_expired_idempotency_keys()
+            if purged:
+                logger.info("Purged %d expired idempotency keys", purged)
+        except Exception:
+            logger.exception("Idempotency key cleanup failed")
+        await asyncio.sleep(IDEMPOTENCY_CLEANUP_INTERVAL)
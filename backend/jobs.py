@@ -0,0 +1,262 @@
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select, update, and_
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKER_CONCURRENCY = int(os.environ.get('JOB_WORKER_CONCURRENCY', '2'))
+JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL_SECONDS', '2'))
+JOB_HEARTBEAT_INTERVAL = float(os.environ.get('JOB_HEARTBEAT_INTERVAL_SECONDS', '10'))
+# A running job whose worker has not heartbeated for this long is requeued
+JOB_STALE_AFTER = timedelta(seconds=int(os.environ.get('JOB_STALE_AFTER_SECONDS', '120')))
+JOB_MAX_ATTEMPTS = int(os.environ.get('JOB_MAX_ATTEMPTS', '3'))
+
+JobHandler = Callable[['JobContext', Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+JOB_HANDLERS: Dict[str, JobHandler] = {}
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def job_handler(kind: str):
+    """Register ``async def handler(ctx, params) -> result`` for a job kind."""
+    def register(handler: JobHandler) -> JobHandler:
+        JOB_HANDLERS[kind] = handler
+        return handler
+    return register
+
+
+class JobContext:
+    def __init__(self, job_id: str, session_factory: async_sessionmaker):
+        self.job_id = job_id
+        self.session_factory = session_factory
+
+    async def progress(self, done: int, total: Optional[int] = None) -> None:
+        """Report progress; raises ``JobCancelled`` once cancellation was requested."""
+        values = {'progress': done, 'heartbeat_at': datetime.now(timezone.utc)}
+        if total is not None:
+            values['total'] = total
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(Job).where(Job.id == self.job_id).values(**values).returning(Job.cancel_requested)
+            )
+            cancel_requested = result.scalar_one()
+            await session.commit()
+        if cancel_requested:
+            raise JobCancelled()
+
+
+async def enqueue_job(session_factory: async_sessionmaker, kind: str, params: Dict[str, Any]) -> Job:
+    async with session_factory() as session:
+        job = Job(kind=kind, params=params, status=JobStatus.QUEUED)
+        session.add(job)
+        await session.commit()
+        await session.refresh(job)
+    if job_worker is not None:
+        job_worker.wake()
+    return job
+
+
+async def request_cancel(session_factory: async_sessionmaker, job_id: str) -> Optional[Job]:
+    """Cancel a queued job outright, or flag a running one for its worker."""
+    now = datetime.now(timezone.utc)
+    async with session_factory() as session:
+        await session.execute(
+            update(Job).where(Job.id == job_id, Job.status == JobStatus.QUEUED)
+            .values(status=JobStatus.CANCELLED, cancel_requested=True, finished_at=now)
+        )
+        await session.execute(
+            update(Job).where(Job.id == job_id, Job.status == JobStatus.RUNNING)
+            .values(cancel_requested=True)
+        )
+        await session.commit()
+        result = await session.execute(select(Job).where(Job.id == job_id))
+        return result.scalar_one_or_none()
+
+
+class JobWorker:
+    """Polls the jobs table and runs up to ``concurrency`` jobs at a time.
+
+    Any number of workers (in this or other processes) can share the table;
+    ``FOR UPDATE SKIP LOCKED`` guarantees each job is claimed once.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker, concurrency: int = JOB_WORKER_CONCURRENCY):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._slots = asyncio.Semaphore(concurrency)
+        self._wake = asyncio.Event()
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelling = set()
+        self._tasks = []
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    async def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._poll_loop()),
+            asyncio.create_task(self._heartbeat_loop()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        running = list(self._running.items())
+        for _, task in running:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *(task for _, task in running), return_exceptions=True)
+        # Hand interrupted jobs back to the queue for another worker
+        if running:
+            async with self.session_factory() as session:
+                await session.execute(
+                    update(Job).where(
+                        Job.id.in_([job_id for job_id, _ in running]),
+                        Job.status == JobStatus.RUNNING,
+                        Job.cancel_requested.is_(False)
+                    ).values(status=JobStatus.QUEUED, worker_id=None)
+                )
+                await session.commit()
+
+    async def _claim(self) -> Optional[Job]:
+        now = datetime.now(timezone.utc)
+        candidate = (
+            select(Job.id)
+            .where(Job.status == JobStatus.QUEUED)
+            .order_by(Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(
+                update(Job).where(Job.id == candidate).values(
+                    status=JobStatus.RUNNING,
+                    worker_id=self.worker_id,
+                    attempts=Job.attempts + 1,
+                    started_at=now,
+                    heartbeat_at=now
+                ).returning(Job)
+            )
+            job = result.scalar_one_or_none()
+            await session.commit()
+            return job
+
+    async def _poll_loop(self) -> None:
+        while True:
+            await self._slots.acquire()
+            try:
+                job = await self._claim()
+            except Exception:
+                logger.exception("Failed to claim a job")
+                job = None
+            if job is None:
+                self._slots.release()
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            task = asyncio.create_task(self._execute(job))
+            self._running[job.id] = task
+            task.add_done_callback(lambda _, job_id=job.id: self._finished(job_id))
+
+    def _finished(self, job_id: str) -> None:
+        self._running.pop(job_id, None)
+        self._cancelling.discard(job_id)
+        self._slots.release()
+
+    async def _execute(self, job: Job) -> None:
+        handler = JOB_HANDLERS.get(job.kind)
+        values: Dict[str, Any]
+        try:
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job.kind}")
+            result = await handler(JobContext(job.id, self.session_factory), dict(job.params or {}))
+            values = {'status': JobStatus.SUCCEEDED, 'result': result}
+        except JobCancelled:
+            values = {'status': JobStatus.CANCELLED}
+        except asyncio.CancelledError:
+            if job.id not in self._cancelling:
+                # Worker shutdown: stop() requeues the job
+                raise
+            values = {'status': JobStatus.CANCELLED}
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            values = {'status': JobStatus.FAILED, 'error': str(exc)}
+        values['finished_at'] = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            # Only while this claim still holds: a job requeued after a missed
+            # heartbeat may be running elsewhere now, and that run reports
+            result = await session.execute(
+                update(Job).where(
+                    Job.id == job.id, Job.worker_id == self.worker_id, Job.attempts == job.attempts
+                ).values(**values)
+            )
+            await session.commit()
+        if not result.rowcount:
+            logger.warning("Job %s (%s) was taken over; dropping this run's outcome", job.id, job.kind)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(JOB_HEARTBEAT_INTERVAL)
+            try:
+                await self._heartbeat()
+            except Exception:
+                logger.exception("Job heartbeat failed")
+
+    async def _heartbeat(self) -> None:
+        now = datetime.now(timezone.utc)
+        async with self.session_factory() as session:
+            if self._running:
+                result = await session.execute(
+                    update(Job).where(Job.id.in_(list(self._running)), Job.status == JobStatus.RUNNING)
+                    .values(heartbeat_at=now).returning(Job.id, Job.cancel_requested)
+                )
+                for job_id, cancel_requested in result.all():
+                    task = self._running.get(job_id)
+                    if cancel_requested and task is not None and job_id not in self._cancelling:
+                        self._cancelling.add(job_id)
+                        task.cancel()
+            # Recover jobs whose worker died mid-run
+            stale = and_(Job.status == JobStatus.RUNNING, Job.heartbeat_at < now - JOB_STALE_AFTER)
+            await session.execute(
+                update(Job).where(stale, Job.attempts < JOB_MAX_ATTEMPTS)
+                .values(status=JobStatus.QUEUED, worker_id=None)
+            )
+            await session.execute(
+                update(Job).where(stale, Job.attempts >= JOB_MAX_ATTEMPTS)
+                .values(status=JobStatus.FAILED, error="Worker stopped heartbeating", finished_at=now)
+            )
+            await session.commit()
+
+
+job_worker: Optional[JobWorker] = None
+
+
+async def start_job_worker(session_factory: async_sessionmaker) -> Optional[JobWorker]:
+    global job_worker
+    if os.environ.get('JOB_WORKER_ENABLED', '1') != '1':
+        return None
+    job_worker = JobWorker(session_factory)
+    await job_worker.start()
+    return job_worker
+
+
+async def stop_job_worker() -> None:
+    global job_worker
+    if job_worker is not None:
+        await job_worker.stop()
+        job_worker = None
@@ -0,0 +1,120 @@
+import hashlib
+import math
+import os
+import time
+from typing import Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+from sqlalchemy import select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'ref', 'ref_src', 'igshid', 'mibextid'}
+# Sites whose profile slugs are case-insensitive, subdomains included
+CASE_INSENSITIVE_PATH_HOSTS = ('facebook.com', 'linkedin.com', 'x.com', 'twitter.com')
+
+
+def _on_domain(host: str, domain: str) -> bool:
+    return host == domain or host.endswith('.' + domain)
+
+
+def normalize_url(url: Optional[str]) -> Optional[str]:
+    """Canonical form used for duplicate detection: ``host/path?query`` in lower case.
+
+    Scheme, ``www.``, default ports, trailing slashes, fragments and tracking
+    parameters are dropped; meaningful query parameters (``profile.php?id=``)
+    are kept in sorted order.
+    """
+    if not url:
+        return None
+    url = url.strip()
+    if not url:
+        return None
+    if '://' not in url:
+        url = '//' + url
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/')
+    if any(_on_domain(host, domain) for domain in CASE_INSENSITIVE_PATH_HOSTS):
+        path = path.lower()
+    query = [
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    ]
+    normalized = host + path
+    if query:
+        normalized += '?' + urlencode(sorted(query))
+    return normalized or None
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (false positives only, never false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.size for i in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+
+class LeadUrlFilter:
+    """Process-local Bloom filter of every normalized tool/founder URL.
+
+    Writes from this process are added immediately; writes from other
+    processes only become visible after the next rebuild, so the filter is
+    opt-in (``LEAD_BLOOM_FILTER=1``) and rebuilt every ``LEAD_BLOOM_TTL_SECONDS``.
+    """
+
+    def __init__(self):
+        self.enabled = os.environ.get('LEAD_BLOOM_FILTER', '0') == '1'
+        self.ttl = int(os.environ.get('LEAD_BLOOM_TTL_SECONDS', '300'))
+        self._filter: Optional[BloomFilter] = None
+        self._built_at = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None and time.monotonic() - self._built_at < self.ttl
+
+    def add(self, normalized: Optional[str]) -> None:
+        if self._filter is not None and normalized:
+            self._filter.add(normalized)
+
+    def might_contain(self, normalized: str) -> bool:
+        return not self.ready or normalized in self._filter
+
+    async def refresh(self, db: AsyncSession) -> None:
+        from models import Tool, Founder
+
+        if not self.enabled or self.ready:
+            return
+        urls = union_all(
+            select(Tool.website_url_normalized.label('url')).where(Tool.website_url_normalized.is_not(None)),
+            select(Founder.social_profile_url_normalized).where(Founder.social_profile_url_normalized.is_not(None)),
+        )
+        result = await db.execute(urls)
+        values = result.scalars().all()
+        bloom = BloomFilter(capacity=max(len(values) * 2, 10000))
+        for value in values:
+            bloom.add(value)
+        self._filter = bloom
+        self._built_at = time.monotonic()
+
+
+lead_url_filter = LeadUrlFilter()
+
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import os
+import time
+from typing import List
+
+import httpx
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Hot read paths replayed once at startup so SQLAlchemy's compiled-statement
+# cache and the response serializers are warm before traffic arrives. Lists
+# are paged the way the UI asks for them: that compiles the statements real
+# requests run, and never reads a whole table before the instance is ready
+DEFAULT_WARMUP_PATHS = [
+    '/api/stats',
+    '/api/tools?sort=created_at&order=desc&limit=50&offset=0',
+    '/api/founders?sort=created_at&order=desc&limit=50&offset=0',
+    '/api/profiles',
+    '/api/templates',
+    '/api/outreach?limit=50&offset=0',
+    '/api/outreach/board',
+    '/api/outreach/funnel',
+]
+WARMUP_PATHS = [
+    path for path in os.environ.get('WARMUP_PATHS', ','.join(DEFAULT_WARMUP_PATHS)).split(',') if path
+]
+WARMUP_TIMEOUT = float(os.environ.get('WARMUP_TIMEOUT_SECONDS', '60'))
+
+
+async def prewarm_pool(engine: AsyncEngine) -> int:
+    """Open ``pool_size`` connections at once and hand them back to the pool."""
+    async def open_connection():
+        connection = await engine.connect()
+        try:
+            await connection.execute(text("SELECT 1"))
+        except Exception:
+            await connection.close()
+            raise
+        return connection
+
+    results = await asyncio.gather(*(open_connection() for _ in range(engine.pool.size())), return_exceptions=True)
+    connections = [result for result in results if not isinstance(result, BaseException)]
+    for connection in connections:
+        await connection.close()
+    return len(connections)
+
+
+async def replay_paths(app, paths: List[str]) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://warmup') as client:
+        for path in paths:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                logger.info("Warm-up %s -> %s in %.0f ms", path, response.status_code, (time.perf_counter() - started) * 1000)
+            except Exception:
+                logger.exception("Warm-up request %s failed", path)
+
+
+async def warm_up(app, engine: AsyncEngine) -> None:
+    """Pre-open the pool, replay the hot queries, then mark the app ready.
+
+    Failures are logged rather than raised: a cold instance is still
+    better than one that never reports ready.
+    """
+    started = time.perf_counter()
+    try:
+        opened = await asyncio.wait_for(prewarm_pool(engine), timeout=WARMUP_TIMEOUT)
+        logger.info("Opened %d pooled connections", opened)
+        await asyncio.wait_for(replay_paths(app, WARMUP_PATHS), timeout=WARMUP_TIMEOUT)
+    except Exception:
+        logger.exception("Warm-up did not complete")
+    app.state.ready = True
+    logger.info("Warm-up finished in %.1f s", time.perf_counter() - started)
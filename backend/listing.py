@@ -0,0 +1,143 @@
+import base64
+import json
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import String, and_, tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+from sqlalchemy.sql.functions import FunctionElement
+
+from database import IS_SQLITE
+from schemas import SortOrderEnum
+
+MAX_CODE_POINT = 0x10FFFF
+ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+class name_key(FunctionElement):
+    """Case-folded name that sorts by code point, for name ordering and prefix search.
+
+    Postgres compares it under the "C" collation so a plain b-tree index
+    serves both ``ORDER BY`` and prefix ranges; SQLite always compares
+    bytes. SQLite's ``lower()`` only folds ASCII, so there ``Édouard``
+    keeps its capital.
+    """
+    type = String()
+    inherit_cache = True
+
+
+@compiles(name_key)
+def _compile_name_key(element, compiler, **kw):
+    return 'lower(%s)' % compiler.process(element.clauses, **kw)
+
+
+@compiles(name_key, 'postgresql')
+def _compile_name_key_postgresql(element, compiler, **kw):
+    return 'lower(%s) COLLATE "C"' % compiler.process(element.clauses, **kw)
+
+
+class nulls_low(ColumnElement):
+    """Index element that keeps NULLs below every value, the way SQLite always does.
+
+    List queries sort nullable columns ``ASC NULLS FIRST`` / ``DESC NULLS
+    LAST``, which a Postgres index only serves when built that way. A
+    ``descending`` element is for indexes whose later columns must run the
+    other way from the earlier ones.
+    """
+    inherit_cache = True
+
+    def __init__(self, column, descending: bool = False):
+        self.column = column
+        self.descending = descending
+
+
+@compiles(nulls_low)
+def _compile_nulls_low(element, compiler, **kw):
+    return compiler.process(element.column, **kw) + (' DESC' if element.descending else '')
+
+
+@compiles(nulls_low, 'postgresql')
+def _compile_nulls_low_postgresql(element, compiler, **kw):
+    suffix = ' DESC NULLS LAST' if element.descending else ' NULLS FIRST'
+    return compiler.process(element.column, **kw) + suffix
+
+
+def fold_name(name: str) -> str:
+    """``name`` case-folded the way :class:`name_key` folds it in the database."""
+    return name.translate(ASCII_LOWER) if IS_SQLITE else name.lower()
+
+
+def prefix_filter(key, prefix: str):
+    """``key`` starts with ``prefix``, as a range both dialects can seek an index with.
+
+    A bound ``LIKE 'x%'`` only uses an index when the planner sees the
+    literal; the range works for prepared statements too.
+    """
+    lowered = fold_name(prefix)
+    last = ord(lowered[-1])
+    if last == MAX_CODE_POINT:
+        return key >= lowered
+    return and_(key >= lowered, key < lowered[:-1] + chr(last + 1))
+
+
+def sort_keys(column, id_column, order: SortOrderEnum) -> Sequence:
+    """``ORDER BY`` for ``column`` with ``id_column`` as tie-breaker in the same direction.
+
+    Both keys run the same way, and NULLs count as the lowest value, so a
+    ``(column, id)`` index serves either direction: forwards or backwards.
+    """
+    nullable = getattr(column, 'nullable', False)
+    if order == SortOrderEnum.ASC:
+        return (column.asc().nulls_first() if nullable else column.asc(), id_column.asc())
+    return (column.desc().nulls_last() if nullable else column.desc(), id_column.desc())
+
+
+def rows_after(column, id_column, order: SortOrderEnum, moment, row_id) -> List:
+    """Conditions for the rows after ``(moment, row_id)`` in :func:`sort_keys` order.
+
+    A row comparison alone never matches NULLs, which sort lowest, so a
+    nullable ``column`` can need a second range. Each condition is one
+    range of the ``(column, id)`` index, and rows matching an earlier one
+    sort before rows matching a later one.
+    """
+    nullable = getattr(column, 'nullable', False)
+    if order == SortOrderEnum.ASC:
+        if moment is None:
+            return [and_(column.is_(None), id_column > row_id), column.is_not(None)]
+        return [tuple_(column, id_column) > tuple_(moment, row_id)]
+    if moment is None:
+        return [and_(column.is_(None), id_column < row_id)]
+    after = tuple_(column, id_column) < tuple_(moment, row_id)
+    return [after, column.is_(None)] if nullable else [after]
+
+
+def created_between(column, created_after: Optional[datetime], created_before: Optional[datetime]) -> list:
+    conditions = []
+    if created_after is not None:
+        conditions.append(column >= created_after)
+    if created_before is not None:
+        conditions.append(column < created_before)
+    return conditions
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(moment: Optional[datetime], row_id: str) -> str:
+    """Opaque position after the row with this ``(updated_at, id)``."""
+    payload = json.dumps([moment.isoformat() if moment is not None else None, row_id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], str]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        moment, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        moment = datetime.fromisoformat(moment) if moment is not None else None
+    except (ValueError, TypeError, UnicodeDecodeError) as exc:
+        raise InvalidCursor(str(exc)) from exc
+    if (moment is not None and moment.tzinfo is None) or not isinstance(row_id, str):
+        raise InvalidCursor("malformed cursor")
+    return moment, row_id
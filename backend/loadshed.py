@@ -0,0 +1,179 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from fastapi.responses import JSONResponse
+
+from database import POOL_SIZE, MAX_OVERFLOW
+
+HIGH = 'high'
+LOW = 'low'
+
+# Unbounded list/export reads that hold a connection for a long time
+HEAVY_PATHS = {
+    path for path in os.environ.get(
+        'LOADSHED_HEAVY_PATHS',
+        '/api/outreach,/api/outreach/export,/api/founders,/api/founders/uncontacted,/api/tools'
+    ).split(',') if path
+}
+# Never queued: probes and the load report itself must answer under overload
+BYPASS_PATHS = {'/api/', '/api/health/live', '/api/health/ready', '/api/_internal/load', '/api/_internal/coalescing',
+                '/api/_internal/slow-queries'}
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+
+
+class PoolAdmission:
+    """Admission control sized to the DB pool, with two priority classes.
+
+    At most ``capacity`` requests hold a slot; heavy reads may use at most
+    ``heavy_limit`` of them and only start when no high-priority request is
+    waiting. Anything that would queue beyond ``max_queue`` or wait longer
+    than ``max_wait`` seconds is rejected instead of piling up on the pool.
+    """
+
+    def __init__(self, capacity: int, heavy_limit: int, max_queue: int, max_wait: float):
+        self.capacity = capacity
+        self.heavy_limit = heavy_limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight: Dict[str, int] = {HIGH: 0, LOW: 0}
+        self.waiters: Dict[str, deque] = {HIGH: deque(), LOW: deque()}
+        self.admitted = {HIGH: 0, LOW: 0}
+        self.shed = {HIGH: 0, LOW: 0}
+        self.total_wait = {HIGH: 0.0, LOW: 0.0}
+        self.max_observed_wait = {HIGH: 0.0, LOW: 0.0}
+        # Moving average of how long a slot is held, for Retry-After
+        self.avg_service_time = 0.05
+
+    def _has_room(self, priority: str) -> bool:
+        if sum(self.in_flight.values()) >= self.capacity:
+            return False
+        if priority == LOW:
+            return self.in_flight[LOW] < self.heavy_limit and not self.waiters[HIGH]
+        return True
+
+    def _retry_after(self) -> int:
+        queued = sum(len(waiters) for waiters in self.waiters.values())
+        return max(1, math.ceil((queued + 1) * self.avg_service_time / max(self.capacity, 1)))
+
+    def _shed(self, priority: str) -> Overloaded:
+        self.shed[priority] += 1
+        return Overloaded(self._retry_after())
+
+    def _admit(self, priority: str, waited: float) -> None:
+        self.admitted[priority] += 1
+        self.total_wait[priority] += waited
+        self.max_observed_wait[priority] = max(self.max_observed_wait[priority], waited)
+
+    async def acquire(self, priority: str) -> None:
+        if not self.waiters[priority] and self._has_room(priority):
+            self.in_flight[priority] += 1
+            self._admit(priority, 0.0)
+            return
+        if len(self.waiters[priority]) >= self.max_queue:
+            raise self._shed(priority)
+        
+        started = time.perf_counter()
+        granted = asyncio.get_running_loop().create_future()
+        self.waiters[priority].append(granted)
+        try:
+            await asyncio.wait_for(asyncio.shield(granted), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            if not granted.done():
+                granted.cancel()
+                self.waiters[priority].remove(granted)
+                raise self._shed(priority)
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                self.release(priority)
+            else:
+                granted.cancel()
+                self.waiters[priority].remove(granted)
+            raise
+        self._admit(priority, time.perf_counter() - started)
+
+    def release(self, priority: str, held: Optional[float] = None) -> None:
+        self.in_flight[priority] -= 1
+        if held is not None:
+            self.avg_service_time = 0.9 * self.avg_service_time + 0.1 * held
+        # Hand freed slots to waiting writes/cheap reads before heavy reads
+        for klass in (HIGH, LOW):
+            waiters = self.waiters[klass]
+            while waiters and self._has_room(klass):
+                granted = waiters.popleft()
+                if granted.done():
+                    continue
+                self.in_flight[klass] += 1
+                granted.set_result(None)
+
+    def snapshot(self) -> dict:
+        return {
+            'capacity': self.capacity,
+            'heavy_limit': self.heavy_limit,
+            'max_queue': self.max_queue,
+            'max_wait_seconds': self.max_wait,
+            'avg_service_seconds': round(self.avg_service_time, 4),
+            'classes': {
+                klass: {
+                    'in_flight': self.in_flight[klass],
+                    'waiting': len(self.waiters[klass]),
+                    'admitted': self.admitted[klass],
+                    'shed': self.shed[klass],
+                    'avg_wait_seconds': round(self.total_wait[klass] / self.admitted[klass], 4) if self.admitted[klass] else 0.0,
+                    'max_wait_seconds': round(self.max_observed_wait[klass], 4),
+                }
+                for klass in (HIGH, LOW)
+            },
+        }
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    if not path.startswith('/api/') or path in BYPASS_PATHS:
+        return None
+    if method in ('GET', 'HEAD') and path in HEAVY_PATHS:
+        return LOW
+    return HIGH
+
+
+_capacity = int(os.environ.get('LOADSHED_CAPACITY', str(POOL_SIZE + MAX_OVERFLOW)))
+pool_admission = PoolAdmission(
+    capacity=_capacity,
+    heavy_limit=max(1, int(_capacity * float(os.environ.get('LOADSHED_HEAVY_SHARE', '0.5')))),
+    max_queue=int(os.environ.get('LOADSHED_MAX_QUEUE', '50')),
+    max_wait=float(os.environ.get('LOADSHED_MAX_WAIT_SECONDS', '5')),
+)
+
+
+class LoadSheddingMiddleware:
+    def __init__(self, app, admission: PoolAdmission = pool_admission):
+        self.app = app
+        self.admission = admission
+        self.enabled = os.environ.get('LOADSHED_ENABLED', '1') == '1'
+
+    async def __call__(self, scope, receive, send):
+        priority = classify(scope.get('method', ''), scope.get('path', '')) if scope['type'] == 'http' else None
+        if not self.enabled or priority is None:
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.admission.acquire(priority)
+        except Overloaded as exc:
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is overloaded, retry later"},
+                headers={"Retry-After": str(exc.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.admission.release(priority, time.perf_counter() - started)
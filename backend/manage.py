@@ -0,0 +1,79 @@
+"""Maintenance commands.
+
+    python manage.py rebuild-summaries [--batch-size 1000]
+    python manage.py snapshot [--full] [--batch-size 5000] [--dir snapshots]
+"""
+import argparse
+import asyncio
+import logging
+
+from pathlib import Path
+
+from database import AsyncSessionLocal, ReadSessionLocal, engine, read_engine
+
+logger = logging.getLogger('manage')
+
+
+async def rebuild_summaries_command(args) -> None:
+    from summaries import rebuild_summaries
+
+    async def report(done: int) -> None:
+        logger.info("Rebuilt %d rows", done)
+
+    totals = await rebuild_summaries(AsyncSessionLocal, args.batch_size, on_batch=report)
+    for table, count in totals.items():
+        logger.info("%s: %d summaries rebuilt", table, count)
+
+
+async def snapshot_command(args) -> None:
+    from snapshot import take_snapshot
+
+    async def report(done: int) -> None:
+        logger.info("Wrote %d rows", done)
+
+    entry = await take_snapshot(
+        ReadSessionLocal, full=args.full, batch_size=args.batch_size, directory=args.dir, on_batch=report
+    )
+    if entry.get('skipped'):
+        logger.info("Nothing new since %s", entry['watermark'])
+        return
+    logger.info(
+        "%s snapshot %s: %d rows, %d deletions, %d files",
+        'Full' if entry['full'] else 'Incremental', entry['id'], entry['rows'], entry['deleted'], len(entry['files'])
+    )
+
+
+COMMANDS = {
+    'rebuild-summaries': rebuild_summaries_command,
+    'snapshot': snapshot_command,
+}
+
+
+async def run(args) -> None:
+    try:
+        await COMMANDS[args.command](args)
+    finally:
+        await engine.dispose()
+        if read_engine is not engine:
+            await read_engine.dispose()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Founder Outreach Manager maintenance commands")
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    rebuild = subcommands.add_parser('rebuild-summaries', help="Recompute founder and profile outreach summaries")
+    rebuild.add_argument('--batch-size', type=int, default=1000)
+
+    from snapshot import SNAPSHOT_BATCH_SIZE, SNAPSHOT_DIR
+    snapshot = subcommands.add_parser('snapshot', help="Write outreach history to partitioned Parquet files")
+    snapshot.add_argument('--full', action='store_true', help="Snapshot everything instead of changes since the last run")
+    snapshot.add_argument('--batch-size', type=int, default=SNAPSHOT_BATCH_SIZE)
+    snapshot.add_argument('--dir', type=Path, default=SNAPSHOT_DIR)
+
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
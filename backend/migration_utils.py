@@ -0,0 +1,284 @@
+"""Lock-safe building blocks for migrations on tables that are already big.
+
+On Postgres, indexes are built ``CONCURRENTLY`` outside the migration's
+transaction, columns are added under a short ``lock_timeout`` and retried
+rather than queueing every query behind them, and backfills update keyset
+batches that each commit on their own, throttled to a row rate. SQLite has
+a single writer and none of these options, so the same calls fall back to
+the plain operations there.
+
+With ``alembic -x dry_run=1 upgrade head`` (or ``MIGRATION_DRY_RUN=1``)
+these helpers only report the table size and the lock they would take,
+with an estimate of how long it is held, and the rest of the migration is
+rolled back.
+"""
+import logging
+import os
+import time
+from contextlib import nullcontext
+from typing import Callable, List, Optional, Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql.expression import TableClause
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+BACKFILL_BATCH_SIZE = int(os.environ.get('MIGRATION_BATCH_SIZE', '1000'))
+BACKFILL_ROWS_PER_SECOND = float(os.environ.get('MIGRATION_ROWS_PER_SECOND', '5000'))
+LOCK_TIMEOUT = os.environ.get('MIGRATION_LOCK_TIMEOUT', '5s')
+LOCK_RETRIES = int(os.environ.get('MIGRATION_LOCK_RETRIES', '5'))
+# Rough throughput used only for dry-run estimates
+INDEX_BUILD_ROWS_PER_SECOND = float(os.environ.get('MIGRATION_INDEX_ROWS_PER_SECOND', '200000'))
+TABLE_REWRITE_ROWS_PER_SECOND = float(os.environ.get('MIGRATION_REWRITE_ROWS_PER_SECOND', '100000'))
+
+LOCK_NOT_AVAILABLE = '55P03'
+
+dry_run_report: List[dict] = []
+
+
+def dry_run() -> bool:
+    value = context.get_x_argument(as_dictionary=True).get('dry_run', os.environ.get('MIGRATION_DRY_RUN', '0'))
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _postgres() -> bool:
+    return context.get_context().dialect.name == 'postgresql'
+
+
+def table_stats(table: str) -> dict:
+    """Row count (planner estimate on Postgres) and on-disk size, indexes included."""
+    bind = op.get_bind()
+    if _postgres():
+        row = bind.execute(
+            sa.text("SELECT reltuples::bigint, pg_total_relation_size(oid) FROM pg_class WHERE oid = to_regclass(:table)"),
+            {'table': table}
+        ).first()
+        if row is None:
+            return {'rows': 0, 'bytes': 0}
+        rows, size = row
+        if rows < 0:
+            # Never analyzed yet
+            rows = bind.execute(sa.text(f"SELECT count(*) FROM {table}")).scalar()
+        return {'rows': rows, 'bytes': size}
+    rows = bind.execute(sa.text(f"SELECT count(*) FROM {table}")).scalar()
+    try:
+        size = bind.execute(sa.text("SELECT sum(pgsize) FROM dbstat WHERE name = :table"), {'table': table}).scalar()
+    except OperationalError:
+        # dbstat is an optional SQLite build feature
+        size = None
+    return {'rows': rows, 'bytes': size}
+
+
+def _report(operation: str, table: str, lock: str, blocking_per_row: float, duration_per_row: float, note: str = '') -> None:
+    stats = table_stats(table)
+    entry = {
+        'operation': operation,
+        'table': table,
+        'rows': stats['rows'],
+        'bytes': stats['bytes'],
+        'lock': lock,
+        'blocking_seconds': round(blocking_per_row * stats['rows'], 2),
+        'duration_seconds': round(duration_per_row * stats['rows'], 2),
+        'note': note,
+    }
+    dry_run_report.append(entry)
+    logger.info(
+        "[dry run] %s on %s (%d rows, %s): %s, blocks writes ~%.2fs, runs ~%.2fs%s",
+        operation, table, entry['rows'], 'size unknown' if entry['bytes'] is None else f"{entry['bytes']} bytes",
+        lock, entry['blocking_seconds'], entry['duration_seconds'], f"; {note}" if note else ''
+    )
+
+
+def _invalid_index(name: str) -> bool:
+    # A failed CONCURRENTLY build leaves an invalid index that IF NOT EXISTS would keep
+    return bool(op.get_bind().execute(
+        sa.text("SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"), {'name': name}
+    ).scalar())
+
+
+def create_index(name: str, table: str, columns: Sequence[str], unique: bool = False, **kw) -> None:
+    """``op.create_index`` that keeps the table writable while the index builds on Postgres."""
+    postgres = _postgres()
+    if dry_run():
+        if postgres:
+            _report(f"CREATE INDEX CONCURRENTLY {name}", table, 'SHARE UPDATE EXCLUSIVE', 0,
+                    2 / INDEX_BUILD_ROWS_PER_SECOND, 'waits for transactions open on the table to finish')
+        else:
+            _report(f"CREATE INDEX {name}", table, 'database write lock',
+                    1 / INDEX_BUILD_ROWS_PER_SECOND, 1 / INDEX_BUILD_ROWS_PER_SECOND)
+        return
+    if not postgres:
+        op.create_index(name, table, columns, unique=unique, if_not_exists=True, **kw)
+        return
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        if not context.is_offline_mode() and _invalid_index(name):
+            logger.warning("Rebuilding invalid index %s left by an interrupted build", name)
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+        op.create_index(name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True, **kw)
+
+
+def drop_index(name: str, table: str) -> None:
+    if dry_run():
+        lock = 'SHARE UPDATE EXCLUSIVE' if _postgres() else 'database write lock'
+        _report(f"DROP INDEX {name}", table, lock, 0, 0)
+        return
+    if not _postgres():
+        op.drop_index(name, table_name=table, if_exists=True)
+        return
+    with op.get_context().autocommit_block():
+        op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def _retrying_lock(statement: Callable[[], None]) -> None:
+    """Run DDL under ``LOCK_TIMEOUT``, retrying with backoff when the lock is not granted.
+
+    Waiting for ACCESS EXCLUSIVE queues every later query on the table behind
+    the migration, so it gives up quickly and tries again instead.
+    """
+    if not _postgres() or context.is_offline_mode():
+        statement()
+        return
+    bind = op.get_bind()
+    for attempt in range(LOCK_RETRIES + 1):
+        try:
+            with bind.begin_nested():
+                bind.exec_driver_sql(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+                statement()
+            break
+        except OperationalError as exc:
+            if getattr(exc.orig, 'pgcode', None) != LOCK_NOT_AVAILABLE or attempt == LOCK_RETRIES:
+                raise
+            logger.warning("Lock not granted within %s, retrying (%d/%d)", LOCK_TIMEOUT, attempt + 1, LOCK_RETRIES)
+            time.sleep(min(2 ** attempt, 30))
+    # SET LOCAL outlives the savepoint; later statements should wait as usual
+    bind.exec_driver_sql("SET LOCAL lock_timeout = DEFAULT")
+
+
+def _rewrites_table(column: sa.Column) -> bool:
+    # A constant default is stored in the catalog; anything else fills every row
+    default = column.server_default
+    return default is not None and not isinstance(getattr(default, 'arg', None), str)
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    """``op.add_column`` that gives up on a busy table instead of blocking it."""
+    if dry_run():
+        rewrite = _rewrites_table(column)
+        rate = 1 / TABLE_REWRITE_ROWS_PER_SECOND if rewrite else 0
+        lock = 'ACCESS EXCLUSIVE' if _postgres() else 'database write lock'
+        note = 'rewrites the table' if rewrite else f'catalog-only, gives up after {LOCK_TIMEOUT} per attempt'
+        _report(f"ADD COLUMN {column.name}", table, lock, rate, rate, note)
+        return
+    _retrying_lock(lambda: op.add_column(table, column))
+
+
+def drop_column(table: str, column: str) -> None:
+    if dry_run():
+        lock = 'ACCESS EXCLUSIVE' if _postgres() else 'database write lock'
+        _report(f"DROP COLUMN {column}", table, lock, 0, 0)
+        return
+    _retrying_lock(lambda: op.drop_column(table, column))
+
+
+def _id_column(target):
+    return target.c.id if isinstance(target, TableClause) else target.id
+
+
+def _table_name(target) -> str:
+    return target.name if isinstance(target, TableClause) else target.__tablename__
+
+
+def _keyset_batches(target, columns: Sequence, where, batch_size: int):
+    """Pages of ``(id, *columns)`` in id order; each page is read fresh after the last was written."""
+    id_column = _id_column(target)
+    last_id = None
+    while True:
+        query = sa.select(id_column, *columns).order_by(id_column).limit(batch_size)
+        if where is not None:
+            query = query.where(where)
+        if last_id is not None:
+            query = query.where(id_column > last_id)
+        rows = op.get_bind().execute(query).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1][0]
+        if len(rows) < batch_size:
+            return
+
+
+def _backfill(target, columns: Sequence, where, batch_size: int, rows_per_second: float, write: Callable[[list], None]) -> None:
+    name = _table_name(target)
+    if dry_run():
+        _report(f"backfill of {name} in batches of {batch_size}", name, 'row locks, one batch at a time',
+                0, 1 / rows_per_second)
+        return
+    started = time.monotonic()
+    done = 0
+    # Each batch commits on its own on Postgres, so row locks and WAL stay small
+    with op.get_context().autocommit_block() if _postgres() else nullcontext():
+        for rows in _keyset_batches(target, columns, where, batch_size):
+            write(rows)
+            done += len(rows)
+            ahead = done / rows_per_second - (time.monotonic() - started)
+            if ahead > 0:
+                time.sleep(ahead)
+            logger.info("Backfilled %d rows of %s", done, name)
+
+
+def backfill(target, values: dict, where=None, batch_size: int = BACKFILL_BATCH_SIZE,
+             rows_per_second: float = BACKFILL_ROWS_PER_SECOND) -> None:
+    """``UPDATE target SET **values`` in batches; ``target`` is a model or table with an ``id``."""
+    if context.is_offline_mode() and not dry_run():
+        op.execute(sa.update(target).values(**values) if where is None else sa.update(target).where(where).values(**values))
+        return
+    id_column = _id_column(target)
+
+    def write(rows: list) -> None:
+        # Fetched per batch: the autocommit block runs on its own connection
+        op.get_bind().execute(sa.update(target).where(id_column.in_([row[0] for row in rows])).values(**values))
+
+    _backfill(target, (), where, batch_size, rows_per_second, write)
+
+
+def backfill_rows(target, columns: Sequence, compute: Callable[[sa.Row], dict], where=None,
+                  batch_size: int = BACKFILL_BATCH_SIZE, rows_per_second: float = BACKFILL_ROWS_PER_SECOND) -> None:
+    """Batched backfill of values computed in Python from ``columns`` of each row.
+
+    A row whose source columns changed since they were read is left alone:
+    the application already wrote its value. An offline (``--sql``) run
+    has no rows to compute from, so it skips the backfill with a warning.
+    """
+    if context.is_offline_mode() and not dry_run():
+        logger.warning("Skipping backfill of %s: values computed in Python need an online migration",
+                       _table_name(target))
+        return
+    id_column = _id_column(target)
+    names = [column.name for column in columns]
+
+    def write(rows: list) -> None:
+        updates = [compute(row) for row in rows]
+        if not updates:
+            return
+        statement = sa.update(target).where(id_column == sa.bindparam('_id'), *[
+            column == sa.bindparam(f'_{name}') for column, name in zip(columns, names)
+        ]).values({key: sa.bindparam(key) for key in updates[0]})
+        op.get_bind().execute(statement, [
+            {'_id': row[0], **{f'_{name}': value for name, value in zip(names, row[1:])}, **update}
+            for row, update in zip(rows, updates)
+        ])
+
+    _backfill(target, columns, where, batch_size, rows_per_second, write)
+
+
+def estimated_total(report: Optional[List[dict]] = None) -> dict:
+    report = dry_run_report if report is None else report
+    return {
+        'operations': len(report),
+        'blocking_seconds': round(sum(entry['blocking_seconds'] for entry in report), 2),
+        'duration_seconds': round(sum(entry['duration_seconds'] for entry in report), 2),
+        'largest_table_rows': max((entry['rows'] for entry in report), default=0),
+    }
@@ -1,13 +1,38 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer, BigInteger, Boolean, JSON, LargeBinary, Index, Enum as SQLEnum, text, column
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.orm import relationship, validates
 from database import Base
+from leads import normalize_url, lead_url_filter
+from listing import name_key, nulls_low
 import enum
 
 def generate_uuid():
     return str(uuid.uuid4())
 
+class UTCDateTime(TypeDecorator):
+    """``UTCDateTime()`` that always hands back aware UTC datetimes.
+
+    SQLite has no timestamp type: values are stored as UTC text and come
+    back naive, so they are tagged as UTC again on the way out.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def __init__(self):
+        super().__init__(timezone=True)
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None and dialect.name == 'sqlite':
+            value = value.astimezone(timezone.utc)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
 class OutreachStatus(enum.Enum):
     MESSAGE_GENERATED = "message_generated"
     MESSAGE_SENT = "message_sent"
@@ -15,32 +40,95 @@ class OutreachStatus(enum.Enum):
     CLOSED = "closed"
     GIVEAWAY_RUNNING = "giveaway_running"
 
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
 class Tool(Base):
     __tablename__ = 'tools'
+    __table_args__ = (
+        Index('ix_tools_website_url_normalized', 'website_url_normalized',
+              postgresql_where=text('website_url_normalized IS NOT NULL'),
+              sqlite_where=text('website_url_normalized IS NOT NULL')),
+        # One per list sort; filters either seek these or are checked along the scan
+        Index('ix_tools_created_at_id', nulls_low(column('created_at')), 'id'),
+        Index('ix_tools_name_key_id', name_key(column('tool_name')), 'id'),
+        Index('ix_tools_with_website_created_at_id', nulls_low(column('created_at')), 'id',
+              postgresql_where=text('website_url IS NOT NULL'), sqlite_where=text('website_url IS NOT NULL')),
+        Index('ix_tools_without_website_created_at_id', nulls_low(column('created_at')), 'id',
+              postgresql_where=text('website_url IS NULL'), sqlite_where=text('website_url IS NULL')),
+    )
     
     id = Column(String(36), primary_key=True, default=generate_uuid)
     tool_name = Column(String(255), nullable=False, index=True)
     tool_description = Column(Text, nullable=True)
     website_url = Column(String(500), nullable=True)
+    website_url_normalized = Column(String(500), nullable=True)
     source_url = Column(String(500), nullable=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Bumped by every edit; updates can require the version they read
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    created_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
+    
+    # passive_deletes: the ON DELETE CASCADE foreign keys do the work, so
+    # deleting a parent never loads its children into the session
+    founders = relationship('Founder', back_populates='tool', cascade='all, delete-orphan', passive_deletes=True)
+    outreach_records = relationship('OutreachRecord', back_populates='tool', cascade='all, delete-orphan', passive_deletes=True)
+    
+    normalized_url_columns = {'website_url': 'website_url_normalized'}
     
-    founders = relationship('Founder', back_populates='tool', cascade='all, delete-orphan')
-    outreach_records = relationship('OutreachRecord', back_populates='tool', cascade='all, delete-orphan')
+    @validates('website_url')
+    def _normalize_website_url(self, key, value):
+        self.website_url_normalized = normalize_url(value)
+        lead_url_filter.add(self.website_url_normalized)
+        return value
 
 class Founder(Base):
     __tablename__ = 'founders'
+    __table_args__ = (
+        Index('ix_founders_social_profile_url_normalized', 'social_profile_url_normalized',
+              postgresql_where=text('social_profile_url_normalized IS NOT NULL'),
+              sqlite_where=text('social_profile_url_normalized IS NOT NULL')),
+        Index('ix_founders_created_at_id', nulls_low(column('created_at')), 'id'),
+        Index('ix_founders_name_key_id', name_key(column('founder_name')), 'id'),
+        Index('ix_founders_last_outreach_at_id', nulls_low(column('last_outreach_at')), 'id'),
+        Index('ix_founders_outreach_count_id', 'outreach_count', 'id'),
+        Index('ix_founders_tool_id_created_at_id', 'tool_id', nulls_low(column('created_at')), 'id'),
+        Index('ix_founders_tool_id_name_key_id', 'tool_id', name_key(column('founder_name')), 'id'),
+        Index('ix_founders_tool_id_last_outreach_at_id', 'tool_id', nulls_low(column('last_outreach_at')), 'id'),
+        Index('ix_founders_tool_id_outreach_count_id', 'tool_id', 'outreach_count', 'id'),
+        Index('ix_founders_with_tool_created_at_id', nulls_low(column('created_at')), 'id',
+              postgresql_where=text('tool_id IS NOT NULL'), sqlite_where=text('tool_id IS NOT NULL')),
+        Index('ix_founders_without_tool_created_at_id', nulls_low(column('created_at')), 'id',
+              postgresql_where=text('tool_id IS NULL'), sqlite_where=text('tool_id IS NULL')),
+    )
     
     id = Column(String(36), primary_key=True, default=generate_uuid)
     founder_name = Column(String(255), nullable=False, index=True)
     social_profile_url = Column(String(500), nullable=True)
+    social_profile_url_normalized = Column(String(500), nullable=True)
     tool_id = Column(String(36), ForeignKey('tools.id', ondelete='CASCADE'), nullable=True, index=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Outreach summary, archived records included; maintained by summaries.py
+    outreach_count = Column(Integer, nullable=False, default=0, server_default='0')
+    last_outreach_at = Column(UTCDateTime(), nullable=True)
+    latest_status = Column(SQLEnum(OutreachStatus), nullable=True, index=True)
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    created_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
     
     tool = relationship('Tool', back_populates='founders')
-    outreach_records = relationship('OutreachRecord', back_populates='founder', cascade='all, delete-orphan')
+    outreach_records = relationship('OutreachRecord', back_populates='founder', cascade='all, delete-orphan', passive_deletes=True)
+    
+    normalized_url_columns = {'social_profile_url': 'social_profile_url_normalized'}
+    
+    @validates('social_profile_url')
+    def _normalize_social_profile_url(self, key, value):
+        self.social_profile_url_normalized = normalize_url(value)
+        lead_url_filter.add(self.social_profile_url_normalized)
+        return value
 
 class FacebookProfile(Base):
     __tablename__ = 'facebook_profiles'
@@ -48,11 +136,16 @@ class FacebookProfile(Base):
     id = Column(String(36), primary_key=True, default=generate_uuid)
     profile_name = Column(String(255), nullable=False, index=True)
     template_id = Column(String(36), ForeignKey('templates.id', ondelete='SET NULL'), nullable=True, index=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # NULL falls back to DEFAULT_SENDS_PER_HOUR
+    sends_per_hour = Column(Integer, nullable=True)
+    outreach_count = Column(Integer, nullable=False, default=0, server_default='0')
+    last_outreach_at = Column(UTCDateTime(), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    created_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
     
     template = relationship('Template', back_populates='facebook_profiles')
-    outreach_records = relationship('OutreachRecord', back_populates='facebook_profile', cascade='all, delete-orphan')
+    outreach_records = relationship('OutreachRecord', back_populates='facebook_profile', cascade='all, delete-orphan', passive_deletes=True)
 
 class Template(Base):
     __tablename__ = 'templates'
@@ -60,14 +153,27 @@ class Template(Base):
     id = Column(String(36), primary_key=True, default=generate_uuid)
     template_name = Column(String(255), nullable=False, index=True)
     template_content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    created_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
     
-    facebook_profiles = relationship('FacebookProfile', back_populates='template')
-    outreach_records = relationship('OutreachRecord', back_populates='template', cascade='all, delete-orphan')
+    facebook_profiles = relationship('FacebookProfile', back_populates='template', passive_deletes=True)
+    # The foreign key is ON DELETE SET NULL: records outlive their template
+    outreach_records = relationship('OutreachRecord', back_populates='template', passive_deletes=True)
 
 class OutreachRecord(Base):
     __tablename__ = 'outreach_records'
+    __table_args__ = (
+        Index('ix_outreach_records_closed_updated_at', 'updated_at', postgresql_where=text("status = 'CLOSED'"),
+              sqlite_where=text("status = 'CLOSED'")),
+        Index('ix_outreach_records_send_queue', 'fb_profile_id', 'created_at', postgresql_where=text("status = 'MESSAGE_GENERATED'"),
+              sqlite_where=text("status = 'MESSAGE_GENERATED'")),
+        # One conversation per founder per profile; generation relies on it via ON CONFLICT DO NOTHING
+        Index('uq_outreach_records_founder_id_fb_profile_id', 'founder_id', 'fb_profile_id', unique=True),
+        # Status board: each status's rows already in board order
+        Index('ix_outreach_records_status_updated_at_id', 'status', nulls_low(column('updated_at'), descending=True),
+              column('id').desc()),
+    )
     
     id = Column(String(36), primary_key=True, default=generate_uuid)
     founder_id = Column(String(36), ForeignKey('founders.id', ondelete='CASCADE'), nullable=False, index=True)
@@ -77,10 +183,113 @@ class OutreachRecord(Base):
     generated_message = Column(Text, nullable=True)
     note = Column(Text, nullable=True)
     status = Column(SQLEnum(OutreachStatus), default=OutreachStatus.MESSAGE_GENERATED, index=True)
-    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Send-queue lease held by the operator who claimed the record
+    leased_by = Column(String(100), nullable=True)
+    lease_expires_at = Column(UTCDateTime(), nullable=True)
+    version = Column(Integer, nullable=False, default=1, server_default='1')
+    created_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
     
     founder = relationship('Founder', back_populates='outreach_records')
     tool = relationship('Tool', back_populates='outreach_records')
     facebook_profile = relationship('FacebookProfile', back_populates='outreach_records')
     template = relationship('Template', back_populates='outreach_records')
+
+class OutreachRecordArchive(Base):
+    """Closed outreach records moved out of the hot table by the archival job."""
+    __tablename__ = 'outreach_records_archive'
+    __table_args__ = (
+        Index('ix_outreach_records_archive_founder_id_fb_profile_id', 'founder_id', 'fb_profile_id'),
+    )
+    
+    archived = True
+    
+    id = Column(String(36), primary_key=True)
+    founder_id = Column(String(36), ForeignKey('founders.id', ondelete='CASCADE'), nullable=False, index=True)
+    tool_id = Column(String(36), ForeignKey('tools.id', ondelete='CASCADE'), nullable=False, index=True)
+    fb_profile_id = Column(String(36), ForeignKey('facebook_profiles.id', ondelete='CASCADE'), nullable=False, index=True)
+    template_id = Column(String(36), ForeignKey('templates.id', ondelete='SET NULL'), nullable=True, index=True)
+    generated_message = Column(Text, nullable=True)
+    note = Column(Text, nullable=True)
+    status = Column(SQLEnum(OutreachStatus), nullable=True)
+    created_at = Column(UTCDateTime(), nullable=True)
+    updated_at = Column(UTCDateTime(), nullable=True, index=True)
+    archived_at = Column(UTCDateTime(), nullable=False, default=lambda: datetime.now(timezone.utc))
+    
+    founder = relationship('Founder', viewonly=True)
+    tool = relationship('Tool', viewonly=True)
+    facebook_profile = relationship('FacebookProfile', viewonly=True)
+    template = relationship('Template', viewonly=True)
+
+class OutreachEvent(Base):
+    """Append-only log of outreach status transitions, range-partitioned by month on Postgres."""
+    __tablename__ = 'outreach_events'
+    __table_args__ = (
+        Index('ix_outreach_events_created_at', 'created_at', postgresql_using='brin'),
+        Index('ix_outreach_events_outreach_id_created_at', 'outreach_id', 'created_at'),
+        Index('ix_outreach_events_to_status_created_at', 'to_status', 'created_at'),
+        Index('ix_outreach_events_fb_profile_id_to_status_created_at', 'fb_profile_id', 'to_status', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+    
+    # The partition key has to be part of the primary key
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    created_at = Column(UTCDateTime(), primary_key=True, default=lambda: datetime.now(timezone.utc))
+    # No foreign keys: events outlive the records they describe
+    outreach_id = Column(String(36), nullable=False)
+    founder_id = Column(String(36), nullable=False)
+    tool_id = Column(String(36), nullable=False)
+    fb_profile_id = Column(String(36), nullable=False)
+    from_status = Column(SQLEnum(OutreachStatus), nullable=True)
+    to_status = Column(SQLEnum(OutreachStatus), nullable=False)
+
+class IdempotencyKey(Base):
+    """Stored outcome of a POST sent with an ``Idempotency-Key`` header."""
+    __tablename__ = 'idempotency_keys'
+    
+    key = Column(String(255), primary_key=True)
+    scope = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)
+    # NULL while the first request is still running
+    status_code = Column(Integer, nullable=True)
+    content_type = Column(String(255), nullable=True)
+    # [name, value] pairs replayed with the body, ETag and Location among them
+    response_headers = Column(JSON, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+    locked_until = Column(UTCDateTime(), nullable=False)
+    created_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(UTCDateTime(), nullable=False, index=True)
+
+class Job(Base):
+    """Background job claimed by workers with ``FOR UPDATE SKIP LOCKED``."""
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        Index('ix_jobs_queued_created_at', 'created_at', postgresql_where=text("status = 'QUEUED'"),
+              sqlite_where=text("status = 'QUEUED'")),
+    )
+    
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    kind = Column(String(100), nullable=False, index=True)
+    status = Column(SQLEnum(JobStatus), nullable=False, default=JobStatus.QUEUED, index=True)
+    params = Column(JSON, nullable=False, default=dict)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    progress = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100), nullable=True)
+    heartbeat_at = Column(UTCDateTime(), nullable=True)
+    created_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc))
+    started_at = Column(UTCDateTime(), nullable=True)
+    finished_at = Column(UTCDateTime(), nullable=True)
+    updated_at = Column(UTCDateTime(), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+class Deletion(Base):
+    """Tombstone written by an AFTER DELETE trigger on every synced table."""
+    __tablename__ = 'deletions'
+    
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True, autoincrement=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(String(36), nullable=False)
+    deleted_at = Column(UTCDateTime(), nullable=False, default=lambda: datetime.now(timezone.utc), index=True)
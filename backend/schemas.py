@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
@@ -10,6 +10,20 @@ class OutreachStatusEnum(str, Enum):
     CLOSED = "closed"
     GIVEAWAY_RUNNING = "giveaway_running"
 
+class SortOrderEnum(str, Enum):
+    ASC = "asc"
+    DESC = "desc"
+
+class FounderSortEnum(str, Enum):
+    CREATED_AT = "created_at"
+    FOUNDER_NAME = "founder_name"
+    LAST_OUTREACH_AT = "last_outreach_at"
+    OUTREACH_COUNT = "outreach_count"
+
+class ToolSortEnum(str, Enum):
+    CREATED_AT = "created_at"
+    TOOL_NAME = "tool_name"
+
 # Tool Schemas
 class ToolBase(BaseModel):
     tool_name: str
@@ -25,10 +39,13 @@ class ToolUpdate(BaseModel):
     tool_description: Optional[str] = None
     website_url: Optional[str] = None
     source_url: Optional[str] = None
+    # Alternative to If-Match: the version the edit was based on
+    version: Optional[int] = Field(None, ge=1)
 
 class ToolResponse(ToolBase):
     model_config = ConfigDict(from_attributes=True)
     id: str
+    version: int
     created_at: datetime
     updated_at: datetime
 
@@ -45,18 +62,24 @@ class FounderUpdate(BaseModel):
     founder_name: Optional[str] = None
     social_profile_url: Optional[str] = None
     tool_id: Optional[str] = None
+    version: Optional[int] = Field(None, ge=1)
 
 class FounderResponse(FounderBase):
     model_config = ConfigDict(from_attributes=True)
     id: str
+    version: int
     created_at: datetime
     updated_at: datetime
+    outreach_count: int = 0
+    last_outreach_at: Optional[datetime] = None
+    latest_status: Optional[OutreachStatusEnum] = None
     tool: Optional[ToolResponse] = None
 
 # Facebook Profile Schemas
 class FacebookProfileBase(BaseModel):
     profile_name: str
     template_id: Optional[str] = None
+    sends_per_hour: Optional[int] = Field(None, ge=0)
 
 class FacebookProfileCreate(FacebookProfileBase):
     pass
@@ -64,10 +87,15 @@ class FacebookProfileCreate(FacebookProfileBase):
 class FacebookProfileUpdate(BaseModel):
     profile_name: Optional[str] = None
     template_id: Optional[str] = None
+    sends_per_hour: Optional[int] = Field(None, ge=0)
+    version: Optional[int] = Field(None, ge=1)
 
 class FacebookProfileResponse(FacebookProfileBase):
     model_config = ConfigDict(from_attributes=True)
     id: str
+    version: int
+    outreach_count: int = 0
+    last_outreach_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -82,13 +110,31 @@ class TemplateCreate(TemplateBase):
 class TemplateUpdate(BaseModel):
     template_name: Optional[str] = None
     template_content: Optional[str] = None
+    version: Optional[int] = Field(None, ge=1)
 
 class TemplateResponse(TemplateBase):
     model_config = ConfigDict(from_attributes=True)
     id: str
+    version: int
     created_at: datetime
     updated_at: datetime
 
+class TemplatePreviewRequest(BaseModel):
+    tool_id: Optional[str] = None
+    founder_ids: Optional[List[str]] = Field(None, max_length=10000)
+    has_tool: Optional[bool] = None
+    limit: int = Field(1000, ge=1, le=10000)
+    sample: bool = False
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=10000)
+
+class BulkDeleteResult(BaseModel):
+    deleted: int
+    founders_deleted: int
+    outreach_deleted: int
+
 
 # Combined Tool + Founder Creation
 class ToolFounderCreate(BaseModel):
@@ -122,6 +168,7 @@ class OutreachRecordUpdate(BaseModel):
     status: Optional[OutreachStatusEnum] = None
     generated_message: Optional[str] = None
     note: Optional[str] = None
+    version: Optional[int] = Field(None, ge=1)
 
 class OutreachRecordResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -133,12 +180,27 @@ class OutreachRecordResponse(BaseModel):
     generated_message: Optional[str] = None
     note: Optional[str] = None
     status: OutreachStatusEnum
+    # None for archived records, which are read-only
+    version: Optional[int] = None
+    leased_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
     created_at: datetime
-    updated_at: datetime
+    # The column is nullable; the board lists such records last
+    updated_at: Optional[datetime] = None
     founder: Optional[FounderResponse] = None
     tool: Optional[ToolResponse] = None
     facebook_profile: Optional[FacebookProfileResponse] = None
     template: Optional[TemplateResponse] = None
+    archived: bool = False
+
+class OutreachBoardColumn(BaseModel):
+    status: OutreachStatusEnum
+    count: int
+    records: List[OutreachRecordResponse]
+    next_cursor: Optional[str] = None
+
+class OutreachBoard(BaseModel):
+    columns: List[OutreachBoardColumn]
 
 # Generate Message Request
 class GenerateMessageRequest(BaseModel):
@@ -151,3 +213,145 @@ class DashboardStats(BaseModel):
     total_messages_sent: int
     total_replies: int
     reply_rate: float
+
+# Funnel Response
+class FunnelStageCounts(BaseModel):
+    message_generated: int
+    message_sent: int
+    replied: int
+    giveaway_running: int
+    closed: int
+
+class FunnelTiming(BaseModel):
+    samples: int
+    avg_seconds: Optional[float] = None
+    p50_seconds: Optional[float] = None
+    p90_seconds: Optional[float] = None
+
+class OutreachFunnel(BaseModel):
+    since: datetime
+    until: Optional[datetime] = None
+    stages: FunnelStageCounts
+    generated_to_sent: FunnelTiming
+    sent_to_replied: FunnelTiming
+
+# Lead Lookup Schemas
+class LeadLookupRequest(BaseModel):
+    urls: List[str] = Field(..., max_length=10000)
+
+class LeadLookupResult(BaseModel):
+    url: str
+    normalized: Optional[str] = None
+    exists: bool
+    tool_ids: List[str] = []
+    founder_ids: List[str] = []
+
+class LeadLookupResponse(BaseModel):
+    results: List[LeadLookupResult]
+    checked_in_db: int
+
+# Job Schemas
+class JobStatusEnum(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+class JobCreate(BaseModel):
+    kind: str
+    params: Dict[str, Any] = {}
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    kind: str
+    status: JobStatusEnum
+    params: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    progress: int
+    total: Optional[int] = None
+    cancel_requested: bool
+    attempts: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class BulkGenerateRequest(BaseModel):
+    fb_profile_id: str
+    founder_ids: List[str] = Field(..., max_length=50000)
+
+# Sync Schemas
+# No outreach summaries: they change without bumping updated_at, so a delta
+# sync would never resend them
+class FounderSyncItem(FounderBase):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+class FacebookProfileSyncItem(FacebookProfileBase):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    version: int
+    created_at: datetime
+    updated_at: datetime
+
+class OutreachRecordSyncItem(OutreachRecordBase):
+    model_config = ConfigDict(from_attributes=True)
+    id: str
+    version: int
+    leased_by: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+class Tombstone(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    entity_type: str
+    entity_id: str
+    deleted_at: datetime
+
+class SyncResponse(BaseModel):
+    # Set on the last page only: the next sync starts from it
+    token: Optional[str] = None
+    full: bool
+    next_cursor: Optional[str] = None
+    tools: List[ToolResponse]
+    founders: List[FounderSyncItem]
+    profiles: List[FacebookProfileSyncItem]
+    templates: List[TemplateResponse]
+    outreach: List[OutreachRecordSyncItem]
+    deleted: List[Tombstone]
+
+# Batch
+class BatchMethodEnum(str, Enum):
+    GET = "GET"
+    POST = "POST"
+    PUT = "PUT"
+    DELETE = "DELETE"
+
+class BatchOperation(BaseModel):
+    # Name later operations use to reference this one's response
+    id: Optional[str] = Field(None, pattern=r'^[A-Za-z_][A-Za-z0-9_-]*$')
+    method: BatchMethodEnum
+    path: str
+    query: Dict[str, Any] = {}
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=50)
+    atomic: bool = False
+
+class BatchOperationResult(BaseModel):
+    id: Optional[str] = None
+    status: int
+    headers: Dict[str, str] = {}
+    body: Optional[Any] = None
+
+class BatchResponse(BaseModel):
+    committed: bool
+    results: List[BatchOperationResult]
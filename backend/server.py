@@ -1,32 +1,90 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Header, Request
+from fastapi.responses import StreamingResponse, Response, JSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, insert, update, delete, func, null, extract, exists, or_, true, false, union_all, any_, bindparam, literal_column, String, tuple_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import selectinload
 import os
+import io
+import re
+import json
+import asyncio
+import csv
 import logging
 from pathlib import Path
 from typing import List, Optional
-from datetime import datetime, timezone
+from datetime import datetime, timezone, timedelta
+from contextlib import asynccontextmanager
 
-from database import get_db, engine, Base
-from models import Tool, Founder, FacebookProfile, Template, OutreachRecord, OutreachStatus
+from database import get_db, engine, read_engine, Base, AsyncSessionLocal, ReadSessionLocal, IS_SQLITE, dialect_insert
+from models import Tool, Founder, FacebookProfile, Template, OutreachRecord, OutreachRecordArchive, OutreachStatus, OutreachEvent, Job, JobStatus, Deletion, UTCDateTime, generate_uuid
+from events import record_status_change, created_event_rows, ensure_event_partitions
+from archive import archive_closed_outreach
+from batch import BatchError, validate_operations, execute_batch
+from coalesce import CoalescingMiddleware, coalescing_stats, table_generations
+from compression import CompressionMiddleware, compressed_body_cache
+from tracing import TRACE_ID_HEADER, TRACE_JSONL_PATH, TRACE_OTLP_ENDPOINT, TracedRoute, TracingMiddleware, instrument_engine, trace_export_loop
+from slow_queries import slow_query_log
+from counts import TotalCount, EXACT, TOTAL_COUNT_HEADER, TOTAL_COUNT_TYPE_HEADER, count_rows, page_total, set_total_count
+from leads import normalize_url, lead_url_filter
+from listing import InvalidCursor, name_key, prefix_filter, sort_keys, rows_after, created_between, encode_cursor, decode_cursor
+from idempotency import idempotency_middleware, idempotency_cleanup_loop
+from lifecycle import warm_up
+from summaries import refresh_summaries, affected_by_delete, rebuild_summaries
+from snapshot import take_snapshot
+from versioning import InvalidIfMatch, etag, parse_if_match, versioned_update, current_version
+from sync import (
+    SYNC_OVERLAP, SYNC_PAGE_SIZE, InvalidSyncToken, SyncCursor, encode_token, decode_token, needs_full_sync,
+    tombstone_cleanup_loop, encode_cursor as encode_sync_cursor, decode_cursor as decode_sync_cursor
+)
+from loadshed import LoadSheddingMiddleware, pool_admission
+from jobs import JobContext, JOB_HANDLERS, job_handler, enqueue_job, request_cancel, start_job_worker, stop_job_worker
 from schemas import (
     ToolCreate, ToolUpdate, ToolResponse,
     FounderCreate, FounderUpdate, FounderResponse,
     FacebookProfileCreate, FacebookProfileUpdate, FacebookProfileResponse,
-    TemplateCreate, TemplateUpdate, TemplateResponse,
+    TemplateCreate, TemplateUpdate, TemplateResponse, TemplatePreviewRequest,
     OutreachRecordCreate, OutreachRecordUpdate, OutreachRecordResponse,
-    GenerateMessageRequest, DashboardStats, OutreachStatusEnum,
-    ToolFounderCreate, ToolFounderResponse
+    GenerateMessageRequest, DashboardStats, OutreachStatusEnum, SortOrderEnum, FounderSortEnum, ToolSortEnum,
+    ToolFounderCreate, ToolFounderResponse,
+    OutreachFunnel, FunnelStageCounts, FunnelTiming,
+    JobCreate, JobResponse, JobStatusEnum, BulkGenerateRequest,
+    SyncResponse, BulkDeleteRequest, BulkDeleteResult,
+    LeadLookupRequest, LeadLookupResult, LeadLookupResponse,
+    BatchRequest, BatchResponse, OutreachBoard, OutreachBoardColumn
 )
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-app = FastAPI(title="Founder Outreach Manager API")
-api_router = APIRouter(prefix="/api")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    async with AsyncSessionLocal() as session:
+        await ensure_event_partitions(session)
+    await start_job_worker(AsyncSessionLocal)
+    background = [
+        asyncio.create_task(idempotency_cleanup_loop()),
+        asyncio.create_task(tombstone_cleanup_loop()),
+        # Serve liveness probes while warming; readiness flips when done
+        asyncio.create_task(warm_up(app, read_engine)),
+    ]
+    if TRACE_JSONL_PATH or TRACE_OTLP_ENDPOINT:
+        background.append(asyncio.create_task(trace_export_loop()))
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+        await stop_job_worker()
+        await engine.dispose()
+
+app = FastAPI(title="Founder Outreach Manager API", lifespan=lifespan)
+api_router = APIRouter(prefix="/api", route_class=TracedRoute)
 
 # Configure logging
 logging.basicConfig(
@@ -35,11 +93,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ============== OPTIMISTIC CONCURRENCY ==============
+def _expected_version(if_match: Optional[str], body_version: Optional[int]) -> Optional[int]:
+    try:
+        header_version = parse_if_match(if_match)
+    except InvalidIfMatch:
+        raise HTTPException(status_code=400, detail="Invalid If-Match header")
+    if header_version is not None and body_version is not None and header_version != body_version:
+        raise HTTPException(status_code=400, detail="If-Match and version disagree")
+    return body_version if body_version is not None else header_version
+
+async def _raise_update_failed(db: AsyncSession, model, row_id: str, label: str):
+    # Only reached when the conditional UPDATE matched nothing
+    version = await current_version(db, model, row_id)
+    await db.rollback()
+    if version is None:
+        raise HTTPException(status_code=404, detail=f"{label} not found")
+    raise HTTPException(
+        status_code=409,
+        detail=f"{label} was changed by someone else; reload it and retry",
+        headers={"ETag": etag(version)}
+    )
+
 # ============== TOOLS ENDPOINTS ==============
+TOOL_SORT_COLUMNS = {
+    ToolSortEnum.CREATED_AT: Tool.created_at,
+    ToolSortEnum.TOOL_NAME: name_key(Tool.tool_name),
+}
+
 @api_router.get("/tools", response_model=List[ToolResponse])
-async def get_tools(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Tool).order_by(Tool.created_at.desc()))
-    return result.scalars().all()
+async def get_tools(
+    response: Response,
+    sort: ToolSortEnum = Query(ToolSortEnum.CREATED_AT),
+    order: SortOrderEnum = Query(SortOrderEnum.DESC),
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=255),
+    has_website: Optional[bool] = Query(None),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    # Each sort is served by a (key, id) index declared on the model
+    conditions = created_between(Tool.created_at, created_after, created_before)
+    if name_prefix:
+        conditions.append(prefix_filter(name_key(Tool.tool_name), name_prefix))
+    if has_website is not None:
+        conditions.append(Tool.website_url.is_not(None) if has_website else Tool.website_url.is_(None))
+    query = select(Tool).where(*conditions).order_by(*sort_keys(TOOL_SORT_COLUMNS[sort], Tool.id, order))
+    result = await db.execute(query.limit(limit).offset(offset))
+    tools = result.scalars().all()
+    total = page_total(tools, limit, offset) or await count_rows(db, query, Tool.__tablename__, filtered=bool(conditions))
+    set_total_count(response, total)
+    return tools
 
 @api_router.post("/tools", response_model=ToolResponse)
 async def create_tool(tool: ToolCreate, db: AsyncSession = Depends(get_db)):
@@ -50,43 +156,72 @@ async def create_tool(tool: ToolCreate, db: AsyncSession = Depends(get_db)):
     return db_tool
 
 @api_router.get("/tools/{tool_id}", response_model=ToolResponse)
-async def get_tool(tool_id: str, db: AsyncSession = Depends(get_db)):
+async def get_tool(tool_id: str, response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Tool).where(Tool.id == tool_id))
     tool = result.scalar_one_or_none()
     if not tool:
         raise HTTPException(status_code=404, detail="Tool not found")
+    response.headers["ETag"] = etag(tool.version)
     return tool
 
 @api_router.put("/tools/{tool_id}", response_model=ToolResponse)
-async def update_tool(tool_id: str, tool_update: ToolUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Tool).where(Tool.id == tool_id))
+async def update_tool(
+    tool_id: str,
+    tool_update: ToolUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    expected_version = _expected_version(if_match, tool_update.version)
+    update_data = tool_update.model_dump(exclude_unset=True, exclude={'version'})
+    result = await db.execute(
+        versioned_update(Tool, tool_id, update_data, expected_version).returning(Tool)
+    )
     tool = result.scalar_one_or_none()
-    if not tool:
-        raise HTTPException(status_code=404, detail="Tool not found")
-    
-    update_data = tool_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(tool, key, value)
-    tool.updated_at = datetime.now(timezone.utc)
+    if tool is None:
+        await _raise_update_failed(db, Tool, tool_id, "Tool")
     await db.commit()
-    await db.refresh(tool)
+    response.headers["ETag"] = etag(tool.version)
     return tool
 
 @api_router.delete("/tools/{tool_id}")
 async def delete_tool(tool_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Tool).where(Tool.id == tool_id))
-    tool = result.scalar_one_or_none()
-    if not tool:
+    founder_ids, profile_ids = await affected_by_delete(db, 'tool_id', [tool_id])
+    result = await db.execute(delete(Tool).where(Tool.id == tool_id).returning(Tool.id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Tool not found")
-    await db.delete(tool)
+    await refresh_summaries(db, founder_ids, profile_ids)
     await db.commit()
     return {"message": "Tool deleted successfully"}
 
 
+@api_router.delete("/tools", response_model=BulkDeleteResult)
+async def delete_tools(request: BulkDeleteRequest, db: AsyncSession = Depends(get_db)):
+    tool_ids = list(dict.fromkeys(request.ids))
+    
+    # Count what the ON DELETE CASCADE will take with it, in the same transaction
+    result = await db.execute(select(
+        select(func.count(Founder.id)).where(Founder.tool_id.in_(tool_ids)).scalar_subquery(),
+        select(func.count(OutreachRecord.id)).where(OutreachRecord.tool_id.in_(tool_ids)).scalar_subquery()
+    ))
+    founders_deleted, outreach_deleted = result.one()
+    founder_ids, profile_ids = await affected_by_delete(db, 'tool_id', tool_ids)
+    
+    result = await db.execute(delete(Tool).where(Tool.id.in_(tool_ids)))
+    await refresh_summaries(db, founder_ids, profile_ids)
+    await db.commit()
+    return BulkDeleteResult(
+        deleted=result.rowcount,
+        founders_deleted=founders_deleted,
+        outreach_deleted=outreach_deleted
+    )
+
+
 # ============== COMBINED TOOL + FOUNDER ENDPOINT ==============
 @api_router.post("/tool-founder", response_model=ToolFounderResponse)
 async def create_tool_with_founder(data: ToolFounderCreate, db: AsyncSession = Depends(get_db)):
-    # Create Tool
+    # Create Tool and the Founder linked to it in one transaction, so a
+    # failed request never leaves an orphan tool behind for the retry
     db_tool = Tool(
         tool_name=data.tool_name,
         tool_description=data.tool_description,
@@ -94,10 +229,8 @@ async def create_tool_with_founder(data: ToolFounderCreate, db: AsyncSession = D
         source_url=data.source_url
     )
     db.add(db_tool)
-    await db.commit()
-    await db.refresh(db_tool)
+    await db.flush()
     
-    # Create Founder linked to Tool
     db_founder = Founder(
         founder_name=data.founder_name,
         social_profile_url=data.social_profile_url,
@@ -105,7 +238,7 @@ async def create_tool_with_founder(data: ToolFounderCreate, db: AsyncSession = D
     )
     db.add(db_founder)
     await db.commit()
-    await db.refresh(db_founder)
+    await db.refresh(db_tool)
     
     # Reload founder with tool relationship
     result = await db.execute(
@@ -116,17 +249,95 @@ async def create_tool_with_founder(data: ToolFounderCreate, db: AsyncSession = D
     return ToolFounderResponse(tool=db_tool, founder=founder_with_tool)
 
 
+# ============== LEADS ENDPOINTS ==============
+@api_router.post("/leads/lookup", response_model=LeadLookupResponse)
+async def lookup_leads(request: LeadLookupRequest, db: AsyncSession = Depends(get_db)):
+    normalized = {url: normalize_url(url) for url in request.urls}
+    
+    await lead_url_filter.refresh(db)
+    candidates = [
+        value for value in dict.fromkeys(normalized.values())
+        if value and lead_url_filter.might_contain(value)
+    ]
+    
+    tool_ids, founder_ids = {}, {}
+    if candidates:
+        # One round trip for both tables; on Postgres a single array
+        # parameter keeps the statement text the same for any batch size
+        urls = bindparam('urls', candidates, type_=ARRAY(String))
+        def matches(column):
+            return column.in_(candidates) if IS_SQLITE else column == any_(urls)
+        result = await db.execute(union_all(
+            select(literal_column("'tool'").label('kind'), Tool.id, Tool.website_url_normalized.label('url'))
+                .where(matches(Tool.website_url_normalized)),
+            select(literal_column("'founder'"), Founder.id, Founder.social_profile_url_normalized)
+                .where(matches(Founder.social_profile_url_normalized)),
+        ))
+        for kind, row_id, url in result.all():
+            matches = tool_ids if kind == 'tool' else founder_ids
+            matches.setdefault(url, []).append(row_id)
+    
+    results = [
+        LeadLookupResult(
+            url=url,
+            normalized=value,
+            exists=value in tool_ids or value in founder_ids,
+            tool_ids=tool_ids.get(value, []),
+            founder_ids=founder_ids.get(value, [])
+        )
+        for url, value in normalized.items()
+    ]
+    return LeadLookupResponse(results=results, checked_in_db=len(candidates))
+
+
 # ============== FOUNDERS ENDPOINTS ==============
+FOUNDER_SORT_COLUMNS = {
+    FounderSortEnum.CREATED_AT: Founder.created_at,
+    FounderSortEnum.FOUNDER_NAME: name_key(Founder.founder_name),
+    FounderSortEnum.LAST_OUTREACH_AT: Founder.last_outreach_at,
+    FounderSortEnum.OUTREACH_COUNT: Founder.outreach_count,
+}
+
 @api_router.get("/founders", response_model=List[FounderResponse])
 async def get_founders(
+    response: Response,
     tool_id: Optional[str] = Query(None),
+    sort: FounderSortEnum = Query(FounderSortEnum.CREATED_AT),
+    order: SortOrderEnum = Query(SortOrderEnum.DESC),
+    latest_status: Optional[OutreachStatusEnum] = Query(None),
+    contacted: Optional[bool] = Query(None),
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=255),
+    has_tool: Optional[bool] = Query(None),
+    created_after: Optional[datetime] = Query(None),
+    created_before: Optional[datetime] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
     db: AsyncSession = Depends(get_db)
 ):
-    query = select(Founder).options(selectinload(Founder.tool)).order_by(Founder.created_at.desc())
+    # Each sort is served by a (key, id) index declared on the model, and by
+    # a (tool_id, key, id) one within a tool. has_tool has partial indexes
+    # only for the created_at sort; the other sorts walk their (key, id)
+    # index and filter on tool_id, which skips few rows since most founders
+    # have a tool
+    conditions = created_between(Founder.created_at, created_after, created_before)
     if tool_id:
-        query = query.where(Founder.tool_id == tool_id)
-    result = await db.execute(query)
-    return result.scalars().all()
+        conditions.append(Founder.tool_id == tool_id)
+    if has_tool is not None:
+        conditions.append(Founder.tool_id.is_not(None) if has_tool else Founder.tool_id.is_(None))
+    if name_prefix:
+        conditions.append(prefix_filter(name_key(Founder.founder_name), name_prefix))
+    if latest_status:
+        conditions.append(Founder.latest_status == OutreachStatus(latest_status.value))
+    if contacted is not None:
+        conditions.append(Founder.outreach_count > 0 if contacted else Founder.outreach_count == 0)
+    query = select(Founder).options(selectinload(Founder.tool)).where(*conditions).order_by(
+        *sort_keys(FOUNDER_SORT_COLUMNS[sort], Founder.id, order)
+    )
+    result = await db.execute(query.limit(limit).offset(offset))
+    founders = result.scalars().all()
+    total = page_total(founders, limit, offset) or await count_rows(db, query, Founder.__tablename__, filtered=bool(conditions))
+    set_total_count(response, total)
+    return founders
 
 @api_router.post("/founders", response_model=FounderResponse)
 async def create_founder(founder: FounderCreate, db: AsyncSession = Depends(get_db)):
@@ -140,28 +351,63 @@ async def create_founder(founder: FounderCreate, db: AsyncSession = Depends(get_
     )
     return result.scalar_one()
 
+@api_router.get("/founders/uncontacted", response_model=List[FounderResponse])
+async def get_uncontacted_founders(
+    response: Response,
+    fb_profile_id: str = Query(...),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    # Anti-join probes the (founder_id, fb_profile_id) indexes once per founder
+    contacted = exists().where(
+        OutreachRecord.founder_id == Founder.id,
+        OutreachRecord.fb_profile_id == fb_profile_id
+    )
+    contacted_archived = exists().where(
+        OutreachRecordArchive.founder_id == Founder.id,
+        OutreachRecordArchive.fb_profile_id == fb_profile_id
+    )
+    query = select(Founder).options(selectinload(Founder.tool)).where(
+        Founder.tool_id.is_not(None),
+        ~contacted,
+        ~contacted_archived
+    ).order_by(*sort_keys(Founder.created_at, Founder.id, SortOrderEnum.DESC))
+    result = await db.execute(query.limit(limit).offset(offset))
+    founders = result.scalars().all()
+    total = page_total(founders, limit, offset) or await count_rows(db, query, Founder.__tablename__, filtered=True)
+    set_total_count(response, total)
+    return founders
+
 @api_router.get("/founders/{founder_id}", response_model=FounderResponse)
-async def get_founder(founder_id: str, db: AsyncSession = Depends(get_db)):
+async def get_founder(founder_id: str, response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(
         select(Founder).options(selectinload(Founder.tool)).where(Founder.id == founder_id)
     )
     founder = result.scalar_one_or_none()
     if not founder:
         raise HTTPException(status_code=404, detail="Founder not found")
+    response.headers["ETag"] = etag(founder.version)
     return founder
 
 @api_router.put("/founders/{founder_id}", response_model=FounderResponse)
-async def update_founder(founder_id: str, founder_update: FounderUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Founder).where(Founder.id == founder_id))
-    founder = result.scalar_one_or_none()
-    if not founder:
-        raise HTTPException(status_code=404, detail="Founder not found")
-    
-    update_data = founder_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(founder, key, value)
-    founder.updated_at = datetime.now(timezone.utc)
+async def update_founder(
+    founder_id: str,
+    founder_update: FounderUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    expected_version = _expected_version(if_match, founder_update.version)
+    update_data = founder_update.model_dump(exclude_unset=True, exclude={'version'})
+    result = await db.execute(
+        versioned_update(Founder, founder_id, update_data, expected_version).returning(Founder.version)
+    )
+    version = result.scalar_one_or_none()
+    if version is None:
+        await _raise_update_failed(db, Founder, founder_id, "Founder")
     await db.commit()
+    response.headers["ETag"] = etag(version)
     
     # Reload with tool relationship
     result = await db.execute(
@@ -171,19 +417,21 @@ async def update_founder(founder_id: str, founder_update: FounderUpdate, db: Asy
 
 @api_router.delete("/founders/{founder_id}")
 async def delete_founder(founder_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Founder).where(Founder.id == founder_id))
-    founder = result.scalar_one_or_none()
-    if not founder:
+    _, profile_ids = await affected_by_delete(db, 'founder_id', [founder_id])
+    result = await db.execute(delete(Founder).where(Founder.id == founder_id).returning(Founder.id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Founder not found")
-    await db.delete(founder)
+    await refresh_summaries(db, profile_ids=profile_ids)
     await db.commit()
     return {"message": "Founder deleted successfully"}
 
 # ============== FACEBOOK PROFILES ENDPOINTS ==============
 @api_router.get("/profiles", response_model=List[FacebookProfileResponse])
-async def get_profiles(db: AsyncSession = Depends(get_db)):
+async def get_profiles(response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(FacebookProfile).order_by(FacebookProfile.created_at.desc()))
-    return result.scalars().all()
+    profiles = result.scalars().all()
+    set_total_count(response, page_total(profiles, None, 0))
+    return profiles
 
 @api_router.post("/profiles", response_model=FacebookProfileResponse)
 async def create_profile(profile: FacebookProfileCreate, db: AsyncSession = Depends(get_db)):
@@ -194,43 +442,51 @@ async def create_profile(profile: FacebookProfileCreate, db: AsyncSession = Depe
     return db_profile
 
 @api_router.get("/profiles/{profile_id}", response_model=FacebookProfileResponse)
-async def get_profile(profile_id: str, db: AsyncSession = Depends(get_db)):
+async def get_profile(profile_id: str, response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(FacebookProfile).where(FacebookProfile.id == profile_id))
     profile = result.scalar_one_or_none()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
+    response.headers["ETag"] = etag(profile.version)
     return profile
 
 @api_router.put("/profiles/{profile_id}", response_model=FacebookProfileResponse)
-async def update_profile(profile_id: str, profile_update: FacebookProfileUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(FacebookProfile).where(FacebookProfile.id == profile_id))
+async def update_profile(
+    profile_id: str,
+    profile_update: FacebookProfileUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    expected_version = _expected_version(if_match, profile_update.version)
+    update_data = profile_update.model_dump(exclude_unset=True, exclude={'version'})
+    result = await db.execute(
+        versioned_update(FacebookProfile, profile_id, update_data, expected_version).returning(FacebookProfile)
+    )
     profile = result.scalar_one_or_none()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    
-    update_data = profile_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(profile, key, value)
-    profile.updated_at = datetime.now(timezone.utc)
+    if profile is None:
+        await _raise_update_failed(db, FacebookProfile, profile_id, "Profile")
     await db.commit()
-    await db.refresh(profile)
+    response.headers["ETag"] = etag(profile.version)
     return profile
 
 @api_router.delete("/profiles/{profile_id}")
 async def delete_profile(profile_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(FacebookProfile).where(FacebookProfile.id == profile_id))
-    profile = result.scalar_one_or_none()
-    if not profile:
+    founder_ids, _ = await affected_by_delete(db, 'fb_profile_id', [profile_id])
+    result = await db.execute(delete(FacebookProfile).where(FacebookProfile.id == profile_id).returning(FacebookProfile.id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Profile not found")
-    await db.delete(profile)
+    await refresh_summaries(db, founder_ids=founder_ids)
     await db.commit()
     return {"message": "Profile deleted successfully"}
 
 # ============== TEMPLATES ENDPOINTS ==============
 @api_router.get("/templates", response_model=List[TemplateResponse])
-async def get_templates(db: AsyncSession = Depends(get_db)):
+async def get_templates(response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Template).order_by(Template.created_at.desc()))
-    return result.scalars().all()
+    templates = result.scalars().all()
+    set_total_count(response, page_total(templates, None, 0))
+    return templates
 
 @api_router.post("/templates", response_model=TemplateResponse)
 async def create_template(template: TemplateCreate, db: AsyncSession = Depends(get_db)):
@@ -241,65 +497,405 @@ async def create_template(template: TemplateCreate, db: AsyncSession = Depends(g
     return db_template
 
 @api_router.get("/templates/{template_id}", response_model=TemplateResponse)
-async def get_template(template_id: str, db: AsyncSession = Depends(get_db)):
+async def get_template(template_id: str, response: Response, db: AsyncSession = Depends(get_db)):
     result = await db.execute(select(Template).where(Template.id == template_id))
     template = result.scalar_one_or_none()
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
+    response.headers["ETag"] = etag(template.version)
     return template
 
 @api_router.put("/templates/{template_id}", response_model=TemplateResponse)
-async def update_template(template_id: str, template_update: TemplateUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Template).where(Template.id == template_id))
+async def update_template(
+    template_id: str,
+    template_update: TemplateUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    expected_version = _expected_version(if_match, template_update.version)
+    update_data = template_update.model_dump(exclude_unset=True, exclude={'version'})
+    result = await db.execute(
+        versioned_update(Template, template_id, update_data, expected_version).returning(Template)
+    )
     template = result.scalar_one_or_none()
-    if not template:
-        raise HTTPException(status_code=404, detail="Template not found")
-    
-    update_data = template_update.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(template, key, value)
-    template.updated_at = datetime.now(timezone.utc)
+    if template is None:
+        await _raise_update_failed(db, Template, template_id, "Template")
     await db.commit()
-    await db.refresh(template)
+    response.headers["ETag"] = etag(template.version)
     return template
 
 @api_router.delete("/templates/{template_id}")
 async def delete_template(template_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Template).where(Template.id == template_id))
-    template = result.scalar_one_or_none()
-    if not template:
+    result = await db.execute(delete(Template).where(Template.id == template_id).returning(Template.id))
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Template not found")
-    await db.delete(template)
     await db.commit()
     return {"message": "Template deleted successfully"}
 
+PLACEHOLDER_PATTERN = re.compile(r"\{(\w+)\}")
+PLACEHOLDER_NAMES = ("founder_name", "tool_name", "tool_description")
+
+def placeholder_values(founder: Founder, tool: Optional[Tool]) -> dict:
+    return {
+        "founder_name": founder.founder_name,
+        "tool_name": tool.tool_name if tool else None,
+        "tool_description": tool.tool_description if tool else None
+    }
+
+def render_message(template_content: str, founder: Founder, tool: Optional[Tool]) -> str:
+    generated_message = template_content
+    for name, value in placeholder_values(founder, tool).items():
+        generated_message = generated_message.replace("{" + name + "}", value or "")
+    return generated_message
+
+@api_router.post("/templates/{template_id}/preview")
+async def preview_template(template_id: str, request: TemplatePreviewRequest, db: AsyncSession = Depends(get_db)):
+    """Render a template for a set of founders without persisting anything.
+    
+    Streams NDJSON: a header line with the placeholders the template uses,
+    one line per founder, then a summary of missing values.
+    """
+    result = await db.execute(select(Template.template_content).where(Template.id == template_id))
+    template_content = result.scalar_one_or_none()
+    if template_content is None:
+        raise HTTPException(status_code=404, detail="Template not found")
+    
+    used = list(dict.fromkeys(PLACEHOLDER_PATTERN.findall(template_content)))
+    known = [name for name in used if name in PLACEHOLDER_NAMES]
+    unknown = [name for name in used if name not in PLACEHOLDER_NAMES]
+    
+    query = select(Founder, Tool).outerjoin(Tool, Founder.tool_id == Tool.id)
+    if request.tool_id:
+        query = query.where(Founder.tool_id == request.tool_id)
+    if request.founder_ids is not None:
+        query = query.where(Founder.id.in_(request.founder_ids))
+    if request.has_tool is not None:
+        query = query.where(Founder.tool_id.isnot(None) if request.has_tool else Founder.tool_id.is_(None))
+    query = query.order_by(func.random() if request.sample else Founder.created_at.desc()).limit(request.limit)
+    
+    async def lines():
+        yield json.dumps({"template_id": template_id, "placeholders": known, "unknown_placeholders": unknown}) + "\n"
+        rendered = 0
+        missing_counts = dict.fromkeys(known, 0)
+        async with ReadSessionLocal() as session:
+            result = await session.stream(query.execution_options(yield_per=500))
+            async for partition in result.partitions():
+                chunk = []
+                for founder, tool in partition:
+                    values = placeholder_values(founder, tool)
+                    missing = [name for name in known if not (values[name] or "").strip()]
+                    for name in missing:
+                        missing_counts[name] += 1
+                    rendered += 1
+                    chunk.append(json.dumps({
+                        "founder_id": founder.id,
+                        "founder_name": founder.founder_name,
+                        "tool_id": tool.id if tool else None,
+                        "message": render_message(template_content, founder, tool),
+                        "missing": missing
+                    }) + "\n")
+                yield "".join(chunk)
+        yield json.dumps({"summary": {"rendered": rendered, "missing": missing_counts}}) + "\n"
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 # ============== OUTREACH RECORDS ENDPOINTS ==============
+def _outreach_query(model, tool_id, founder_id, fb_profile_id, status):
+    query = select(model).options(
+        selectinload(model.founder).selectinload(Founder.tool),
+        selectinload(model.tool),
+        selectinload(model.facebook_profile),
+        selectinload(model.template)
+    ).order_by(*sort_keys(model.updated_at, model.id, SortOrderEnum.DESC))
+    
+    if tool_id:
+        query = query.where(model.tool_id == tool_id)
+    if founder_id:
+        query = query.where(model.founder_id == founder_id)
+    if fb_profile_id:
+        query = query.where(model.fb_profile_id == fb_profile_id)
+    if status:
+        query = query.where(model.status == OutreachStatus(status.value))
+    return query
+
+async def _outreach_total(db: AsyncSession, include_archived: bool, tool_id, founder_id, fb_profile_id, status) -> TotalCount:
+    # Founder and profile summaries already count every record, archived ones included
+    if include_archived and not (tool_id or status) and bool(founder_id) != bool(fb_profile_id):
+        owner, owner_id = (Founder, founder_id) if founder_id else (FacebookProfile, fb_profile_id)
+        result = await db.execute(select(owner.outreach_count).where(owner.id == owner_id))
+        return TotalCount(result.scalar_one_or_none() or 0, EXACT)
+
+    filtered = any((tool_id, founder_id, fb_profile_id, status))
+    models = (OutreachRecord, OutreachRecordArchive) if include_archived else (OutreachRecord,)
+    total = TotalCount(0, EXACT)
+    for model in models:
+        query = _outreach_query(model, tool_id, founder_id, fb_profile_id, status)
+        total += await count_rows(db, query, model.__tablename__, filtered)
+    return total
+
 @api_router.get("/outreach", response_model=List[OutreachRecordResponse])
 async def get_outreach_records(
+    response: Response,
+    tool_id: Optional[str] = Query(None),
+    founder_id: Optional[str] = Query(None),
+    fb_profile_id: Optional[str] = Query(None),
+    status: Optional[OutreachStatusEnum] = Query(None),
+    include_archived: bool = Query(False),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db)
+):
+    query = _outreach_query(OutreachRecord, tool_id, founder_id, fb_profile_id, status)
+    if not include_archived:
+        result = await db.execute(query.limit(limit).offset(offset))
+        records = list(result.scalars().all())
+    else:
+        # Each table can contribute at most the whole window; merge, then cut the page
+        window = offset + limit if limit is not None else None
+        result = await db.execute(query.limit(window))
+        records = list(result.scalars().all())
+        result = await db.execute(
+            _outreach_query(OutreachRecordArchive, tool_id, founder_id, fb_profile_id, status).limit(window)
+        )
+        records.extend(result.scalars().all())
+        # Same order as the SQL: (updated_at, id) descending, NULL updated_at last
+        records.sort(key=lambda record: (record.updated_at is not None, record.updated_at, record.id), reverse=True)
+        records = records[offset:window]
+
+    total = page_total(records, limit, offset)
+    if total is None:
+        total = await _outreach_total(db, include_archived, tool_id, founder_id, fb_profile_id, status)
+    set_total_count(response, total)
+    return records
+
+def _board_conditions(tool_id, founder_id, fb_profile_id) -> list:
+    conditions = []
+    if tool_id:
+        conditions.append(OutreachRecord.tool_id == tool_id)
+    if founder_id:
+        conditions.append(OutreachRecord.founder_id == founder_id)
+    if fb_profile_id:
+        conditions.append(OutreachRecord.fb_profile_id == fb_profile_id)
+    return conditions
+
+def _board_query(per_status: int, statuses: List[OutreachStatus], conditions: list, cursor):
+    model = OutreachRecord
+    order = sort_keys(model.updated_at, model.id, SortOrderEnum.DESC)
+    ranges = rows_after(model.updated_at, model.id, SortOrderEnum.DESC, *cursor) if cursor is not None else [true()]
+    # The counts ride in the same statement as the records, so both come
+    # from one snapshot and a column never shows more records than its count
+    branches = [
+        select(null().label('id'), model.status.label('status'), func.count().label('count'))
+        .where(*conditions, model.status.in_(statuses)).group_by(model.status)
+    ]
+    # Each record branch reads one range of the (status, updated_at, id)
+    # index and stops after one row more than the column shows, which tells
+    # whether the column has more
+    for outreach_status in statuses:
+        for after in ranges:
+            top = select(model.id).where(*conditions, model.status == outreach_status, after).order_by(
+                *order
+            ).limit(per_status + 1).subquery()
+            branches.append(select(top.c.id, null(), null()))
+    board = union_all(*branches).subquery()
+    return select(model, board.c.status, board.c.count).select_from(board).outerjoin(
+        model, model.id == board.c.id
+    ).options(
+        selectinload(model.founder).selectinload(Founder.tool),
+        selectinload(model.tool),
+        selectinload(model.facebook_profile),
+        selectinload(model.template)
+    ).order_by(model.status, *order)
+
+@api_router.get("/outreach/board", response_model=OutreachBoard)
+async def get_outreach_board(
+    per_status: int = Query(10, ge=1, le=100),
     tool_id: Optional[str] = Query(None),
     founder_id: Optional[str] = Query(None),
     fb_profile_id: Optional[str] = Query(None),
     status: Optional[OutreachStatusEnum] = Query(None),
+    cursor: Optional[str] = Query(None),
     db: AsyncSession = Depends(get_db)
 ):
-    query = select(OutreachRecord).options(
-        selectinload(OutreachRecord.founder).selectinload(Founder.tool),
-        selectinload(OutreachRecord.tool),
-        selectinload(OutreachRecord.facebook_profile),
-        selectinload(OutreachRecord.template)
-    ).order_by(OutreachRecord.updated_at.desc())
+    """The newest ``per_status`` records and the count of every status.
+
+    A column's ``next_cursor`` goes back with that column's ``status`` to
+    load its next records.
+    """
+    if cursor is not None and status is None:
+        raise HTTPException(status_code=400, detail="cursor needs the status of its column")
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    statuses = [OutreachStatus(status.value)] if status else list(OutreachStatus)
+    conditions = _board_conditions(tool_id, founder_id, fb_profile_id)
+    result = await db.execute(_board_query(per_status, statuses, conditions, after))
+    columns = {outreach_status: [] for outreach_status in statuses}
+    # Counted over the whole column, so "load more" pages still see its total
+    counts = {}
+    for record, outreach_status, count in result.all():
+        if record is None:
+            counts[outreach_status] = count
+        else:
+            columns[record.status].append(record)
+
+    board = []
+    for outreach_status, column in columns.items():
+        records = column[:per_status]
+        more = len(column) > per_status
+        board.append(OutreachBoardColumn(
+            status=outreach_status.value,
+            count=counts.get(outreach_status, 0),
+            records=records,
+            next_cursor=encode_cursor(records[-1].updated_at, records[-1].id) if more else None
+        ))
+    return OutreachBoard(columns=board)
+
+EXPORT_COLUMNS = [
+    'id', 'founder_name', 'tool_name', 'profile_name', 'template_name', 'status',
+    'generated_message', 'note', 'created_at', 'updated_at', 'archived'
+]
+
+def _export_select(model, archived: bool, tool_id, founder_id, fb_profile_id, status):
+    query = select(
+        model.id,
+        Founder.founder_name,
+        Tool.tool_name,
+        FacebookProfile.profile_name,
+        Template.template_name,
+        model.status,
+        model.generated_message,
+        model.note,
+        model.created_at,
+        model.updated_at,
+        (true() if archived else false()).label('archived')
+    ).join(Founder, Founder.id == model.founder_id
+    ).join(Tool, Tool.id == model.tool_id
+    ).join(FacebookProfile, FacebookProfile.id == model.fb_profile_id
+    ).outerjoin(Template, Template.id == model.template_id)
     
     if tool_id:
-        query = query.where(OutreachRecord.tool_id == tool_id)
+        query = query.where(model.tool_id == tool_id)
     if founder_id:
-        query = query.where(OutreachRecord.founder_id == founder_id)
+        query = query.where(model.founder_id == founder_id)
     if fb_profile_id:
-        query = query.where(OutreachRecord.fb_profile_id == fb_profile_id)
+        query = query.where(model.fb_profile_id == fb_profile_id)
     if status:
-        query = query.where(OutreachRecord.status == OutreachStatus(status.value))
+        query = query.where(model.status == OutreachStatus(status.value))
+    return query
+
+@api_router.get("/outreach/export")
+async def export_outreach_records(
+    tool_id: Optional[str] = Query(None),
+    founder_id: Optional[str] = Query(None),
+    fb_profile_id: Optional[str] = Query(None),
+    status: Optional[OutreachStatusEnum] = Query(None),
+    include_archived: bool = Query(False)
+):
+    query = _export_select(OutreachRecord, False, tool_id, founder_id, fb_profile_id, status)
+    if include_archived:
+        query = query.union_all(
+            _export_select(OutreachRecordArchive, True, tool_id, founder_id, fb_profile_id, status)
+        )
+    
+    # The response outlives the request's dependencies, so the stream owns its session
+    async def rows():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        async with ReadSessionLocal() as session:
+            result = await session.stream(query.execution_options(yield_per=1000))
+            async for partition in result.partitions():
+                for row in partition:
+                    writer.writerow([
+                        value.value if isinstance(value, OutreachStatus) else value
+                        for value in row
+                    ])
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    return StreamingResponse(
+        rows(),
+        media_type="text/csv",
+        headers={"Content-Disposition": "attachment; filename=outreach.csv"}
+    )
+
+@api_router.post("/outreach/archive", response_model=JobResponse, status_code=202)
+async def archive_outreach_records(
+    older_than_days: int = Query(90, ge=0),
+    batch_size: int = Query(500, ge=1, le=10000)
+):
+    return await enqueue_job(AsyncSessionLocal, 'archive_outreach', {
+        'older_than_days': older_than_days,
+        'batch_size': batch_size
+    })
+
+def outreach_row(founder: Founder, fb_profile: FacebookProfile) -> dict:
+    now = datetime.now(timezone.utc)
+    return dict(
+        id=generate_uuid(),
+        founder_id=founder.id,
+        tool_id=founder.tool.id,
+        fb_profile_id=fb_profile.id,
+        template_id=fb_profile.template.id,
+        generated_message=render_message(fb_profile.template.template_content, founder, founder.tool),
+        status=OutreachStatus.MESSAGE_GENERATED,
+        created_at=now,
+        updated_at=now
+    )
+
+async def insert_outreach_rows(db: AsyncSession, rows: List[dict]) -> List[str]:
+    """Insert generated records, skipping founder/profile pairs that already exist.
     
-    result = await db.execute(query)
-    return result.scalars().all()
+    The unique (founder_id, fb_profile_id) index makes this safe against
+    concurrent generation. Pairs only left in the archive count as contacted
+    too, as they do for /founders/uncontacted. Returns the ids that were
+    actually inserted.
+    """
+    if rows:
+        result = await db.execute(
+            select(OutreachRecordArchive.founder_id, OutreachRecordArchive.fb_profile_id).where(
+                OutreachRecordArchive.founder_id.in_({row['founder_id'] for row in rows}),
+                OutreachRecordArchive.fb_profile_id.in_({row['fb_profile_id'] for row in rows})
+            ).distinct()
+        )
+        archived = set(result.all())
+        rows = [row for row in rows if (row['founder_id'], row['fb_profile_id']) not in archived]
+    if not rows:
+        return []
+    result = await db.execute(
+        dialect_insert(OutreachRecord).values(rows).on_conflict_do_nothing().returning(OutreachRecord.id)
+    )
+    inserted = set(result.scalars().all())
+    created = [row for row in rows if row['id'] in inserted]
+    if created:
+        await db.execute(insert(OutreachEvent).values(created_event_rows(created)))
+        await refresh_summaries(
+            db,
+            [row['founder_id'] for row in created],
+            [row['fb_profile_id'] for row in created]
+        )
+    return [row['id'] for row in created]
+
+@api_router.post("/outreach/generate/bulk", response_model=JobResponse, status_code=202)
+async def generate_outreach_messages_bulk(request: BulkGenerateRequest, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        select(FacebookProfile).options(selectinload(FacebookProfile.template)).where(FacebookProfile.id == request.fb_profile_id)
+    )
+    fb_profile = result.scalar_one_or_none()
+    if not fb_profile:
+        raise HTTPException(status_code=404, detail="Facebook profile not found")
+    if not fb_profile.template:
+        raise HTTPException(status_code=400, detail="Facebook profile has no linked template")
+    # Hand the connection back first: on SQLite the enqueue needs the only writer
+    await db.close()
+    return await enqueue_job(AsyncSessionLocal, 'bulk_generate_messages', request.model_dump())
 
 @api_router.post("/outreach/generate", response_model=OutreachRecordResponse)
 async def generate_outreach_message(request: GenerateMessageRequest, db: AsyncSession = Depends(get_db)):
@@ -323,49 +919,189 @@ async def generate_outreach_message(request: GenerateMessageRequest, db: AsyncSe
     if not fb_profile.template:
         raise HTTPException(status_code=400, detail="Facebook profile has no linked template")
     
-    # Generate message from template
-    template_content = fb_profile.template.template_content
-    generated_message = template_content.replace("{founder_name}", founder.founder_name)
-    generated_message = generated_message.replace("{tool_name}", founder.tool.tool_name)
-    generated_message = generated_message.replace("{tool_description}", founder.tool.tool_description or "")
+    # Generate message from template and create outreach record
+    inserted = await insert_outreach_rows(db, [outreach_row(founder, fb_profile)])
+    if not inserted:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Founder was already messaged from this profile")
+    await db.commit()
     
-    # Create outreach record
-    outreach = OutreachRecord(
-        founder_id=founder.id,
-        tool_id=founder.tool.id,
-        fb_profile_id=fb_profile.id,
-        template_id=fb_profile.template.id,
-        generated_message=generated_message,
-        status=OutreachStatus.MESSAGE_GENERATED
+    # Reload with all relationships
+    result = await db.execute(
+        select(OutreachRecord).options(
+            selectinload(OutreachRecord.founder).selectinload(Founder.tool),
+            selectinload(OutreachRecord.tool),
+            selectinload(OutreachRecord.facebook_profile),
+            selectinload(OutreachRecord.template)
+        ).where(OutreachRecord.id == inserted[0])
+        # The founder and profile loaded above predate their summary refresh
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one()
+
+# ============== SEND QUEUE ENDPOINTS ==============
+DEFAULT_SENDS_PER_HOUR = int(os.environ.get('DEFAULT_SENDS_PER_HOUR', '20'))
+DEFAULT_LEASE_SECONDS = int(os.environ.get('SEND_LEASE_SECONDS', '600'))
+
+@api_router.post("/outreach/next", response_model=OutreachRecordResponse)
+async def claim_next_outreach(
+    fb_profile_id: str = Query(...),
+    operator: str = Query("anonymous", max_length=100),
+    lease_seconds: int = Query(DEFAULT_LEASE_SECONDS, ge=30, le=3600),
+    db: AsyncSession = Depends(get_db)
+):
+    now = datetime.now(timezone.utc)
+    window_start = now - timedelta(hours=1)
+    
+    # Locking the profile row serializes claims per profile, so the budget
+    # check and the claim below cannot interleave between operators
+    result = await db.execute(
+        select(FacebookProfile.sends_per_hour).where(FacebookProfile.id == fb_profile_id).with_for_update()
+    )
+    profile = result.one_or_none()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Facebook profile not found")
+    budget = profile.sends_per_hour if profile.sends_per_hour is not None else DEFAULT_SENDS_PER_HOUR
+    
+    # Sends in the last hour plus outstanding leases count against the budget
+    sent = select(
+        func.count().label('count'),
+        func.min(OutreachEvent.created_at).label('oldest')
+    ).where(
+        OutreachEvent.fb_profile_id == fb_profile_id,
+        OutreachEvent.to_status == OutreachStatus.MESSAGE_SENT,
+        OutreachEvent.created_at >= window_start
+    ).subquery()
+    leased = select(
+        func.count().label('count'),
+        func.min(OutreachRecord.lease_expires_at).label('earliest_expiry')
+    ).where(
+        OutreachRecord.fb_profile_id == fb_profile_id,
+        OutreachRecord.status == OutreachStatus.MESSAGE_GENERATED,
+        OutreachRecord.lease_expires_at > now
+    ).subquery()
+    # One row each, joined side by side
+    result = await db.execute(
+        select(sent.c.count, sent.c.oldest, leased.c.count, leased.c.earliest_expiry)
+        .select_from(sent.join(leased, true()))
     )
-    db.add(outreach)
+    sent_count, oldest_sent, lease_count, earliest_expiry = result.one()
+    
+    if sent_count + lease_count >= budget:
+        await db.rollback()
+        freed_at = [t for t in (oldest_sent and oldest_sent + timedelta(hours=1), earliest_expiry) if t]
+        retry_after = max(1, int((min(freed_at) - now).total_seconds())) if freed_at else 3600
+        raise HTTPException(
+            status_code=429,
+            detail="Hourly send budget for this profile is exhausted",
+            headers={"Retry-After": str(retry_after)}
+        )
+    
+    candidate = select(OutreachRecord.id).where(
+        OutreachRecord.fb_profile_id == fb_profile_id,
+        OutreachRecord.status == OutreachStatus.MESSAGE_GENERATED,
+        or_(OutreachRecord.lease_expires_at.is_(None), OutreachRecord.lease_expires_at <= now)
+    ).order_by(OutreachRecord.created_at).limit(1).with_for_update(skip_locked=True).scalar_subquery()
+    result = await db.execute(
+        update(OutreachRecord).where(OutreachRecord.id == candidate).values(
+            leased_by=operator,
+            lease_expires_at=now + timedelta(seconds=lease_seconds)
+        ).returning(OutreachRecord.id)
+    )
+    outreach_id = result.scalar_one_or_none()
     await db.commit()
+    if outreach_id is None:
+        return Response(status_code=204)
     
-    # Reload with all relationships
     result = await db.execute(
         select(OutreachRecord).options(
             selectinload(OutreachRecord.founder).selectinload(Founder.tool),
             selectinload(OutreachRecord.tool),
             selectinload(OutreachRecord.facebook_profile),
             selectinload(OutreachRecord.template)
-        ).where(OutreachRecord.id == outreach.id)
+        ).where(OutreachRecord.id == outreach_id)
     )
     return result.scalar_one()
 
+@api_router.post("/outreach/{outreach_id}/release")
+async def release_outreach_lease(
+    outreach_id: str,
+    fb_profile_id: str = Query(...),
+    operator: str = Query("anonymous", max_length=100),
+    db: AsyncSession = Depends(get_db)
+):
+    # Only the operator holding a live lease may hand it back
+    result = await db.execute(
+        update(OutreachRecord).where(
+            OutreachRecord.id == outreach_id,
+            OutreachRecord.fb_profile_id == fb_profile_id,
+            OutreachRecord.status == OutreachStatus.MESSAGE_GENERATED,
+            OutreachRecord.leased_by == operator,
+            OutreachRecord.lease_expires_at > datetime.now(timezone.utc)
+        ).values(
+            leased_by=None,
+            lease_expires_at=None
+        ).returning(OutreachRecord.id)
+    )
+    if result.scalar_one_or_none() is None:
+        result = await db.execute(select(OutreachRecord.id).where(OutreachRecord.id == outreach_id))
+        found = result.scalar_one_or_none()
+        await db.rollback()
+        if found is None:
+            raise HTTPException(status_code=404, detail="Outreach record not found")
+        raise HTTPException(status_code=409, detail="Lease is not held by this operator and profile")
+    await db.commit()
+    return {"message": "Lease released"}
+
 @api_router.put("/outreach/{outreach_id}", response_model=OutreachRecordResponse)
-async def update_outreach_record(outreach_id: str, update: OutreachRecordUpdate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(OutreachRecord).where(OutreachRecord.id == outreach_id))
-    outreach = result.scalar_one_or_none()
-    if not outreach:
-        raise HTTPException(status_code=404, detail="Outreach record not found")
-    
-    update_data = update.model_dump(exclude_unset=True)
+async def update_outreach_record(
+    outreach_id: str,
+    update: OutreachRecordUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db)
+):
+    expected_version = _expected_version(if_match, update.version)
+    update_data = update.model_dump(exclude_unset=True, exclude={'version'})
     if 'status' in update_data:
         update_data['status'] = OutreachStatus(update_data['status'].value)
-    for key, value in update_data.items():
-        setattr(outreach, key, value)
-    outreach.updated_at = datetime.now(timezone.utc)
+        if update_data['status'] != OutreachStatus.MESSAGE_GENERATED:
+            # Sent (or otherwise moved on): the send-queue lease is done
+            update_data.update(leased_by=None, lease_expires_at=None)
+    
+    returned = [
+        OutreachRecord.id,
+        OutreachRecord.founder_id,
+        OutreachRecord.tool_id,
+        OutreachRecord.fb_profile_id,
+        OutreachRecord.status,
+        OutreachRecord.updated_at,
+        OutreachRecord.version
+    ]
+    stmt = versioned_update(OutreachRecord, outreach_id, update_data, expected_version)
+    if IS_SQLITE:
+        # RETURNING cannot see FROM tables on SQLite; BEGIN IMMEDIATE already
+        # holds the write lock, so reading first is just as consistent
+        result = await db.execute(select(OutreachRecord.status).where(OutreachRecord.id == outreach_id))
+        previous_status = result.scalar_one_or_none()
+        result = await db.execute(stmt.returning(*returned))
+    else:
+        # The FROM subquery sees the row as it was before this statement, so
+        # the previous status for the event log comes back from the UPDATE
+        previous = select(OutreachRecord.id, OutreachRecord.status).where(OutreachRecord.id == outreach_id).subquery('previous')
+        result = await db.execute(
+            stmt.where(OutreachRecord.id == previous.c.id).returning(*returned, previous.c.status.label('previous_status'))
+        )
+    outreach = result.one_or_none()
+    if outreach is None:
+        await _raise_update_failed(db, OutreachRecord, outreach_id, "Outreach record")
+    if not IS_SQLITE:
+        previous_status = outreach.previous_status
+    record_status_change(db, outreach, previous_status)
+    if 'status' in update_data:
+        await refresh_summaries(db, founder_ids=[outreach.founder_id])
     await db.commit()
+    response.headers["ETag"] = etag(outreach.version)
     
     # Reload with all relationships
     result = await db.execute(
@@ -380,43 +1116,326 @@ async def update_outreach_record(outreach_id: str, update: OutreachRecordUpdate,
 
 @api_router.delete("/outreach/{outreach_id}")
 async def delete_outreach_record(outreach_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(OutreachRecord).where(OutreachRecord.id == outreach_id))
-    outreach = result.scalar_one_or_none()
-    if not outreach:
+    result = await db.execute(
+        delete(OutreachRecord).where(OutreachRecord.id == outreach_id)
+        .returning(OutreachRecord.founder_id, OutreachRecord.fb_profile_id)
+    )
+    deleted = result.one_or_none()
+    if deleted is None:
         raise HTTPException(status_code=404, detail="Outreach record not found")
-    await db.delete(outreach)
+    await refresh_summaries(db, [deleted.founder_id], [deleted.fb_profile_id])
     await db.commit()
     return {"message": "Outreach record deleted successfully"}
 
+# ============== SYNC ENDPOINT ==============
+# Sent in this order, each in (changed at, id) order; tombstones only with a delta
+SYNC_SECTIONS = (
+    ('tools', Tool, Tool.updated_at),
+    ('founders', Founder, Founder.updated_at),
+    ('profiles', FacebookProfile, FacebookProfile.updated_at),
+    ('templates', Template, Template.updated_at),
+    ('outreach', OutreachRecord, OutreachRecord.updated_at),
+    ('deleted', Deletion, Deletion.deleted_at),
+)
+
+@api_router.get("/sync", response_model=SyncResponse)
+async def sync_changes(
+    since: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(SYNC_PAGE_SIZE, ge=1, le=10000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Rows changed since ``since`` (all of them without it), at most ``limit`` per page.
+    
+    Every page but the last has a ``next_cursor`` to request the next one
+    with. Only the last page has the ``token`` for the next sync, so a
+    client that stops halfway syncs the same window again.
+    """
+    if since is not None and cursor is not None:
+        raise HTTPException(status_code=400, detail="Pass either since or cursor, not both")
+    try:
+        position = decode_sync_cursor(cursor) if cursor else None
+    except InvalidSyncToken:
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+    if position is None:
+        try:
+            since_at = decode_token(since) if since else None
+        except InvalidSyncToken:
+            raise HTTPException(status_code=400, detail="Invalid sync token")
+        # The database clock stamps the token, so every client shares one timeline
+        result = await db.execute(select(func.now(type_=UTCDateTime())))
+        now = result.scalar_one()
+        changed_after = None if needs_full_sync(since_at, now) else since_at - SYNC_OVERLAP
+        position = SyncCursor(now, changed_after, 0, None)
+    
+    full = position.changed_after is None
+    sections = SYNC_SECTIONS[:-1] if full else SYNC_SECTIONS
+    page = {name: [] for name, _, _ in SYNC_SECTIONS}
+    remaining = limit
+    section, after = position.section, position.after
+    next_cursor = None
+    while section < len(sections):
+        name, model, changed_at = sections[section]
+        query = select(model).order_by(changed_at, model.id).limit(remaining)
+        if full:
+            # Sync items always carry updated_at, which the models always set
+            query = query.where(changed_at.is_not(None))
+        else:
+            query = query.where(changed_at > position.changed_after)
+        if after is not None:
+            query = query.where(tuple_(changed_at, model.id) > tuple_(*after))
+        result = await db.execute(query)
+        page[name] = rows = result.scalars().all()
+        remaining -= len(rows)
+        if remaining == 0:
+            last = (getattr(rows[-1], changed_at.key), rows[-1].id)
+            next_cursor = encode_sync_cursor(position._replace(section=section, after=last))
+            break
+        section += 1
+        after = None
+    
+    return SyncResponse(
+        token=encode_token(position.now) if next_cursor is None else None,
+        full=full,
+        next_cursor=next_cursor,
+        tools=page['tools'],
+        founders=page['founders'],
+        profiles=page['profiles'],
+        templates=page['templates'],
+        outreach=page['outreach'],
+        deleted=page['deleted']
+    )
+
+
+# ============== JOBS ENDPOINTS ==============
+BULK_GENERATE_CHUNK_SIZE = 500
+
+@job_handler('archive_outreach')
+async def archive_outreach_job(ctx: JobContext, params: dict) -> dict:
+    archived, batches = await archive_closed_outreach(
+        ctx.session_factory,
+        int(params.get('older_than_days', 90)),
+        int(params.get('batch_size', 500)),
+        on_batch=ctx.progress
+    )
+    return {'archived': archived, 'batches': batches}
+
+@job_handler('bulk_generate_messages')
+async def bulk_generate_messages_job(ctx: JobContext, params: dict) -> dict:
+    founder_ids = list(dict.fromkeys(params['founder_ids']))
+    async with ctx.session_factory() as session:
+        result = await session.execute(
+            select(FacebookProfile).options(selectinload(FacebookProfile.template)).where(FacebookProfile.id == params['fb_profile_id'])
+        )
+        fb_profile = result.scalar_one_or_none()
+    if not fb_profile or not fb_profile.template:
+        raise ValueError("Facebook profile not found or has no linked template")
+    
+    generated = 0
+    for start in range(0, len(founder_ids), BULK_GENERATE_CHUNK_SIZE):
+        chunk = founder_ids[start:start + BULK_GENERATE_CHUNK_SIZE]
+        async with ctx.session_factory() as session:
+            result = await session.execute(
+                select(Founder).options(selectinload(Founder.tool)).where(Founder.id.in_(chunk))
+            )
+            rows = [outreach_row(founder, fb_profile) for founder in result.scalars().all() if founder.tool]
+            generated += len(await insert_outreach_rows(session, rows))
+            await session.commit()
+        await ctx.progress(start + len(chunk), len(founder_ids))
+    
+    return {'generated': generated, 'skipped': len(founder_ids) - generated}
+
+@job_handler('rebuild_outreach_summaries')
+async def rebuild_outreach_summaries_job(ctx: JobContext, params: dict) -> dict:
+    return await rebuild_summaries(
+        ctx.session_factory,
+        int(params.get('batch_size', 1000)),
+        on_batch=ctx.progress
+    )
+
+@job_handler('snapshot_outreach')
+async def snapshot_outreach_job(ctx: JobContext, params: dict) -> dict:
+    # Snapshots only read, so they stay off the writer
+    return await take_snapshot(
+        ReadSessionLocal,
+        full=bool(params.get('full', False)),
+        batch_size=int(params.get('batch_size', 5000)),
+        on_batch=ctx.progress
+    )
+
+@api_router.post("/jobs", response_model=JobResponse, status_code=202)
+async def create_job(job: JobCreate):
+    if job.kind not in JOB_HANDLERS:
+        raise HTTPException(status_code=400, detail=f"Unknown job kind: {job.kind}")
+    return await enqueue_job(AsyncSessionLocal, job.kind, job.params)
+
+@api_router.get("/jobs", response_model=List[JobResponse])
+async def get_jobs(
+    response: Response,
+    status: Optional[JobStatusEnum] = Query(None),
+    kind: Optional[str] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db)
+):
+    query = select(Job).order_by(Job.created_at.desc())
+    if status:
+        query = query.where(Job.status == JobStatus(status.value))
+    if kind:
+        query = query.where(Job.kind == kind)
+    result = await db.execute(query.limit(limit))
+    jobs = result.scalars().all()
+    total = page_total(jobs, limit, 0) or await count_rows(db, query, Job.__tablename__, filtered=bool(status or kind))
+    set_total_count(response, total)
+    return jobs
+
+@api_router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Job).where(Job.id == job_id))
+    job = result.scalar_one_or_none()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@api_router.post("/jobs/{job_id}/cancel", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    job = await request_cancel(AsyncSessionLocal, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+# ============== FUNNEL ENDPOINT ==============
+def _stage_reached_at(status: OutreachStatus):
+    return func.min(OutreachEvent.created_at).filter(OutreachEvent.to_status == status)
+
+def _seconds_between(start, end):
+    if IS_SQLITE:
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return extract('epoch', end - start)
+
+def _timing_columns(prefix: str, start, end):
+    seconds = _seconds_between(start, end)
+    if IS_SQLITE:
+        # No percentile_cont: the endpoint interpolates from the raw durations
+        p50, p90 = null(), null()
+    else:
+        p50 = func.percentile_cont(0.5).within_group(seconds)
+        p90 = func.percentile_cont(0.9).within_group(seconds)
+    return [
+        func.count(seconds).label(f'{prefix}_samples'),
+        func.avg(seconds).label(f'{prefix}_avg'),
+        p50.label(f'{prefix}_p50'),
+        p90.label(f'{prefix}_p90'),
+    ]
+
+def _percentile_cont(values: List[float], fraction: float) -> Optional[float]:
+    # Same linear interpolation as Postgres' percentile_cont
+    if not values:
+        return None
+    values = sorted(values)
+    position = fraction * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+def _timing(row, prefix: str, percentiles: Optional[tuple] = None) -> FunnelTiming:
+    def seconds(value):
+        return round(float(value), 1) if value is not None else None
+    p50, p90 = percentiles or (getattr(row, f'{prefix}_p50'), getattr(row, f'{prefix}_p90'))
+    return FunnelTiming(
+        samples=getattr(row, f'{prefix}_samples'),
+        avg_seconds=seconds(getattr(row, f'{prefix}_avg')),
+        p50_seconds=seconds(p50),
+        p90_seconds=seconds(p90),
+    )
+
+@api_router.get("/outreach/funnel", response_model=OutreachFunnel)
+async def get_outreach_funnel(
+    since: Optional[datetime] = Query(None),
+    until: Optional[datetime] = Query(None),
+    fb_profile_id: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_db)
+):
+    if since is None:
+        since = datetime.now(timezone.utc) - timedelta(days=30)
+    
+    # First time each record reached each stage within the window
+    per_record = select(
+        OutreachEvent.outreach_id,
+        _stage_reached_at(OutreachStatus.MESSAGE_GENERATED).label('generated_at'),
+        _stage_reached_at(OutreachStatus.MESSAGE_SENT).label('sent_at'),
+        _stage_reached_at(OutreachStatus.REPLIED).label('replied_at'),
+        _stage_reached_at(OutreachStatus.GIVEAWAY_RUNNING).label('giveaway_at'),
+        _stage_reached_at(OutreachStatus.CLOSED).label('closed_at'),
+    ).where(OutreachEvent.created_at >= since).group_by(OutreachEvent.outreach_id)
+    if until:
+        per_record = per_record.where(OutreachEvent.created_at < until)
+    if fb_profile_id:
+        per_record = per_record.where(OutreachEvent.fb_profile_id == fb_profile_id)
+    per_record = per_record.subquery()
+    
+    result = await db.execute(select(
+        func.count(per_record.c.generated_at).label('generated'),
+        func.count(per_record.c.sent_at).label('sent'),
+        func.count(per_record.c.replied_at).label('replied'),
+        func.count(per_record.c.giveaway_at).label('giveaway'),
+        func.count(per_record.c.closed_at).label('closed'),
+        *_timing_columns('generated_to_sent', per_record.c.generated_at, per_record.c.sent_at),
+        *_timing_columns('sent_to_replied', per_record.c.sent_at, per_record.c.replied_at),
+    ))
+    row = result.one()
+    
+    percentiles = {}
+    if IS_SQLITE:
+        result = await db.execute(select(
+            _seconds_between(per_record.c.generated_at, per_record.c.sent_at),
+            _seconds_between(per_record.c.sent_at, per_record.c.replied_at),
+        ))
+        durations = result.all()
+        for index, prefix in enumerate(('generated_to_sent', 'sent_to_replied')):
+            values = [duration[index] for duration in durations if duration[index] is not None]
+            percentiles[prefix] = (_percentile_cont(values, 0.5), _percentile_cont(values, 0.9))
+    
+    return OutreachFunnel(
+        since=since,
+        until=until,
+        stages=FunnelStageCounts(
+            message_generated=row.generated,
+            message_sent=row.sent,
+            replied=row.replied,
+            giveaway_running=row.giveaway,
+            closed=row.closed
+        ),
+        generated_to_sent=_timing(row, 'generated_to_sent', percentiles.get('generated_to_sent')),
+        sent_to_replied=_timing(row, 'sent_to_replied', percentiles.get('sent_to_replied'))
+    )
+
 # ============== STATS ENDPOINT ==============
+def _count_outreach(statuses: List[OutreachStatus]):
+    hot = select(func.count(OutreachRecord.id)).where(OutreachRecord.status.in_(statuses))
+    archived = select(func.count(OutreachRecordArchive.id)).where(OutreachRecordArchive.status.in_(statuses))
+    return select(hot.scalar_subquery() + archived.scalar_subquery())
+
 @api_router.get("/stats", response_model=DashboardStats)
 async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
     # Total founders
     result = await db.execute(select(func.count(Founder.id)))
     total_founders = result.scalar() or 0
     
-    # Total messages sent (status >= MESSAGE_SENT)
-    result = await db.execute(
-        select(func.count(OutreachRecord.id)).where(
-            OutreachRecord.status.in_([
-                OutreachStatus.MESSAGE_SENT,
-                OutreachStatus.REPLIED,
-                OutreachStatus.CLOSED,
-                OutreachStatus.GIVEAWAY_RUNNING
-            ])
-        )
-    )
+    # Total messages sent (status >= MESSAGE_SENT), archived records included
+    result = await db.execute(_count_outreach([
+        OutreachStatus.MESSAGE_SENT,
+        OutreachStatus.REPLIED,
+        OutreachStatus.CLOSED,
+        OutreachStatus.GIVEAWAY_RUNNING
+    ]))
     total_messages_sent = result.scalar() or 0
     
     # Total replies
-    result = await db.execute(
-        select(func.count(OutreachRecord.id)).where(
-            OutreachRecord.status.in_([
-                OutreachStatus.REPLIED,
-                OutreachStatus.GIVEAWAY_RUNNING
-            ])
-        )
-    )
+    result = await db.execute(_count_outreach([
+        OutreachStatus.REPLIED,
+        OutreachStatus.GIVEAWAY_RUNNING
+    ]))
     total_replies = result.scalar() or 0
     
     # Reply rate
@@ -429,6 +1448,75 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
         reply_rate=round(reply_rate, 1)
     )
 
+# ============== BATCH ENDPOINT ==============
+# Streamed bodies would be buffered whole, and these routes open sessions of
+# their own, so they never share the batch's transaction
+BATCH_UNSUPPORTED = {
+    ('POST', '/api/batch'): "batches cannot be nested",
+    ('GET', '/api/outreach/export'): "streaming endpoints cannot be batched",
+    ('POST', '/api/templates/{template_id}/preview'): "streaming endpoints cannot be batched",
+}
+BATCH_NOT_ATOMIC = {
+    ('POST', '/api/outreach/archive'): "enqueues a job outside the batch transaction",
+    ('POST', '/api/outreach/generate/bulk'): "enqueues a job outside the batch transaction",
+    ('POST', '/api/jobs'): "enqueues a job outside the batch transaction",
+    ('POST', '/api/jobs/{job_id}/cancel'): "updates the job outside the batch transaction",
+}
+
+@api_router.post("/batch", response_model=BatchResponse)
+async def run_batch(batch: BatchRequest, request: Request):
+    blocked = {**BATCH_UNSUPPORTED, **(BATCH_NOT_ATOMIC if batch.atomic else {})}
+    try:
+        validate_operations(api_router, batch.operations, blocked)
+    except BatchError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    committed, results = await execute_batch(api_router, request.scope, batch.operations, batch.atomic)
+    return {"committed": committed, "results": results}
+
+# ============== HEALTH ENDPOINTS ==============
+@api_router.get("/health/live")
+async def health_live():
+    return {"status": "ok"}
+
+@api_router.get("/health/ready")
+async def health_ready():
+    if not getattr(app.state, 'ready', False):
+        return JSONResponse(status_code=503, content={"status": "warming_up"})
+    return {"status": "ready"}
+
+# ============== INTERNAL ENDPOINTS ==============
+@api_router.get("/_internal/load")
+async def get_load_report():
+    def pool_report(pool):
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow()
+        }
+    report = {"admission": pool_admission.snapshot(), "pool": pool_report(engine.pool)}
+    if read_engine is not engine:
+        report["read_pool"] = pool_report(read_engine.pool)
+    return report
+
+@api_router.get("/_internal/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(20, ge=1, le=200),
+    order: str = Query('total_ms', pattern='^(total_ms|max_ms|count)$')
+):
+    return {
+        "threshold_ms": slow_query_log.threshold_ms,
+        "fingerprints": len(slow_query_log.entries),
+        "queries": slow_query_log.top(limit, order)
+    }
+
+@api_router.delete("/_internal/slow-queries", status_code=204)
+async def reset_slow_queries():
+    slow_query_log.reset()
+
+@api_router.get("/_internal/coalescing")
+async def get_coalescing_report():
+    return {**coalescing_stats.snapshot(), "compressed_body_cache": compressed_body_cache.snapshot()}
+
 @api_router.get("/")
 async def root():
     return {"message": "Founder Outreach Manager API"}
@@ -436,10 +1524,28 @@ async def root():
 # Include router and add middleware
 app.include_router(api_router)
 
+app.middleware("http")(idempotency_middleware)
+
+app.add_middleware(LoadSheddingMiddleware)
+
+# Inside coalescing, so requests that share a response also share its compressed body
+app.add_middleware(CompressionMiddleware)
+
+# Outside load shedding, so requests that join an in-flight read never take a slot
+table_generations.track(engine)
+app.add_middleware(CoalescingMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", TOTAL_COUNT_HEADER, TOTAL_COUNT_TYPE_HEADER, TRACE_ID_HEADER],
 )
+
+# Outermost, so the root span covers every other middleware
+instrument_engine(engine)
+if read_engine is not engine:
+    instrument_engine(read_engine)
+app.add_middleware(TracingMiddleware)
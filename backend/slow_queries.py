@@ -0,0 +1,164 @@
+import asyncio
+import enum
+import hashlib
+import logging
+import os
+import re
+import time
+from datetime import date, datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '500'))
+# EXPLAIN ANALYZE re-runs the statement, so it is opt-in and rate-limited
+SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', '0') == '1'
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.environ.get('SLOW_QUERY_EXPLAIN_INTERVAL_SECONDS', '300'))
+SLOW_QUERY_EXPLAIN_TIMEOUT_MS = int(os.environ.get('SLOW_QUERY_EXPLAIN_TIMEOUT_MS', '10000'))
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.environ.get('SLOW_QUERY_MAX_FINGERPRINTS', '500'))
+
+# Execution option that keeps a statement (our own EXPLAINs) out of the log
+SKIP_OPTION = 'skip_slow_query_log'
+
+_COMMENTS = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRINGS = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDERS = re.compile(r'%\(\w+\)s|%s|\$\d+|\?|(?<![:\w]):\w+')
+_NUMBERS = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LISTS = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+_DATA_MODIFYING = re.compile(r'\b(?:INSERT|UPDATE|DELETE|MERGE)\b')
+
+
+def fingerprint(statement: str) -> str:
+    """The statement with literals and placeholders replaced, so variants group together."""
+    normalized = _COMMENTS.sub(' ', statement)
+    normalized = _STRINGS.sub('?', normalized)
+    normalized = _PLACEHOLDERS.sub('?', normalized)
+    normalized = _NUMBERS.sub('?', normalized)
+    normalized = _LISTS.sub('(...)', normalized)
+    return _WHITESPACE.sub(' ', normalized).strip()
+
+
+def _redact_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, (str, bytes)):
+        return f"<{type(value).__name__}:{len(value)}>"
+    if isinstance(value, (list, tuple)):
+        return [_redact_value(item) for item in value[:10]] + (['...'] if len(value) > 10 else [])
+    return f"<{type(value).__name__}>"
+
+
+def redact(parameters: Any) -> Any:
+    """Parameters with free text replaced by type and length; ids, names and URLs never reach the log."""
+    if isinstance(parameters, dict):
+        return {key: _redact_value(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [_redact_value(value) for value in parameters]
+    return _redact_value(parameters)
+
+
+def _explainable(statement: str) -> bool:
+    head = _STRINGS.sub('?', _COMMENTS.sub(' ', statement)).strip().upper()
+    # Re-running a locking read would take the locks again
+    if 'FOR UPDATE' in head or 'FOR SHARE' in head:
+        return False
+    if head.startswith('WITH'):
+        # ANALYZE would run a data-modifying CTE a second time
+        return not _DATA_MODIFYING.search(head)
+    return head.startswith('SELECT')
+
+
+class SlowQueryLog:
+    """Per-fingerprint aggregates of statements slower than ``SLOW_QUERY_MS``."""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS):
+        self.threshold_ms = threshold_ms
+        self.entries: Dict[str, dict] = {}
+        self.explaining = False
+
+    def record(self, engine: AsyncEngine, statement: str, parameters: Any, elapsed_ms: float, route: Optional[str]) -> None:
+        normalized = fingerprint(statement)
+        key = hashlib.sha1(normalized.encode()).hexdigest()[:16]
+        redacted = redact(parameters)
+        logger.warning(
+            "Slow query %.1f ms on %s [%s]: %s params=%s",
+            elapsed_ms, route or '-', key, normalized[:500], redacted
+        )
+
+        entry = self.entries.get(key)
+        if entry is None:
+            if len(self.entries) >= SLOW_QUERY_MAX_FINGERPRINTS:
+                cheapest = min(self.entries, key=lambda name: self.entries[name]['total_ms'])
+                del self.entries[cheapest]
+            entry = self.entries[key] = {
+                'fingerprint': key,
+                'statement': normalized,
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'routes': {},
+                'plan': None,
+                'explained_at': None,
+                '_explained_monotonic': None,
+            }
+        entry['count'] += 1
+        entry['total_ms'] += elapsed_ms
+        entry['last_seen'] = datetime.now(timezone.utc).isoformat()
+        entry['routes'][route or '-'] = entry['routes'].get(route or '-', 0) + 1
+        if elapsed_ms >= entry['max_ms']:
+            entry['max_ms'] = elapsed_ms
+            entry['slowest_parameters'] = redacted
+
+        if SLOW_QUERY_EXPLAIN and not self.explaining and _explainable(statement):
+            last = entry['_explained_monotonic']
+            if last is None or time.monotonic() - last >= SLOW_QUERY_EXPLAIN_INTERVAL:
+                entry['_explained_monotonic'] = time.monotonic()
+                self.explaining = True
+                asyncio.get_running_loop().create_task(self._explain(engine, entry, statement, parameters))
+
+    async def _explain(self, engine: AsyncEngine, entry: dict, statement: str, parameters: Any) -> None:
+        """Plan the statement with the same parameters, off the request path, one at a time."""
+        try:
+            async with engine.connect() as connection:
+                connection = await connection.execution_options(**{SKIP_OPTION: True})
+                if engine.dialect.name == 'postgresql':
+                    await connection.exec_driver_sql(f"SET LOCAL statement_timeout = {SLOW_QUERY_EXPLAIN_TIMEOUT_MS}")
+                    prefix = 'EXPLAIN (ANALYZE, BUFFERS) '
+                else:
+                    prefix = 'EXPLAIN QUERY PLAN '
+                result = await connection.exec_driver_sql(prefix + statement, parameters)
+                rows = result.all()
+                # Never keep what ANALYZE executed
+                await connection.rollback()
+            entry['plan'] = '\n'.join(' | '.join(str(column) for column in row) for row in rows)
+            entry['explained_at'] = datetime.now(timezone.utc).isoformat()
+        except Exception as exc:
+            entry['plan'] = f"EXPLAIN failed: {type(exc).__name__}: {exc}"
+            logger.warning("EXPLAIN of slow query %s failed: %s", entry['fingerprint'], exc)
+        finally:
+            self.explaining = False
+
+    def top(self, limit: int, order_by: str = 'total_ms') -> list:
+        entries = sorted(self.entries.values(), key=lambda entry: entry[order_by], reverse=True)[:limit]
+        return [
+            {
+                **{key: value for key, value in entry.items() if not key.startswith('_')},
+                'total_ms': round(entry['total_ms'], 1),
+                'max_ms': round(entry['max_ms'], 1),
+                'avg_ms': round(entry['total_ms'] / entry['count'], 1),
+            }
+            for entry in entries
+        ]
+
+    def reset(self) -> None:
+        self.entries.clear()
+
+
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,293 @@
+"""Columnar snapshots of outreach history for analytics.
+
+Each snapshot reads the outreach records joined with their founder, tool,
+profile and template in keyset-ordered chunks and appends them to Parquet
+files partitioned by the month a record was created:
+
+    <dir>/outreach/created_month=2026-10/<snapshot id>.parquet
+    <dir>/deletions/<snapshot id>.parquet
+    <dir>/manifest.json
+
+A full snapshot holds every record. An incremental one holds the records
+changed (or archived) since the previous snapshot's watermark, plus
+tombstones for records deleted in that window, archived ones included. To read the current state,
+take the latest full snapshot and every incremental after it from the
+manifest, keep the row with the newest ``updated_at`` per ``id`` and drop
+ids in the deletions files.
+
+Always read the files the manifest lists rather than globbing the
+directory: a snapshot that was interrupted can leave files behind that no
+manifest entry names. DuckDB and pandas read the listed partitions as one
+dataset, e.g. ``read_parquet([<listed paths>], hive_partitioning = true)``.
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, false, null, or_, select, true, tuple_
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from models import Deletion, FacebookProfile, Founder, OutreachRecord, OutreachRecordArchive, Template, Tool
+
+# pyarrow is only needed by deployments that take snapshots
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SNAPSHOT_DIR = Path(os.environ.get('SNAPSHOT_DIR', str(Path(__file__).parent / 'snapshots')))
+SNAPSHOT_BATCH_SIZE = int(os.environ.get('SNAPSHOT_BATCH_SIZE', '5000'))
+# Rows are only read up to this long ago, so a transaction still in flight
+# when the snapshot starts cannot commit a row behind the watermark
+SNAPSHOT_SETTLE = timedelta(seconds=int(os.environ.get('SNAPSHOT_SETTLE_SECONDS', '60')))
+MANIFEST_NAME = 'manifest.json'
+
+_snapshot_lock = asyncio.Lock()
+
+
+class SnapshotUnavailable(RuntimeError):
+    pass
+
+
+def outreach_schema():
+    timestamp = pa.timestamp('us', tz='UTC')
+    return pa.schema([
+        ('id', pa.string()),
+        ('status', pa.string()),
+        ('generated_message', pa.string()),
+        ('note', pa.string()),
+        ('created_at', timestamp),
+        ('updated_at', timestamp),
+        ('archived', pa.bool_()),
+        ('archived_at', timestamp),
+        ('founder_id', pa.string()),
+        ('founder_name', pa.string()),
+        ('social_profile_url', pa.string()),
+        ('tool_id', pa.string()),
+        ('tool_name', pa.string()),
+        ('website_url', pa.string()),
+        ('fb_profile_id', pa.string()),
+        ('profile_name', pa.string()),
+        ('template_id', pa.string()),
+        ('template_name', pa.string()),
+    ])
+
+
+def deletions_schema():
+    return pa.schema([('id', pa.string()), ('deleted_at', pa.timestamp('us', tz='UTC'))])
+
+
+def _snapshot_select(model, archived: bool):
+    return select(
+        model.id,
+        model.status,
+        model.generated_message,
+        model.note,
+        model.created_at,
+        model.updated_at,
+        (true() if archived else false()).label('archived'),
+        (model.archived_at if archived else null()).label('archived_at'),
+        model.founder_id,
+        Founder.founder_name,
+        Founder.social_profile_url,
+        model.tool_id,
+        Tool.tool_name,
+        Tool.website_url,
+        model.fb_profile_id,
+        FacebookProfile.profile_name,
+        model.template_id,
+        Template.template_name,
+    ).join(Founder, Founder.id == model.founder_id
+    ).join(Tool, Tool.id == model.tool_id
+    ).join(FacebookProfile, FacebookProfile.id == model.fb_profile_id
+    ).outerjoin(Template, Template.id == model.template_id)
+
+
+def _changed_between(model, archived: bool, since: Optional[datetime], until: datetime):
+    changed = model.updated_at <= until if since is None else and_(model.updated_at > since, model.updated_at <= until)
+    if archived and since is not None:
+        # Archiving keeps updated_at, so a move into the archive is found by archived_at
+        changed = or_(changed, and_(model.archived_at > since, model.archived_at <= until))
+    return changed
+
+
+def _month(moment: Optional[datetime]) -> str:
+    return moment.strftime('%Y-%m') if moment is not None else 'unknown'
+
+
+def _temporary(path: Path) -> Path:
+    return Path(str(path) + '.tmp')
+
+
+def _row(row, schema_names: List[str]) -> dict:
+    values = dict(zip(schema_names, row))
+    values['status'] = values['status'].value if values['status'] is not None else None
+    return values
+
+
+class _PartitionWriters:
+    """One ParquetWriter per month partition, written under temporary names."""
+
+    def __init__(self, root: Path, snapshot_id: str, schema):
+        self.root = root
+        self.snapshot_id = snapshot_id
+        self.schema = schema
+        self.writers: Dict[str, object] = {}
+        self.rows: Dict[str, int] = {}
+
+    def path(self, month: str) -> Path:
+        return self.root / f'created_month={month}' / f'{self.snapshot_id}.parquet'
+
+    def write(self, rows: List[dict]) -> None:
+        by_month: Dict[str, List[dict]] = {}
+        for row in rows:
+            by_month.setdefault(_month(row['created_at']), []).append(row)
+        for month, month_rows in by_month.items():
+            writer = self.writers.get(month)
+            if writer is None:
+                path = self.path(month)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                writer = self.writers[month] = pq.ParquetWriter(str(_temporary(path)), self.schema, compression='zstd')
+            writer.write_batch(pa.RecordBatch.from_pylist(month_rows, schema=self.schema))
+            self.rows[month] = self.rows.get(month, 0) + len(month_rows)
+
+    def close(self) -> List[Tuple[Path, int]]:
+        """Finish every file and return ``(path, rows)``; they keep their temporary names."""
+        for writer in self.writers.values():
+            writer.close()
+        return [(self.path(month), self.rows[month]) for month in self.writers]
+
+    def discard(self) -> None:
+        for month, writer in self.writers.items():
+            writer.close()
+            _temporary(self.path(month)).unlink(missing_ok=True)
+
+
+def read_manifest(directory: Path = SNAPSHOT_DIR) -> dict:
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        return {'watermark': None, 'snapshots': []}
+    return json.loads(path.read_text())
+
+
+def _write_manifest(directory: Path, manifest: dict) -> None:
+    temporary = _temporary(directory / MANIFEST_NAME)
+    temporary.write_text(json.dumps(manifest, indent=2))
+    temporary.replace(directory / MANIFEST_NAME)
+
+
+def _publish(directory: Path, manifest: dict, paths: List[Path]) -> None:
+    """Move a finished snapshot's files into place, then list them in the manifest.
+
+    Runs only once every file is complete. If a rename or the manifest
+    fails, the files already moved are removed again.
+    """
+    renamed = []
+    try:
+        for path in paths:
+            _temporary(path).replace(path)
+            renamed.append(path)
+        _write_manifest(directory, manifest)
+    except BaseException:
+        for path in renamed:
+            path.unlink(missing_ok=True)
+        raise
+
+
+async def take_snapshot(
+    session_factory: async_sessionmaker,
+    full: bool = False,
+    batch_size: int = SNAPSHOT_BATCH_SIZE,
+    directory: Path = SNAPSHOT_DIR,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> dict:
+    """Write a full or incremental snapshot and record it in the manifest.
+
+    ``session_factory`` should be the read-only one: the snapshot only reads.
+    Every file, tombstones included, is written under a temporary name and
+    only renamed once all of them are complete, right before the manifest,
+    so readers going by the manifest never see a half-written snapshot.
+    """
+    if pa is None:
+        raise SnapshotUnavailable("Parquet snapshots need pyarrow: pip install pyarrow")
+
+    async with _snapshot_lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = read_manifest(directory)
+        since = None if full or manifest['watermark'] is None else datetime.fromisoformat(manifest['watermark'])
+        until = datetime.now(timezone.utc) - SNAPSHOT_SETTLE
+        if since is not None and until <= since:
+            return {'skipped': True, 'watermark': manifest['watermark']}
+
+        snapshot_id = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%fZ')
+        schema = outreach_schema()
+        writers = _PartitionWriters(directory / 'outreach', snapshot_id, schema)
+        # (path, rows) of every finished file, still under its temporary name
+        pending: List[Tuple[Path, int]] = []
+        total = 0
+        deleted = 0
+        try:
+            for model, archived in ((OutreachRecord, False), (OutreachRecordArchive, True)):
+                query = _snapshot_select(model, archived).where(_changed_between(model, archived, since, until))
+                cursor = None
+                while True:
+                    page = query.order_by(model.updated_at, model.id).limit(batch_size)
+                    if cursor is not None:
+                        page = page.where(tuple_(model.updated_at, model.id) > tuple_(*cursor))
+                    async with session_factory() as session:
+                        rows = (await session.execute(page)).all()
+                    if not rows:
+                        break
+                    batch = [_row(row, schema.names) for row in rows]
+                    await asyncio.to_thread(writers.write, batch)
+                    total += len(batch)
+                    cursor = (rows[-1].updated_at, rows[-1].id)
+                    if on_batch is not None:
+                        await on_batch(total)
+                    if len(rows) < batch_size:
+                        break
+            pending.extend(writers.close())
+
+            if since is not None:
+                async with session_factory() as session:
+                    result = await session.execute(
+                        select(Deletion.entity_id, Deletion.deleted_at).where(
+                            Deletion.entity_type == 'outreach',
+                            Deletion.deleted_at > since,
+                            Deletion.deleted_at <= until,
+                            # Archiving deletes from the hot table too; those rows live on
+                            ~exists().where(OutreachRecordArchive.id == Deletion.entity_id)
+                        )
+                    )
+                    tombstones = [{'id': entity_id, 'deleted_at': deleted_at} for entity_id, deleted_at in result.all()]
+                if tombstones:
+                    path = directory / 'deletions' / f'{snapshot_id}.parquet'
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    pending.append((path, len(tombstones)))
+                    table = pa.Table.from_pylist(tombstones, schema=deletions_schema())
+                    await asyncio.to_thread(pq.write_table, table, str(_temporary(path)), compression='zstd')
+                    deleted = len(tombstones)
+
+            entry = {
+                'id': snapshot_id,
+                'full': since is None,
+                'since': since.isoformat() if since is not None else None,
+                'until': until.isoformat(),
+                'rows': total,
+                'deleted': deleted,
+                'files': [{'path': str(path.relative_to(directory)), 'rows': rows} for path, rows in pending],
+            }
+            manifest['watermark'] = until.isoformat()
+            manifest['snapshots'].append(entry)
+            await asyncio.to_thread(_publish, directory, manifest, [path for path, _ in pending])
+        except BaseException:
+            writers.discard()
+            for path, _ in pending:
+                _temporary(path).unlink(missing_ok=True)
+            raise
+        return entry
@@ -0,0 +1,101 @@
+from typing import Awaitable, Callable, Iterable, Optional
+
+from sqlalchemy import select, update, union_all, func
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from models import Founder, FacebookProfile, OutreachRecord, OutreachRecordArchive
+
+
+def _records(owner, owner_column: str):
+    """Outreach records of the row being updated, archived ones included."""
+    # Correlated through the derived table, so it has to be explicit
+    return union_all(*[
+        select(model.status, model.created_at).where(getattr(model, owner_column) == owner.id).correlate(owner)
+        for model in (OutreachRecord, OutreachRecordArchive)
+    ]).subquery()
+
+
+def founder_summary_values() -> dict:
+    records = _records(Founder, 'founder_id')
+    return dict(
+        outreach_count=select(func.count()).select_from(records).scalar_subquery(),
+        last_outreach_at=select(func.max(records.c.created_at)).scalar_subquery(),
+        latest_status=select(records.c.status).order_by(records.c.created_at.desc()).limit(1).scalar_subquery(),
+        # Derived data, not an edit: leave updated_at (and delta sync) alone
+        updated_at=Founder.updated_at,
+    )
+
+
+def profile_summary_values() -> dict:
+    records = _records(FacebookProfile, 'fb_profile_id')
+    return dict(
+        outreach_count=select(func.count()).select_from(records).scalar_subquery(),
+        last_outreach_at=select(func.max(records.c.created_at)).scalar_subquery(),
+        updated_at=FacebookProfile.updated_at,
+    )
+
+
+async def _recompute(db: AsyncSession, model, ids: list, values: dict) -> None:
+    # Under READ COMMITTED the UPDATE's subqueries read the snapshot taken
+    # when it started, so a concurrent writer's records could be missed and
+    # its count overwritten. Locking the rows first (in id order, against
+    # deadlocks) waits for that writer, and the UPDATE then starts after it
+    # committed. FOR NO KEY UPDATE still lets outreach inserts reference them.
+    await db.execute(select(model.id).where(model.id.in_(ids)).order_by(model.id).with_for_update(key_share=True))
+    await db.execute(
+        update(model).where(model.id.in_(ids)).values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def refresh_summaries(db: AsyncSession, founder_ids: Iterable[str] = (), profile_ids: Iterable[str] = ()) -> None:
+    """Recompute the summary columns of the given rows on the caller's transaction."""
+    founder_ids = sorted(set(founder_ids))
+    profile_ids = sorted(set(profile_ids))
+    if founder_ids:
+        await _recompute(db, Founder, founder_ids, founder_summary_values())
+    if profile_ids:
+        await _recompute(db, FacebookProfile, profile_ids, profile_summary_values())
+
+
+async def affected_by_delete(db: AsyncSession, column: str, ids: Iterable[str]) -> tuple:
+    """Founders and profiles whose summaries a cascading delete will change.
+
+    Must run before the delete, while the outreach records still exist.
+    """
+    ids = list(ids)
+    rows = []
+    for model in (OutreachRecord, OutreachRecordArchive):
+        result = await db.execute(
+            select(model.founder_id, model.fb_profile_id).where(getattr(model, column).in_(ids)).distinct()
+        )
+        rows.extend(result.all())
+    return {founder_id for founder_id, _ in rows}, {profile_id for _, profile_id in rows}
+
+
+async def rebuild_summaries(
+    session_factory: async_sessionmaker,
+    batch_size: int = 1000,
+    on_batch: Optional[Callable[[int], Awaitable[None]]] = None,
+) -> dict:
+    """Recompute every summary in id order, one short transaction per batch."""
+    totals = {}
+    for model, values in ((Founder, founder_summary_values), (FacebookProfile, profile_summary_values)):
+        done = 0
+        last_id = ''
+        while True:
+            async with session_factory() as session:
+                result = await session.execute(
+                    select(model.id).where(model.id > last_id).order_by(model.id).limit(batch_size)
+                )
+                ids = result.scalars().all()
+                if not ids:
+                    break
+                await _recompute(session, model, ids, values())
+                await session.commit()
+            done += len(ids)
+            last_id = ids[-1]
+            if on_batch:
+                await on_batch(done)
+        totals[model.__tablename__] = done
+    return totals
@@ -0,0 +1,117 @@
+import asyncio
+import base64
+import json
+import logging
+import os
+from datetime import datetime, timezone, timedelta
+from typing import NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, select
+
+from database import AsyncSessionLocal
+from models import Deletion
+
+logger = logging.getLogger(__name__)
+
+# Rows committed up to this long after their updated_at was stamped are
+# still picked up by the next sync; clients upsert, so repeats are harmless
+SYNC_OVERLAP = timedelta(seconds=int(os.environ.get('SYNC_OVERLAP_SECONDS', '5')))
+TOMBSTONE_RETENTION = timedelta(days=int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', '30')))
+TOMBSTONE_CLEANUP_INTERVAL = int(os.environ.get('SYNC_TOMBSTONE_CLEANUP_INTERVAL_SECONDS', '3600'))
+SYNC_PAGE_SIZE = int(os.environ.get('SYNC_PAGE_SIZE', '1000'))
+
+# Table name -> entity type reported in tombstones
+SYNCED_TABLES = {
+    'tools': 'tool',
+    'founders': 'founder',
+    'facebook_profiles': 'profile',
+    'templates': 'template',
+    'outreach_records': 'outreach',
+}
+
+
+class InvalidSyncToken(ValueError):
+    pass
+
+
+def encode_token(moment: datetime) -> str:
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip('=')
+
+
+def decode_token(token: str) -> datetime:
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        moment = datetime.fromisoformat(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise InvalidSyncToken(str(exc)) from exc
+    if moment.tzinfo is None:
+        raise InvalidSyncToken("token has no timezone")
+    return moment
+
+
+class SyncCursor(NamedTuple):
+    """Where a paged sync stopped: the section it was in and the last row sent from it."""
+    now: datetime
+    # None for a full sync
+    changed_after: Optional[datetime]
+    section: int
+    after: Optional[Tuple[datetime, object]]
+
+
+def encode_cursor(cursor: SyncCursor) -> str:
+    after = None if cursor.after is None else [cursor.after[0].isoformat(), cursor.after[1]]
+    payload = [
+        cursor.now.isoformat(),
+        cursor.changed_after.isoformat() if cursor.changed_after is not None else None,
+        cursor.section,
+        after,
+    ]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(value: str) -> SyncCursor:
+    try:
+        padded = value + '=' * (-len(value) % 4)
+        now, changed_after, section, after = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        cursor = SyncCursor(
+            datetime.fromisoformat(now),
+            datetime.fromisoformat(changed_after) if changed_after is not None else None,
+            int(section),
+            None if after is None else (datetime.fromisoformat(after[0]), after[1]),
+        )
+    except (ValueError, TypeError, IndexError, UnicodeDecodeError) as exc:
+        raise InvalidSyncToken(str(exc)) from exc
+    moments = [cursor.now, cursor.changed_after, cursor.after and cursor.after[0]]
+    if any(moment is not None and moment.tzinfo is None for moment in moments):
+        raise InvalidSyncToken("cursor has no timezone")
+    return cursor
+
+
+def needs_full_sync(since: Optional[datetime], now: datetime) -> bool:
+    # Tombstones older than the retention window are gone, so an old token
+    # can no longer be brought up to date incrementally
+    return since is None or since < now - TOMBSTONE_RETENTION
+
+
+async def purge_tombstones(batch_size: int = 5000) -> int:
+    purged = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            cutoff = datetime.now(timezone.utc) - TOMBSTONE_RETENTION
+            expired = select(Deletion.id).where(Deletion.deleted_at < cutoff).limit(batch_size)
+            result = await session.execute(delete(Deletion).where(Deletion.id.in_(expired.scalar_subquery())))
+            await session.commit()
+        purged += result.rowcount or 0
+        if (result.rowcount or 0) < batch_size:
+            return purged
+
+
+async def tombstone_cleanup_loop() -> None:
+    while True:
+        try:
+            purged = await purge_tombstones()
+            if purged:
+                logger.info("Purged %d expired tombstones", purged)
+        except Exception:
+            logger.exception("Tombstone cleanup failed")
+        await asyncio.sleep(TOMBSTONE_CLEANUP_INTERVAL)
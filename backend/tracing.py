@@ -0,0 +1,377 @@
+import asyncio
+import functools
+import json
+import logging
+import os
+import random
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests whose span tree is recorded and exported; every
+# response still gets a trace id
+TRACE_SAMPLE_RATE = float(os.environ.get('TRACE_SAMPLE_RATE', '0'))
+TRACE_JSONL_PATH = os.environ.get('TRACE_JSONL_PATH', '')
+# Base URL of an OTLP/HTTP collector; traces are POSTed as JSON to /v1/traces
+TRACE_OTLP_ENDPOINT = os.environ.get('TRACE_OTLP_ENDPOINT', '')
+TRACE_SERVICE_NAME = os.environ.get('TRACE_SERVICE_NAME', 'founder-outreach-api')
+TRACE_QUEUE_SIZE = int(os.environ.get('TRACE_QUEUE_SIZE', '1000'))
+TRACE_STATEMENT_LENGTH = 1000
+
+TRACE_ID_HEADER = 'X-Trace-Id'
+# W3C trace context: version-traceid-parentid-flags
+TRACEPARENT_PATTERN = re.compile(r'^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$')
+
+
+class Span:
+    __slots__ = ('trace', 'parent', 'span_id', 'parent_id', 'name', 'start_ns', 'end_ns', 'attributes', 'error')
+
+    def __init__(self, trace: 'Trace', name: str, parent: Optional['Span'], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.parent = parent
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent is not None else trace.remote_parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        return {
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'name': self.name,
+            'start_unix_nano': self.start_ns,
+            'end_unix_nano': self.end_ns,
+            'duration_ms': round(((self.end_ns or self.start_ns) - self.start_ns) / 1e6, 3),
+            'attributes': self.attributes,
+            'error': self.error,
+        }
+
+
+class Trace:
+    def __init__(self, trace_id: str, sampled: bool, remote_parent_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.remote_parent_id = remote_parent_id
+        self.spans: List[Span] = []
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar('current_trace', default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar('current_span', default=None)
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+def start_span(name: str, **attributes) -> Optional[Span]:
+    """Open a child of the current span and make it current; ``None`` when not sampled."""
+    trace = _current_trace.get()
+    if trace is None or not trace.sampled:
+        return None
+    opened = Span(trace, name, _current_span.get(), attributes)
+    trace.spans.append(opened)
+    _current_span.set(opened)
+    return opened
+
+
+def end_span(span: Optional[Span], error: Optional[BaseException] = None) -> None:
+    if span is None:
+        return
+    span.finish(error)
+    if _current_span.get() is span:
+        _current_span.set(span.parent)
+
+
+class span:
+    """``with span('name', key=value):`` records a child span when the request is sampled."""
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Optional[Span]:
+        self.span = start_span(self.name, **self.attributes)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        end_span(self.span, exc)
+
+
+_export_queue: Optional[asyncio.Queue] = None
+exported = {'traces': 0, 'dropped': 0, 'failed': 0}
+
+
+def _queue() -> asyncio.Queue:
+    global _export_queue
+    if _export_queue is None:
+        _export_queue = asyncio.Queue(maxsize=TRACE_QUEUE_SIZE)
+    return _export_queue
+
+
+def _submit(trace: Trace) -> None:
+    if not (TRACE_JSONL_PATH or TRACE_OTLP_ENDPOINT):
+        return
+    try:
+        _queue().put_nowait(trace)
+    except asyncio.QueueFull:
+        exported['dropped'] += 1
+
+
+def _jsonl_record(trace: Trace) -> dict:
+    root = trace.spans[0]
+    return {
+        'trace_id': trace.trace_id,
+        'name': root.name,
+        'start_unix_nano': root.start_ns,
+        'duration_ms': root.to_dict()['duration_ms'],
+        'spans': [item.to_dict() for item in trace.spans],
+    }
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _otlp_payload(traces: List[Trace]) -> dict:
+    spans = []
+    for trace in traces:
+        for item in trace.spans:
+            spans.append({
+                'traceId': trace.trace_id,
+                'spanId': item.span_id,
+                'parentSpanId': item.parent_id or '',
+                'name': item.name,
+                'kind': 2 if item is trace.spans[0] else 1,
+                'startTimeUnixNano': str(item.start_ns),
+                'endTimeUnixNano': str(item.end_ns or item.start_ns),
+                'attributes': [{'key': key, 'value': _otlp_value(value)} for key, value in item.attributes.items()],
+                'status': {'code': 2, 'message': item.error} if item.error else {'code': 0},
+            })
+    return {'resourceSpans': [{
+        'resource': {'attributes': [{'key': 'service.name', 'value': {'stringValue': TRACE_SERVICE_NAME}}]},
+        'scopeSpans': [{'scope': {'name': __name__}, 'spans': spans}],
+    }]}
+
+
+def _append_jsonl(lines: List[str]) -> None:
+    with open(TRACE_JSONL_PATH, 'a') as handle:
+        handle.write(''.join(lines))
+
+
+async def trace_export_loop() -> None:
+    """Drain finished traces in batches to the JSONL file and/or the OTLP collector."""
+    queue = _queue()
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty() and len(batch) < 100:
+                batch.append(queue.get_nowait())
+            try:
+                if TRACE_JSONL_PATH:
+                    lines = [json.dumps(_jsonl_record(trace), default=str) + '\n' for trace in batch]
+                    await asyncio.to_thread(_append_jsonl, lines)
+                if TRACE_OTLP_ENDPOINT:
+                    response = await client.post(
+                        TRACE_OTLP_ENDPOINT.rstrip('/') + '/v1/traces', json=_otlp_payload(batch)
+                    )
+                    response.raise_for_status()
+                exported['traces'] += len(batch)
+            except Exception:
+                exported['failed'] += len(batch)
+                logger.exception("Trace export failed")
+
+
+class TracingMiddleware:
+    """Starts a trace per HTTP request and echoes its id in ``X-Trace-Id``.
+
+    An incoming sampled ``traceparent`` continues the caller's trace;
+    otherwise the request is sampled at ``TRACE_SAMPLE_RATE``.
+    """
+
+    def __init__(self, app, sample_rate: float = TRACE_SAMPLE_RATE):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get('headers', []))
+        match = TRACEPARENT_PATTERN.match(headers.get(b'traceparent', b'').decode('latin-1').strip())
+        if match:
+            trace = Trace(match.group(1), bool(int(match.group(3), 16) & 1), remote_parent_id=match.group(2))
+        else:
+            trace = Trace(uuid.uuid4().hex, random.random() < self.sample_rate)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(None)
+        root = start_span(f"{scope['method']} {scope['path']}", **{
+            'http.method': scope['method'], 'http.target': scope['path']
+        })
+        status = {'code': None}
+
+        async def traced_send(message):
+            if message['type'] == 'http.response.start':
+                status['code'] = message['status']
+                message = {**message, 'headers': [
+                    *message.get('headers', []), (TRACE_ID_HEADER.lower().encode(), trace.trace_id.encode())
+                ]}
+            await send(message)
+
+        error = None
+        try:
+            await self.app(scope, receive, traced_send)
+        except BaseException as exc:
+            error = exc
+            raise
+        finally:
+            if root is not None:
+                root.attributes['http.status_code'] = status['code']
+                end_span(root, error)
+                _submit(trace)
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+
+
+def _traced_endpoint(endpoint: Callable) -> Callable:
+    if getattr(endpoint, '__traced__', False):
+        # include_router re-creates routes from already wrapped endpoints
+        return endpoint
+
+    @functools.wraps(endpoint)
+    async def traced(*args, **kwargs):
+        with span('handler', **{'code.function': endpoint.__name__}):
+            result = await endpoint(*args, **kwargs)
+        # Closed by TracedRoute once FastAPI has built the response
+        start_span('serialize')
+        return result
+    traced.__traced__ = True
+    return traced
+
+
+class TracedRoute(APIRoute):
+    """Adds ``route``, ``handler`` and ``serialize`` spans around each endpoint call."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = _traced_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        route_path = self.path
+
+        async def traced_handler(request):
+            trace = _current_trace.get()
+            if trace is None or not trace.sampled:
+                return await handler(request)
+            trace.spans[0].attributes['http.route'] = route_path
+            route_span = start_span(f"route {route_path}")
+            try:
+                response = await handler(request)
+            except BaseException as exc:
+                _close_children(route_span, exc)
+                end_span(route_span, exc)
+                raise
+            _close_children(route_span)
+            end_span(route_span)
+            return response
+
+        return traced_handler
+
+
+def _close_children(parent: Optional[Span], error: Optional[BaseException] = None) -> None:
+    if parent is None:
+        return
+    for item in parent.trace.spans:
+        if item.parent is parent and item.end_ns is None:
+            item.finish(error)
+    _current_span.set(parent)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """One span per SQL statement; relationship loads are named as such."""
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        relationship = context.execution_options.get('trace_relationship') if context is not None else None
+        opened = start_span('orm.relationship_load' if relationship else 'db.query', **{
+            'db.system': sync_engine.dialect.name,
+            'db.operation': statement.lstrip().split(None, 1)[0].upper() if statement.strip() else '',
+            'db.statement': statement[:TRACE_STATEMENT_LENGTH],
+            **({'orm.relationship': relationship} if relationship else {}),
+        })
+        if opened is not None:
+            connection.info.setdefault('trace_spans', []).append(opened)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        spans = connection.info.get('trace_spans')
+        if spans:
+            opened = spans.pop()
+            if cursor.rowcount is not None and cursor.rowcount >= 0:
+                opened.attributes['db.rows'] = cursor.rowcount
+            end_span(opened)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        connection = exception_context.connection
+        spans = connection.info.get('trace_spans') if connection is not None else None
+        if spans:
+            end_span(spans.pop(), exception_context.original_exception)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _tag_relationship_loads(orm_execute_state):
+    trace = _current_trace.get()
+    if trace is None or not trace.sampled or not orm_execute_state.is_relationship_load:
+        return
+    path = orm_execute_state.loader_strategy_path
+    orm_execute_state.update_execution_options(trace_relationship=str(path[-1]) if path else 'relationship')
+
+
+@event.listens_for(Session, "before_commit")
+def _start_commit_span(session):
+    opened = start_span('session.commit')
+    if opened is not None:
+        session.info['trace_commit_span'] = opened
+
+
+@event.listens_for(Session, "after_commit")
+def _end_commit_span(session):
+    end_span(session.info.pop('trace_commit_span', None))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _end_failed_commit_span(session, previous_transaction):
+    opened = session.info.pop('trace_commit_span', None)
+    if opened is not None:
+        opened.error = 'rolled back'
+        end_span(opened)
@@ -0,0 +1,55 @@
+from typing import Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from leads import normalize_url, lead_url_filter
+
+
+class InvalidIfMatch(Exception):
+    pass
+
+
+def etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    """Version named by an If-Match header; ``None`` when absent or ``*``."""
+    if value is None or value.strip() == '*':
+        return None
+    value = value.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise InvalidIfMatch(value)
+
+
+def versioned_update(model, row_id: str, values: dict, expected_version: Optional[int]):
+    """UPDATE that bumps ``version`` and, when given, only applies at ``expected_version``.
+
+    Core updates bypass ``@validates``, so normalized URL columns are
+    filled in here. The caller adds RETURNING; no row back means the row
+    is gone or was changed concurrently.
+    """
+    values = dict(values)
+    for source, target in getattr(model, 'normalized_url_columns', {}).items():
+        if source in values:
+            values[target] = normalize_url(values[source])
+            lead_url_filter.add(values[target])
+    stmt = (
+        update(model)
+        .where(model.id == row_id)
+        .values(**values, version=model.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if expected_version is not None:
+        stmt = stmt.where(model.version == expected_version)
+    return stmt
+
+
+async def current_version(db: AsyncSession, model, row_id: str) -> Optional[int]:
+    result = await db.execute(select(model.version).where(model.id == row_id))
+    return result.scalar_one_or_none()
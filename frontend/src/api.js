@@ -12,11 +12,12 @@ const api = axios.create({
 
 // Tools API
 export const toolsApi = {
-  getAll: () => api.get('/tools'),
+  getAll: (params = {}) => api.get('/tools', { params }),
   get: (id) => api.get(`/tools/${id}`),
   create: (data) => api.post('/tools', data),
   update: (id, data) => api.put(`/tools/${id}`, data),
   delete: (id) => api.delete(`/tools/${id}`),
+  deleteMany: (ids) => api.delete('/tools', { data: { ids } }),
 };
 
 // Combined Tool + Founder API
@@ -24,9 +25,15 @@ export const toolFounderApi = {
   create: (data) => api.post('/tool-founder', data),
 };
 
+// Leads API
+export const leadsApi = {
+  lookup: (urls) => api.post('/leads/lookup', { urls }),
+};
+
 // Founders API
 export const foundersApi = {
-  getAll: (toolId) => api.get('/founders', { params: { tool_id: toolId } }),
+  getAll: (params = {}) => api.get('/founders', { params }),
+  uncontacted: (fbProfileId, params = {}) => api.get('/founders/uncontacted', { params: { fb_profile_id: fbProfileId, ...params } }),
   get: (id) => api.get(`/founders/${id}`),
   create: (data) => api.post('/founders', data),
   update: (id, data) => api.put(`/founders/${id}`, data),
@@ -49,14 +56,42 @@ export const templatesApi = {
   create: (data) => api.post('/templates', data),
   update: (id, data) => api.put(`/templates/${id}`, data),
   delete: (id) => api.delete(`/templates/${id}`),
+  preview: (id, filters) => api.post(`/templates/${id}/preview`, filters, { responseType: 'text' }),
 };
 
 // Outreach API
 export const outreachApi = {
   getAll: (filters = {}) => api.get('/outreach', { params: filters }),
   generate: (data) => api.post('/outreach/generate', data),
+  generateBulk: (data) => api.post('/outreach/generate/bulk', data),
+  funnel: (params = {}) => api.get('/outreach/funnel', { params }),
+  board: (params = {}) => api.get('/outreach/board', { params }),
+  boardMore: (status, cursor, params = {}) => api.get('/outreach/board', { params: { ...params, status, cursor } }),
+  exportUrl: (filters = {}) => `${API}/outreach/export?${new URLSearchParams(filters)}`,
+  archive: (params = {}) => api.post('/outreach/archive', null, { params }),
   update: (id, data) => api.put(`/outreach/${id}`, data),
   delete: (id) => api.delete(`/outreach/${id}`),
+  claimNext: (fbProfileId, operator) => api.post('/outreach/next', null, { params: { fb_profile_id: fbProfileId, operator } }),
+  release: (id, fbProfileId, operator) => api.post(`/outreach/${id}/release`, null, { params: { fb_profile_id: fbProfileId, operator } }),
+};
+
+// Jobs API
+export const jobsApi = {
+  getAll: (params = {}) => api.get('/jobs', { params }),
+  get: (id) => api.get(`/jobs/${id}`),
+  create: (kind, params = {}) => api.post('/jobs', { kind, params }),
+  cancel: (id) => api.post(`/jobs/${id}/cancel`),
+};
+
+// Sync API
+export const syncApi = {
+  // Follow next_cursor until a page carries the token for the next sync
+  changes: (since, cursor) => api.get('/sync', { params: cursor ? { cursor } : { since } }),
+};
+
+// Batch API
+export const batchApi = {
+  run: (operations, { atomic = false } = {}) => api.post('/batch', { operations, atomic }),
 };
 
 // Stats API
@@ -0,0 +1,161 @@
+import { useState, useEffect } from "react";
+import { Button } from "./ui/button";
+import { Input } from "./ui/input";
+import {
+  Select,
+  SelectContent,
+  SelectItem,
+  SelectTrigger,
+  SelectValue,
+} from "./ui/select";
+import { ArrowDown, ArrowUp, ChevronLeft, ChevronRight, Search } from "lucide-react";
+
+export const PAGE_SIZE = 50;
+
+const ALL = "all";
+
+// Sorting, name search, filters and paging all happen on the server
+export const useListQuery = (defaultSort) => {
+  const [search, setSearch] = useState("");
+  const [namePrefix, setNamePrefix] = useState("");
+  const [sort, setSort] = useState(defaultSort);
+  const [order, setOrder] = useState("desc");
+  const [filters, setFilters] = useState({});
+  const [page, setPage] = useState(0);
+
+  useEffect(() => {
+    const timer = setTimeout(() => {
+      setNamePrefix(search.trim());
+      setPage(0);
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [search]);
+
+  const params = {
+    sort,
+    order,
+    limit: PAGE_SIZE,
+    offset: page * PAGE_SIZE,
+    ...filters,
+    ...(namePrefix ? { name_prefix: namePrefix } : {}),
+  };
+
+  return {
+    search,
+    setSearch,
+    sort,
+    setSort: (value) => {
+      setSort(value);
+      setPage(0);
+    },
+    order,
+    toggleOrder: () => {
+      setOrder(order === "asc" ? "desc" : "asc");
+      setPage(0);
+    },
+    filters,
+    setFilter: (key, value) => {
+      const next = { ...filters };
+      if (value === undefined) delete next[key];
+      else next[key] = value;
+      setFilters(next);
+      setPage(0);
+    },
+    filtered: Boolean(namePrefix) || Object.keys(filters).length > 0,
+    page,
+    setPage,
+    params,
+  };
+};
+
+export const totalFromResponse = (response) => ({
+  value: Number(response.headers["x-total-count"] ?? response.data.length),
+  estimated: response.headers["x-total-count-type"] === "estimate",
+});
+
+export const ListControls = ({ list, searchPlaceholder, sortOptions, filter }) => (
+  <div className="flex flex-col sm:flex-row gap-3">
+    <div className="relative flex-1">
+      <Search className="w-4 h-4 text-slate-400 absolute left-3 top-1/2 -translate-y-1/2" />
+      <Input
+        value={list.search}
+        onChange={(e) => list.setSearch(e.target.value)}
+        placeholder={searchPlaceholder}
+        className="pl-9"
+        data-testid="list-search"
+      />
+    </div>
+    {filter && (
+      <Select
+        value={filter.options.find((option) => option.value === list.filters[filter.param])?.key ?? ALL}
+        onValueChange={(key) => list.setFilter(filter.param, filter.options.find((option) => option.key === key)?.value)}
+      >
+        <SelectTrigger className="sm:w-[180px]" data-testid="list-filter">
+          <SelectValue />
+        </SelectTrigger>
+        <SelectContent>
+          <SelectItem value={ALL}>{filter.allLabel}</SelectItem>
+          {filter.options.map((option) => (
+            <SelectItem key={option.key} value={option.key}>{option.label}</SelectItem>
+          ))}
+        </SelectContent>
+      </Select>
+    )}
+    <div className="flex gap-2">
+      <Select value={list.sort} onValueChange={list.setSort}>
+        <SelectTrigger className="sm:w-[180px]" data-testid="list-sort">
+          <SelectValue />
+        </SelectTrigger>
+        <SelectContent>
+          {sortOptions.map((option) => (
+            <SelectItem key={option.value} value={option.value}>{option.label}</SelectItem>
+          ))}
+        </SelectContent>
+      </Select>
+      <Button
+        variant="outline"
+        size="icon"
+        onClick={list.toggleOrder}
+        title={list.order === "asc" ? "Ascending" : "Descending"}
+        data-testid="list-order"
+      >
+        {list.order === "asc" ? <ArrowUp className="w-4 h-4" /> : <ArrowDown className="w-4 h-4" />}
+      </Button>
+    </div>
+  </div>
+);
+
+export const Pager = ({ list, total, count }) => {
+  if (total.value <= PAGE_SIZE && list.page === 0) return null;
+  const first = list.page * PAGE_SIZE + 1;
+  return (
+    <div className="flex items-center justify-between text-sm text-slate-500">
+      <span>
+        {count ? `${first}–${first + count - 1}` : "0"} of {total.estimated ? "about " : ""}
+        {total.value.toLocaleString()}
+      </span>
+      <div className="flex gap-2">
+        <Button
+          variant="outline"
+          size="sm"
+          disabled={list.page === 0}
+          onClick={() => list.setPage(list.page - 1)}
+          data-testid="list-prev"
+        >
+          <ChevronLeft className="w-4 h-4 mr-1" />
+          Previous
+        </Button>
+        <Button
+          variant="outline"
+          size="sm"
+          disabled={count < PAGE_SIZE}
+          onClick={() => list.setPage(list.page + 1)}
+          data-testid="list-next"
+        >
+          Next
+          <ChevronRight className="w-4 h-4 ml-1" />
+        </Button>
+      </div>
+    </div>
+  );
+};
@@ -26,6 +26,7 @@ export const MessageGeneratorModal = ({ open, onOpenChange, onSuccess }) => {
   const [selectedProfile, setSelectedProfile] = useState("");
   const [generatedMessage, setGeneratedMessage] = useState("");
   const [loading, setLoading] = useState(false);
+  const [loadingFounders, setLoadingFounders] = useState(false);
   const [generating, setGenerating] = useState(false);
 
   useEffect(() => {
@@ -37,14 +38,18 @@ export const MessageGeneratorModal = ({ open, onOpenChange, onSuccess }) => {
     }
   }, [open]);
 
+  useEffect(() => {
+    setSelectedFounder("");
+    setFounders([]);
+    if (selectedProfile) {
+      loadFounders(selectedProfile);
+    }
+  }, [selectedProfile]);
+
   const loadData = async () => {
     setLoading(true);
     try {
-      const [foundersRes, profilesRes] = await Promise.all([
-        foundersApi.getAll(),
-        profilesApi.getAll(),
-      ]);
-      setFounders(foundersRes.data);
+      const profilesRes = await profilesApi.getAll();
       setProfiles(profilesRes.data);
     } catch (error) {
       toast.error("Failed to load data");
@@ -53,6 +58,19 @@ export const MessageGeneratorModal = ({ open, onOpenChange, onSuccess }) => {
     }
   };
 
+  // Only founders with a tool that this profile has not messaged yet
+  const loadFounders = async (profileId) => {
+    setLoadingFounders(true);
+    try {
+      const foundersRes = await foundersApi.uncontacted(profileId, { limit: 1000 });
+      setFounders(foundersRes.data);
+    } catch (error) {
+      toast.error("Failed to load founders");
+    } finally {
+      setLoadingFounders(false);
+    }
+  };
+
   const handleGenerate = async () => {
     if (!selectedFounder || !selectedProfile) {
       toast.error("Please select both a founder and a profile");
@@ -94,7 +112,6 @@ export const MessageGeneratorModal = ({ open, onOpenChange, onSuccess }) => {
     toast.success("Message copied to clipboard!");
   };
 
-  const foundersWithTool = founders.filter(f => f.tool);
   const profilesWithTemplate = profiles.filter(p => p.template_id);
 
   return (
@@ -116,17 +133,21 @@ export const MessageGeneratorModal = ({ open, onOpenChange, onSuccess }) => {
             <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
               <div className="space-y-2">
                 <Label htmlFor="founder">Select Founder</Label>
-                <Select value={selectedFounder} onValueChange={setSelectedFounder}>
+                <Select
+                  value={selectedFounder}
+                  onValueChange={setSelectedFounder}
+                  disabled={!selectedProfile || loadingFounders}
+                >
                   <SelectTrigger id="founder" data-testid="select-founder">
-                    <SelectValue placeholder="Choose a founder" />
+                    <SelectValue placeholder={selectedProfile ? "Choose a founder" : "Select a profile first"} />
                   </SelectTrigger>
                   <SelectContent>
-                    {foundersWithTool.length === 0 ? (
+                    {founders.length === 0 ? (
                       <div className="px-2 py-4 text-sm text-slate-500 text-center">
-                        No founders with linked tools
+                        No uncontacted founders with linked tools
                       </div>
                     ) : (
-                      foundersWithTool.map((founder) => (
+                      founders.map((founder) => (
                         <SelectItem key={founder.id} value={founder.id}>
                           {founder.founder_name} ({founder.tool?.tool_name})
                         </SelectItem>
@@ -84,12 +84,12 @@ const NoteDialog = ({ open, onOpenChange, record, onSave }) => {
   const handleSave = async () => {
     setSaving(true);
     try {
-      await outreachApi.update(record.id, { note });
+      await outreachApi.update(record.id, { note, version: record.version });
       toast.success("Note saved");
       onSave();
       onOpenChange(false);
     } catch (error) {
-      toast.error("Failed to save note");
+      toast.error(error.response?.status === 409 ? "Someone else changed this record. Reload and try again." : "Failed to save note");
     } finally {
       setSaving(false);
     }
@@ -215,13 +215,14 @@ const Dashboard = () => {
   }, [loadData]);
 
   const handleStatusChange = async (recordId, newStatus) => {
+    const record = records.find((r) => r.id === recordId);
     try {
-      await outreachApi.update(recordId, { status: newStatus });
+      await outreachApi.update(recordId, { status: newStatus, version: record?.version });
       toast.success("Status updated");
-      loadData();
     } catch (error) {
-      toast.error("Failed to update status");
+      toast.error(error.response?.status === 409 ? "Someone else changed this record. Reload and try again." : "Failed to update status");
     }
+    loadData();
   };
 
   const handleDelete = async (recordId) => {
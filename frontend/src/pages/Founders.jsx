@@ -37,7 +37,9 @@ import {
 } from "../components/ui/table";
 import { toast } from "sonner";
 import { Plus, Pencil, Trash2, Users, ExternalLink, RefreshCw } from "lucide-react";
+import { format } from "date-fns";
 import { foundersApi, toolsApi } from "../api";
+import { ListControls, Pager, useListQuery, totalFromResponse } from "../components/ListControls";
 
 const FounderFormDialog = ({ open, onOpenChange, founder, tools, onSave }) => {
   const [formData, setFormData] = useState({
@@ -77,7 +79,7 @@ const FounderFormDialog = ({ open, onOpenChange, founder, tools, onSave }) => {
         tool_id: formData.tool_id || null,
       };
       if (founder) {
-        await foundersApi.update(founder.id, data);
+        await foundersApi.update(founder.id, { ...data, version: founder.version });
         toast.success("Founder updated");
       } else {
         await foundersApi.create(data);
@@ -86,7 +88,7 @@ const FounderFormDialog = ({ open, onOpenChange, founder, tools, onSave }) => {
       onSave();
       onOpenChange(false);
     } catch (error) {
-      toast.error(founder ? "Failed to update founder" : "Failed to create founder");
+      toast.error(error.response?.status === 409 ? "Someone else changed this record. Reload and try again." : (founder ? "Failed to update founder" : "Failed to create founder"));
     } finally {
       setSaving(false);
     }
@@ -157,22 +159,38 @@ const FounderFormDialog = ({ open, onOpenChange, founder, tools, onSave }) => {
   );
 };
 
+const SORT_OPTIONS = [
+  { value: "created_at", label: "Date added" },
+  { value: "founder_name", label: "Name" },
+  { value: "last_outreach_at", label: "Last contacted" },
+  { value: "outreach_count", label: "Messages" },
+];
+
+const TOOL_FILTER = {
+  param: "has_tool",
+  allLabel: "All founders",
+  options: [
+    { key: "with", value: true, label: "With a tool" },
+    { key: "without", value: false, label: "Without a tool" },
+  ],
+};
+
 const Founders = () => {
   const [founders, setFounders] = useState([]);
+  const [total, setTotal] = useState({ value: 0, estimated: false });
   const [tools, setTools] = useState([]);
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
   const [editingFounder, setEditingFounder] = useState(null);
   const [deletingFounder, setDeletingFounder] = useState(null);
+  const list = useListQuery("created_at");
+  const paramsKey = JSON.stringify(list.params);
 
   const loadData = async () => {
     try {
-      const [foundersRes, toolsRes] = await Promise.all([
-        foundersApi.getAll(),
-        toolsApi.getAll(),
-      ]);
+      const foundersRes = await foundersApi.getAll(list.params);
       setFounders(foundersRes.data);
-      setTools(toolsRes.data);
+      setTotal(totalFromResponse(foundersRes));
     } catch (error) {
       toast.error("Failed to load data");
     } finally {
@@ -182,6 +200,12 @@ const Founders = () => {
 
   useEffect(() => {
     loadData();
+  }, [paramsKey]);
+
+  useEffect(() => {
+    toolsApi.getAll({ sort: "tool_name", order: "asc" })
+      .then((response) => setTools(response.data))
+      .catch(() => toast.error("Failed to load tools"));
   }, []);
 
   const handleEdit = (founder) => {
@@ -233,10 +257,19 @@ const Founders = () => {
         </Button>
       </div>
 
+      <ListControls
+        list={list}
+        searchPlaceholder="Search founders by name"
+        sortOptions={SORT_OPTIONS}
+        filter={TOOL_FILTER}
+      />
+
       {/* Founders Table */}
       <Card className="bg-white border border-slate-200">
         <CardContent className="p-0">
-          {founders.length === 0 ? (
+          {founders.length === 0 && list.filtered ? (
+            <div className="py-12 text-center text-slate-500">No founders match these filters</div>
+          ) : founders.length === 0 ? (
             <div className="py-12 text-center">
               <Users className="w-12 h-12 text-slate-300 mx-auto mb-4" />
               <h3 className="text-lg font-medium text-slate-900">No founders yet</h3>
@@ -257,6 +290,8 @@ const Founders = () => {
                   <TableHead>Founder</TableHead>
                   <TableHead>Linked Tool</TableHead>
                   <TableHead>Social Profile</TableHead>
+                  <TableHead>Messages</TableHead>
+                  <TableHead>Last Contacted</TableHead>
                   <TableHead className="w-[100px]">Actions</TableHead>
                 </TableRow>
               </TableHeader>
@@ -292,6 +327,18 @@ const Founders = () => {
                         <span className="text-slate-400">-</span>
                       )}
                     </TableCell>
+                    <TableCell>
+                      <span className="text-slate-600">{founder.outreach_count}</span>
+                    </TableCell>
+                    <TableCell>
+                      {founder.last_outreach_at ? (
+                        <span className="text-slate-600 text-sm">
+                          {format(new Date(founder.last_outreach_at), "MMM d, yyyy")}
+                        </span>
+                      ) : (
+                        <span className="text-slate-400">Never</span>
+                      )}
+                    </TableCell>
                     <TableCell>
                       <div className="flex gap-1">
                         <Button 
@@ -321,6 +368,8 @@ const Founders = () => {
         </CardContent>
       </Card>
 
+      <Pager list={list} total={total} count={founders.length} />
+
       <FounderFormDialog
         open={showForm}
         onOpenChange={handleFormClose}
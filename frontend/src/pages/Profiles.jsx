@@ -75,7 +75,7 @@ const ProfileFormDialog = ({ open, onOpenChange, profile, templates, onSave }) =
         template_id: formData.template_id || null,
       };
       if (profile) {
-        await profilesApi.update(profile.id, data);
+        await profilesApi.update(profile.id, { ...data, version: profile.version });
         toast.success("Profile updated");
       } else {
         await profilesApi.create(data);
@@ -84,7 +84,7 @@ const ProfileFormDialog = ({ open, onOpenChange, profile, templates, onSave }) =
       onSave();
       onOpenChange(false);
     } catch (error) {
-      toast.error(profile ? "Failed to update profile" : "Failed to create profile");
+      toast.error(error.response?.status === 409 ? "Someone else changed this record. Reload and try again." : (profile ? "Failed to update profile" : "Failed to create profile"));
     } finally {
       setSaving(false);
     }
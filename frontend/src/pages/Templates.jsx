@@ -104,7 +104,7 @@ const TemplateFormDialog = ({ open, onOpenChange, template, onSave }) => {
     setSaving(true);
     try {
       if (template) {
-        await templatesApi.update(template.id, formData);
+        await templatesApi.update(template.id, { ...formData, version: template.version });
         toast.success("Template updated");
       } else {
         await templatesApi.create(formData);
@@ -113,7 +113,7 @@ const TemplateFormDialog = ({ open, onOpenChange, template, onSave }) => {
       onSave();
       onOpenChange(false);
     } catch (error) {
-      toast.error(template ? "Failed to update template" : "Failed to create template");
+      toast.error(error.response?.status === 409 ? "Someone else changed this record. Reload and try again." : (template ? "Failed to update template" : "Failed to create template"));
     } finally {
       setSaving(false);
     }
@@ -24,6 +24,7 @@ import {
 import { toast } from "sonner";
 import { Plus, Pencil, Trash2, Wrench, ExternalLink, RefreshCw } from "lucide-react";
 import { toolsApi } from "../api";
+import { ListControls, Pager, useListQuery, totalFromResponse } from "../components/ListControls";
 
 const ToolCard = ({ tool, onEdit, onDelete }) => (
   <Card className="bg-white border border-slate-200 hover:border-slate-300 transition-colors">
@@ -108,7 +109,7 @@ const ToolFormDialog = ({ open, onOpenChange, tool, onSave }) => {
     setSaving(true);
     try {
       if (tool) {
-        await toolsApi.update(tool.id, formData);
+        await toolsApi.update(tool.id, { ...formData, version: tool.version });
         toast.success("Tool updated");
       } else {
         await toolsApi.create(formData);
@@ -117,7 +118,7 @@ const ToolFormDialog = ({ open, onOpenChange, tool, onSave }) => {
       onSave();
       onOpenChange(false);
     } catch (error) {
-      toast.error(tool ? "Failed to update tool" : "Failed to create tool");
+      toast.error(error.response?.status === 409 ? "Someone else changed this record. Reload and try again." : (tool ? "Failed to update tool" : "Failed to create tool"));
     } finally {
       setSaving(false);
     }
@@ -180,17 +181,35 @@ const ToolFormDialog = ({ open, onOpenChange, tool, onSave }) => {
   );
 };
 
+const SORT_OPTIONS = [
+  { value: "created_at", label: "Date added" },
+  { value: "tool_name", label: "Name" },
+];
+
+const WEBSITE_FILTER = {
+  param: "has_website",
+  allLabel: "All tools",
+  options: [
+    { key: "with", value: true, label: "With a website" },
+    { key: "without", value: false, label: "Without a website" },
+  ],
+};
+
 const Tools = () => {
   const [tools, setTools] = useState([]);
+  const [total, setTotal] = useState({ value: 0, estimated: false });
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
   const [editingTool, setEditingTool] = useState(null);
   const [deletingTool, setDeletingTool] = useState(null);
+  const list = useListQuery("created_at");
+  const paramsKey = JSON.stringify(list.params);
 
   const loadTools = async () => {
     try {
-      const response = await toolsApi.getAll();
+      const response = await toolsApi.getAll(list.params);
       setTools(response.data);
+      setTotal(totalFromResponse(response));
     } catch (error) {
       toast.error("Failed to load tools");
     } finally {
@@ -200,7 +219,7 @@ const Tools = () => {
 
   useEffect(() => {
     loadTools();
-  }, []);
+  }, [paramsKey]);
 
   const handleEdit = (tool) => {
     setEditingTool(tool);
@@ -251,8 +270,19 @@ const Tools = () => {
         </Button>
       </div>
 
+      <ListControls
+        list={list}
+        searchPlaceholder="Search tools by name"
+        sortOptions={SORT_OPTIONS}
+        filter={WEBSITE_FILTER}
+      />
+
       {/* Tools Grid */}
-      {tools.length === 0 ? (
+      {tools.length === 0 && list.filtered ? (
+        <Card className="bg-white border border-slate-200">
+          <CardContent className="py-12 text-center text-slate-500">No tools match these filters</CardContent>
+        </Card>
+      ) : tools.length === 0 ? (
         <Card className="bg-white border border-slate-200">
           <CardContent className="py-12">
             <div className="text-center">
@@ -283,6 +313,8 @@ const Tools = () => {
         </div>
       )}
 
+      <Pager list={list} total={total} count={tools.length} />
+
       <ToolFormDialog
         open={showForm}
         onOpenChange={handleFormClose}
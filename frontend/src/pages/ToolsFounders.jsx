@@ -32,6 +32,7 @@ import {
 import { toast } from "sonner";
 import { Plus, Pencil, Trash2, Users, ExternalLink, RefreshCw, Wrench } from "lucide-react";
 import { foundersApi, toolsApi, toolFounderApi } from "../api";
+import { ListControls, Pager, useListQuery, totalFromResponse } from "../components/ListControls";
 
 const ToolFounderFormDialog = ({ open, onOpenChange, founder, onSave }) => {
   const [formData, setFormData] = useState({
@@ -88,12 +89,14 @@ const ToolFounderFormDialog = ({ open, onOpenChange, founder, onSave }) => {
             tool_description: formData.tool_description,
             website_url: formData.website_url,
             source_url: formData.source_url,
+            version: founder.tool.version,
           });
         }
         // Update founder
         await foundersApi.update(founder.id, {
           founder_name: formData.founder_name,
           social_profile_url: formData.social_profile_url,
+          version: founder.version,
         });
         toast.success("Updated successfully");
       } else {
@@ -104,7 +107,7 @@ const ToolFounderFormDialog = ({ open, onOpenChange, founder, onSave }) => {
       onSave();
       onOpenChange(false);
     } catch (error) {
-      toast.error(isEditing ? "Failed to update" : "Failed to create");
+      toast.error(error.response?.status === 409 ? "Someone else changed this record. Reload and try again." : (isEditing ? "Failed to update" : "Failed to create"));
     } finally {
       setSaving(false);
     }
@@ -223,17 +226,35 @@ const ToolFounderFormDialog = ({ open, onOpenChange, founder, onSave }) => {
   );
 };
 
+const SORT_OPTIONS = [
+  { value: "created_at", label: "Date added" },
+  { value: "founder_name", label: "Founder name" },
+];
+
+const TOOL_FILTER = {
+  param: "has_tool",
+  allLabel: "All entries",
+  options: [
+    { key: "with", value: true, label: "With a tool" },
+    { key: "without", value: false, label: "Without a tool" },
+  ],
+};
+
 const ToolsFounders = () => {
   const [founders, setFounders] = useState([]);
+  const [total, setTotal] = useState({ value: 0, estimated: false });
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
   const [editingFounder, setEditingFounder] = useState(null);
   const [deletingFounder, setDeletingFounder] = useState(null);
+  const list = useListQuery("created_at");
+  const paramsKey = JSON.stringify(list.params);
 
   const loadData = async () => {
     try {
-      const foundersRes = await foundersApi.getAll();
+      const foundersRes = await foundersApi.getAll(list.params);
       setFounders(foundersRes.data);
+      setTotal(totalFromResponse(foundersRes));
     } catch (error) {
       toast.error("Failed to load data");
     } finally {
@@ -243,7 +264,7 @@ const ToolsFounders = () => {
 
   useEffect(() => {
     loadData();
-  }, []);
+  }, [paramsKey]);
 
   const handleEdit = (founder) => {
     setEditingFounder(founder);
@@ -299,10 +320,19 @@ const ToolsFounders = () => {
         </Button>
       </div>
 
+      <ListControls
+        list={list}
+        searchPlaceholder="Search by founder name"
+        sortOptions={SORT_OPTIONS}
+        filter={TOOL_FILTER}
+      />
+
       {/* Table */}
       <Card className="bg-white border border-slate-200">
         <CardContent className="p-0">
-          {founders.length === 0 ? (
+          {founders.length === 0 && list.filtered ? (
+            <div className="py-12 text-center text-slate-500">No entries match these filters</div>
+          ) : founders.length === 0 ? (
             <div className="py-12 text-center">
               <Users className="w-12 h-12 text-slate-300 mx-auto mb-4" />
               <h3 className="text-lg font-medium text-slate-900">No entries yet</h3>
@@ -417,6 +447,8 @@ const ToolsFounders = () => {
         </CardContent>
       </Card>
 
+      <Pager list={list} total={total} count={founders.length} />
+
       <ToolFounderFormDialog
         open={showForm}
         onOpenChange={handleFormClose}
@@ -0,0 +1,110 @@
+import os
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+# The backend reads its configuration at import time
+DATABASE_PATH = Path(tempfile.mkdtemp(prefix='outreach-tests-')) / 'test.db'
+os.environ['DATABASE_URL'] = f"sqlite:///{DATABASE_PATH}"
+os.environ['JOB_WORKER_ENABLED'] = '0'
+
+import httpx  # noqa: E402
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+
+# Children before parents, tombstones last: the delete triggers write them
+TABLES = (
+    'outreach_events', 'outreach_records_archive', 'outreach_records', 'founders',
+    'facebook_profiles', 'templates', 'tools', 'jobs', 'idempotency_keys', 'deletions',
+)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def migrated_database():
+    config = Config()
+    config.set_main_option('script_location', str(BACKEND_DIR / 'alembic'))
+    command.upgrade(config, 'head')
+    yield DATABASE_PATH
+
+
+@pytest.fixture(autouse=True)
+def clean_database(migrated_database):
+    yield
+    connection = sqlite3.connect(migrated_database)
+    try:
+        for table in TABLES:
+            connection.execute(f"DELETE FROM {table}")
+        connection.commit()
+    finally:
+        connection.close()
+
+
+@pytest.fixture(scope='session')
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture(scope='session', autouse=True)
+async def engines(anyio_backend, migrated_database):
+    # Held for the whole session, so every test runs on the same event loop
+    # as the pooled connections
+    from database import engine, read_engine
+    yield
+    await engine.dispose()
+    await read_engine.dispose()
+
+
+@pytest.fixture
+async def client():
+    from server import app
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        yield client
+
+
+class Seed:
+    """Creates rows through the API, the way a client would."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+
+    async def post(self, path: str, body: dict) -> dict:
+        response = await self.client.post(path, json=body)
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    async def tool(self, name: str = 'Tool', **fields) -> dict:
+        return await self.post('/api/tools', {'tool_name': name, **fields})
+
+    async def founder(self, name: str = 'Founder', tool: dict = None, **fields) -> dict:
+        # tool=False creates a founder without one
+        if tool is None:
+            tool = await self.tool(f'{name} tool')
+        return await self.post('/api/founders', {'founder_name': name, 'tool_id': tool['id'] if tool else None, **fields})
+
+    async def template(self, content: str = 'Hi {founder_name}, about {tool_name}', **fields) -> dict:
+        return await self.post('/api/templates', {'template_name': 'Template', 'template_content': content, **fields})
+
+    async def profile(self, name: str = 'Profile', template: dict = None, **fields) -> dict:
+        if template is None:
+            template = await self.template()
+        return await self.post('/api/profiles', {'profile_name': name, 'template_id': template['id'], **fields})
+
+    async def outreach(self, founder: dict, profile: dict) -> dict:
+        return await self.post('/api/outreach/generate', {'founder_id': founder['id'], 'fb_profile_id': profile['id']})
+
+    async def set_status(self, outreach: dict, status: str) -> dict:
+        response = await self.client.put(f"/api/outreach/{outreach['id']}", json={'status': status})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+
+@pytest.fixture
+def seed(client):
+    return Seed(client)
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import text
+
+from archive import archive_closed_outreach
+from database import AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_only_closed_records_are_archived(seed, client):
+    profile = await seed.profile()
+    closed = await seed.outreach(await seed.founder('Closed'), profile)
+    await seed.set_status(closed, 'closed')
+    open_record = await seed.outreach(await seed.founder('Open'), profile)
+
+    archived, batches = await archive_closed_outreach(AsyncSessionLocal, older_than_days=0, batch_size=1)
+
+    assert (archived, batches) == (1, 1)
+    response = await client.get('/api/outreach')
+    assert [record['id'] for record in response.json()] == [open_record['id']]
+    response = await client.get('/api/outreach', params={'include_archived': True})
+    assert {record['id'] for record in response.json()} == {closed['id'], open_record['id']}
+
+
+async def test_recently_closed_records_stay_hot(seed):
+    outreach = await seed.outreach(await seed.founder(), await seed.profile())
+    await seed.set_status(outreach, 'closed')
+
+    assert await archive_closed_outreach(AsyncSessionLocal, older_than_days=1) == (0, 0)
+
+
+async def test_stats_count_archived_records(seed, client):
+    outreach = await seed.outreach(await seed.founder(), await seed.profile())
+    await seed.set_status(outreach, 'message_sent')
+    await seed.set_status(outreach, 'closed')
+    await archive_closed_outreach(AsyncSessionLocal, older_than_days=0)
+
+    response = await client.get('/api/stats')
+    assert response.json()['total_messages_sent'] == 1
+
+
+async def test_merged_list_orders_null_updated_at_last_and_pages_stably(seed, client):
+    profile = await seed.profile()
+    records = [await seed.outreach(await seed.founder(f'Founder {i}'), profile) for i in range(4)]
+    await seed.set_status(records[0], 'closed')
+    await archive_closed_outreach(AsyncSessionLocal, older_than_days=0)
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            text("UPDATE outreach_records SET updated_at = NULL WHERE id IN (:a, :b)"),
+            {'a': records[1]['id'], 'b': records[2]['id']}
+        )
+        await session.commit()
+
+    pages = [
+        (await client.get('/api/outreach', params={'include_archived': True, 'limit': 2, 'offset': offset})).json()
+        for offset in (0, 2)
+    ]
+
+    ids = [record['id'] for page in pages for record in page]
+    # Closing records[0] made it the most recently updated
+    assert ids == [records[0]['id'], records[3]['id'], *sorted([records[1]['id'], records[2]['id']], reverse=True)]
@@ -0,0 +1,60 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def batch(client, operations: list, atomic: bool = False) -> dict:
+    response = await client.post('/api/batch', json={'operations': operations, 'atomic': atomic})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+async def test_later_operations_reference_earlier_responses(client):
+    result = await batch(client, [
+        {'id': 'tool', 'method': 'POST', 'path': '/api/tools', 'body': {'tool_name': 'Engine'}},
+        {'id': 'founder', 'method': 'POST', 'path': '/api/founders',
+         'body': {'founder_name': 'Ada', 'tool_id': {'$ref': 'tool.id'}}},
+        {'method': 'GET', 'path': '/api/tools/{tool.id}'},
+    ])
+
+    assert result['committed']
+    tool, founder, fetched = result['results']
+    assert founder['body']['tool_id'] == tool['body']['id']
+    assert fetched['body']['tool_name'] == 'Engine'
+    assert fetched['headers']['etag'] == '"1"'
+
+
+async def test_non_atomic_batches_keep_what_succeeded(client):
+    result = await batch(client, [
+        {'method': 'POST', 'path': '/api/tools', 'body': {'tool_name': 'Kept'}},
+        {'id': 'missing', 'method': 'GET', 'path': '/api/tools/missing'},
+        {'method': 'PUT', 'path': '/api/tools/{missing.id}', 'body': {'tool_name': 'x'}},
+    ])
+
+    assert [operation['status'] for operation in result['results']] == [200, 404, 400]
+    tools = (await client.get('/api/tools')).json()
+    assert [tool['tool_name'] for tool in tools] == ['Kept']
+
+
+async def test_atomic_batches_roll_back_on_the_first_failure(client):
+    result = await batch(client, [
+        {'method': 'POST', 'path': '/api/tools', 'body': {'tool_name': 'Discarded'}},
+        {'method': 'POST', 'path': '/api/founders', 'body': {}},
+        {'method': 'POST', 'path': '/api/tools', 'body': {'tool_name': 'Never run'}},
+    ], atomic=True)
+
+    assert not result['committed']
+    assert [operation['status'] for operation in result['results']] == [200, 422]
+    assert (await client.get('/api/tools')).json() == []
+
+
+@pytest.mark.parametrize('operation, atomic', [
+    ({'method': 'POST', 'path': '/api/batch', 'body': {}}, False),
+    ({'method': 'GET', 'path': '/api/outreach/export'}, False),
+    ({'method': 'POST', 'path': '/api/jobs', 'body': {}}, True),
+    ({'method': 'GET', 'path': '/api/tools?limit=1'}, False),
+])
+async def test_unsupported_operations_reject_the_whole_batch(client, operation, atomic):
+    response = await client.post('/api/batch', json={'operations': [operation], 'atomic': atomic})
+
+    assert response.status_code == 400
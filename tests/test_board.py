@@ -0,0 +1,79 @@
+import pytest
+from sqlalchemy import text
+
+from database import AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def board(client, **params) -> dict:
+    response = await client.get('/api/outreach/board', params=params)
+    assert response.status_code == 200, response.text
+    return {column['status']: column for column in response.json()['columns']}
+
+
+async def column_pages(client, status: str, per_status: int) -> list:
+    pages = [(await board(client, status=status, per_status=per_status))[status]]
+    while pages[-1]['next_cursor']:
+        pages.append((await board(client, status=status, per_status=per_status, cursor=pages[-1]['next_cursor']))[status])
+    return pages
+
+
+@pytest.fixture
+async def records(seed) -> list:
+    profile = await seed.profile()
+    created = [await seed.outreach(await seed.founder(f'Founder {i}'), profile) for i in range(5)]
+    for record in created[:2]:
+        await seed.set_status(record, 'replied')
+    return created
+
+
+async def test_each_column_has_its_newest_records_and_total(client, records):
+    columns = await board(client, per_status=2)
+
+    generated, replied = columns['message_generated'], columns['replied']
+    assert (generated['count'], replied['count'], columns['closed']['count']) == (3, 2, 0)
+    assert [record['id'] for record in generated['records']] == [records[4]['id'], records[3]['id']]
+    assert generated['next_cursor'] is not None
+    assert [record['id'] for record in replied['records']] == [records[1]['id'], records[0]['id']]
+    assert replied['next_cursor'] is None
+
+
+async def test_cursor_pages_keep_the_count_and_reach_every_record(client, records):
+    pages = await column_pages(client, 'message_generated', per_status=1)
+
+    assert [page['count'] for page in pages] == [3, 3, 3]
+    assert [record['id'] for page in pages for record in page['records']] == [
+        records[4]['id'], records[3]['id'], records[2]['id']
+    ]
+
+
+async def test_rows_without_updated_at_come_last_and_are_paged_too(client, records):
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            text("UPDATE outreach_records SET updated_at = NULL WHERE id IN (:a, :b)"),
+            {'a': records[2]['id'], 'b': records[4]['id']}
+        )
+        await session.commit()
+
+    pages = await column_pages(client, 'message_generated', per_status=1)
+
+    assert [record['id'] for page in pages for record in page['records']] == [
+        records[3]['id'], *sorted([records[2]['id'], records[4]['id']], reverse=True)
+    ]
+
+
+async def test_filters_apply_to_records_and_counts(seed, client, records):
+    other = await seed.outreach(await seed.founder('Elsewhere'), await seed.profile('Other'))
+
+    columns = await board(client, fb_profile_id=other['fb_profile_id'])
+
+    assert columns['message_generated']['count'] == 1
+    assert [record['id'] for record in columns['message_generated']['records']] == [other['id']]
+    assert columns['replied'] == {'status': 'replied', 'count': 0, 'records': [], 'next_cursor': None}
+
+
+async def test_cursor_needs_its_status(client):
+    assert (await client.get('/api/outreach/board', params={'cursor': 'abc'})).status_code == 400
+    response = await client.get('/api/outreach/board', params={'cursor': 'abc', 'status': 'replied'})
+    assert response.status_code == 400
@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from coalesce import COALESCED_PATHS, CoalescingMiddleware, CoalescingStats, cascaded_tables, table_generations
+from models import Template, Tool
+
+pytestmark = pytest.mark.anyio
+
+
+def test_cascaded_tables_follow_on_delete_actions():
+    assert cascaded_tables(Tool.__table__) == {'tools', 'founders', 'outreach_records', 'outreach_records_archive'}
+    assert cascaded_tables(Template.__table__) >= {'templates', 'outreach_records', 'outreach_records_archive'}
+
+
+@pytest.mark.parametrize('path', ['/api/stats', '/api/founders', '/api/outreach'])
+async def test_deleting_a_tool_starts_a_new_generation_for_what_cascaded(seed, client, path):
+    outreach = await seed.outreach(await seed.founder(), await seed.profile())
+    before = table_generations.snapshot(COALESCED_PATHS[path])
+
+    await client.delete(f"/api/tools/{outreach['tool_id']}")
+
+    assert table_generations.snapshot(COALESCED_PATHS[path]) != before
+
+
+async def test_rolled_back_writes_keep_the_generation(client):
+    before = table_generations.snapshot(COALESCED_PATHS['/api/tools'])
+
+    assert (await client.put('/api/tools/missing', json={'tool_name': 'x'})).status_code == 404
+
+    assert table_generations.snapshot(COALESCED_PATHS['/api/tools']) == before
+
+
+async def test_concurrent_identical_reads_share_one_execution():
+    calls = 0
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'shared'})
+
+    stats = CoalescingStats()
+    middleware = CoalescingMiddleware(app, paths={'/api/tools': ('tools',)}, stats=stats)
+
+    async def request(query: bytes) -> list:
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': 'GET', 'path': '/api/tools', 'query_string': query, 'headers': []}
+        await middleware(scope, None, send)
+        return sent
+
+    tasks = [asyncio.create_task(request(query)) for query in (b'a=1&b=2', b'b=2&a=1', b'a=2')]
+    await asyncio.sleep(0)
+    release.set()
+    responses = await asyncio.gather(*tasks)
+
+    assert calls == 2
+    assert all(response[-1]['body'] == b'shared' for response in responses)
+    assert stats.snapshot()['paths']['/api/tools']['coalesced'] == 1
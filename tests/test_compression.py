@@ -0,0 +1,69 @@
+import gzip
+import json
+
+import pytest
+
+from compression import ENCODINGS, CompressedBodyCache, negotiate
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_large_json_is_gzipped_and_cached(seed, client):
+    for i in range(20):
+        await seed.tool(f'Tool {i}', tool_description='x' * 100)
+
+    first = await client.get('/api/tools', headers={'Accept-Encoding': 'gzip'})
+    second = await client.get('/api/tools', headers={'Accept-Encoding': 'gzip'})
+
+    assert first.headers['content-encoding'] == 'gzip'
+    assert 'Accept-Encoding' in first.headers['vary']
+    assert len(first.json()) == 20
+    assert second.content == first.content
+    stats = (await client.get('/api/_internal/coalescing')).json()['compressed_body_cache']
+    assert stats['hits'] >= 1
+
+
+async def test_small_bodies_and_unwilling_clients_get_identity(seed, client):
+    await seed.tool()
+
+    small = await client.get('/api/tools', headers={'Accept-Encoding': 'gzip'})
+    refused = await client.get('/api/tools', headers={'Accept-Encoding': 'gzip;q=0'})
+
+    assert 'content-encoding' not in small.headers
+    assert 'content-encoding' not in refused.headers
+
+
+async def test_streamed_ndjson_is_compressed_chunk_by_chunk(seed, client):
+    template = await seed.template('Hello {founder_name}, ' + 'x' * 200)
+    for i in range(10):
+        await seed.founder(f'Founder {i}', tool=False)
+
+    request = client.build_request(
+        'POST', f"/api/templates/{template['id']}/preview", json={}, headers={'Accept-Encoding': 'gzip'}
+    )
+    response = await client.send(request, stream=True)
+    raw = b''.join([chunk async for chunk in response.aiter_raw()])
+    await response.aclose()
+
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'content-length' not in response.headers
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert json.loads(lines[-1])['summary']['rendered'] == 10
+
+
+def test_negotiate_prefers_the_server_order():
+    assert negotiate('') is None
+    assert negotiate('identity') is None
+    assert negotiate('gzip, deflate') == 'gzip'
+    assert negotiate('*') == next(iter(ENCODINGS))
+
+
+def test_cache_evicts_least_recently_used():
+    cache = CompressedBodyCache(max_bytes=10)
+    cache.put(('gzip', b'a'), b'12345')
+    cache.put(('gzip', b'b'), b'12345')
+    cache.get(('gzip', b'a'))
+    cache.put(('gzip', b'c'), b'12345')
+
+    assert set(cache.entries) == {('gzip', b'a'), ('gzip', b'c')}
+    assert cache.size == 10
@@ -0,0 +1,47 @@
+import pytest
+
+from counts import EXACT, ESTIMATE, TotalCount, page_total
+
+pytestmark = pytest.mark.anyio
+
+
+def total(response) -> tuple:
+    return int(response.headers['x-total-count']), response.headers['x-total-count-type']
+
+
+async def test_list_endpoints_report_the_total_beyond_the_page(seed, client):
+    for i in range(5):
+        await seed.founder(f'Founder {i}', tool=False)
+
+    first = await client.get('/api/founders', params={'limit': 2})
+    last = await client.get('/api/founders', params={'limit': 2, 'offset': 4})
+    filtered = await client.get('/api/founders', params={'limit': 2, 'name_prefix': 'founder 1'})
+
+    assert len(first.json()) == 2
+    assert total(first) == (5, EXACT)
+    assert total(last) == (5, EXACT)
+    assert total(filtered) == (1, EXACT)
+
+
+async def test_outreach_totals_include_archived_records_when_asked(seed, client):
+    profile = await seed.profile()
+    for i in range(3):
+        await seed.outreach(await seed.founder(f'Founder {i}'), profile)
+
+    response = await client.get('/api/outreach', params={'limit': 1, 'fb_profile_id': profile['id'], 'include_archived': True})
+
+    assert total(response) == (3, EXACT)
+
+
+def test_page_total_only_when_the_page_reveals_it():
+    assert page_total([1, 2], None, 0) == TotalCount(2, EXACT)
+    assert page_total([1], 2, 4) == TotalCount(5, EXACT)
+    assert page_total([], 2, 0) == TotalCount(0, EXACT)
+    assert page_total([1, 2], 2, 0) is None
+    # Past the end: the total is unknown, not the offset
+    assert page_total([], 2, 10) is None
+
+
+def test_estimates_are_contagious():
+    assert TotalCount(1, EXACT) + TotalCount(2, EXACT) == TotalCount(3, EXACT)
+    assert TotalCount(1, EXACT) + TotalCount(2, ESTIMATE) == TotalCount(3, ESTIMATE)
@@ -0,0 +1,39 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from database import SQLITE_PRAGMAS, engine, read_engine
+
+pytestmark = pytest.mark.anyio
+
+
+async def pragma(engine, name: str):
+    async with engine.connect() as connection:
+        return (await connection.exec_driver_sql(f"PRAGMA {name}")).scalar()
+
+
+async def test_connections_use_wal_and_enforce_foreign_keys():
+    for connected in (engine, read_engine):
+        assert await pragma(connected, 'journal_mode') == 'wal'
+        assert await pragma(connected, 'foreign_keys') == 1
+        assert await pragma(connected, 'busy_timeout') == int(SQLITE_PRAGMAS['busy_timeout'])
+
+
+async def test_reader_cannot_write():
+    assert await pragma(engine, 'query_only') == 0
+    assert await pragma(read_engine, 'query_only') == 1
+
+    async with read_engine.connect() as connection:
+        with pytest.raises(OperationalError, match='readonly'):
+            await connection.execute(text("DELETE FROM tools"))
+
+
+async def test_reads_run_while_a_write_is_open(seed, client):
+    tool = await seed.tool('Visible')
+
+    async with engine.begin() as writer:
+        await writer.execute(text("UPDATE tools SET tool_name = 'Pending'"))
+        response = await client.get(f"/api/tools/{tool['id']}")
+
+    assert response.status_code == 200
+    assert response.json()['tool_name'] == 'Visible'
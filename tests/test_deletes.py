@@ -0,0 +1,46 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_deleting_a_tool_cascades_to_founders_and_outreach(seed, client):
+    profile = await seed.profile()
+    founder = await seed.founder()
+    await seed.outreach(founder, profile)
+
+    response = await client.delete(f"/api/tools/{founder['tool_id']}")
+
+    assert response.status_code == 200
+    assert (await client.get(f"/api/founders/{founder['id']}")).status_code == 404
+    assert (await client.get('/api/outreach', params={'limit': 50, 'offset': 0})).json() == []
+    assert (await client.get(f"/api/profiles/{profile['id']}")).json()['outreach_count'] == 0
+
+
+async def test_deleting_a_missing_row_is_404(client):
+    for path in ('tools', 'founders', 'profiles', 'templates', 'outreach'):
+        assert (await client.delete(f'/api/{path}/missing')).status_code == 404
+
+
+async def test_deleting_a_template_keeps_its_outreach(seed, client):
+    template = await seed.template()
+    outreach = await seed.outreach(await seed.founder(), await seed.profile(template=template))
+
+    assert (await client.delete(f"/api/templates/{template['id']}")).status_code == 200
+
+    kept = (await client.get('/api/outreach', params={'limit': 50, 'offset': 0})).json()
+    assert [(record['id'], record['template_id']) for record in kept] == [(outreach['id'], None)]
+
+
+async def test_bulk_delete_reports_what_the_cascade_removed(seed, client):
+    profile = await seed.profile()
+    founders = [await seed.founder(f'Founder {i}') for i in range(3)]
+    for founder in founders[:2]:
+        await seed.outreach(founder, profile)
+    doomed = [founder['tool_id'] for founder in founders[:2]]
+
+    response = await client.request('DELETE', '/api/tools', json={'ids': doomed + doomed[:1] + ['missing']})
+
+    assert response.status_code == 200
+    assert response.json() == {'deleted': 2, 'founders_deleted': 2, 'outreach_deleted': 2}
+    remaining = (await client.get('/api/tools', params={'limit': 50, 'offset': 0})).json()
+    assert [tool['id'] for tool in remaining] == [founders[2]['tool_id']]
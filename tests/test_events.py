@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from database import ReadSessionLocal
+from events import partition_ddl, partition_name, upcoming_months
+from models import OutreachEvent, OutreachStatus
+
+pytestmark = pytest.mark.anyio
+
+
+async def events_for(outreach_id: str) -> list:
+    async with ReadSessionLocal() as session:
+        result = await session.execute(
+            select(OutreachEvent.from_status, OutreachEvent.to_status)
+            .where(OutreachEvent.outreach_id == outreach_id).order_by(OutreachEvent.created_at)
+        )
+        return result.all()
+
+
+async def test_generation_and_status_changes_are_logged(seed):
+    outreach = await seed.outreach(await seed.founder(), await seed.profile())
+    await seed.set_status(outreach, 'message_sent')
+    await seed.set_status(outreach, 'replied')
+
+    assert await events_for(outreach['id']) == [
+        (None, OutreachStatus.MESSAGE_GENERATED),
+        (OutreachStatus.MESSAGE_GENERATED, OutreachStatus.MESSAGE_SENT),
+        (OutreachStatus.MESSAGE_SENT, OutreachStatus.REPLIED),
+    ]
+
+
+async def test_edits_without_a_status_change_are_not_logged(seed, client):
+    outreach = await seed.outreach(await seed.founder(), await seed.profile())
+    response = await client.put(f"/api/outreach/{outreach['id']}", json={'note': 'called'})
+    assert response.status_code == 200
+
+    assert len(await events_for(outreach['id'])) == 1
+
+
+def test_partitions_cover_the_coming_months_across_a_year_end():
+    months = upcoming_months(datetime(2026, 11, 20, tzinfo=timezone.utc), 2)
+
+    assert [partition_name(month) for month in months] == [
+        'outreach_events_y2026m11', 'outreach_events_y2026m12', 'outreach_events_y2027m01'
+    ]
+    assert "FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')" in partition_ddl(months[1])
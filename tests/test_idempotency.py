@@ -0,0 +1,79 @@
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from idempotency import idempotency_middleware
+
+pytestmark = pytest.mark.anyio
+
+
+def keyed(key: str) -> dict:
+    return {'Idempotency-Key': key}
+
+
+async def test_retry_replays_the_first_response(client):
+    first = await client.post('/api/tools', json={'tool_name': 'Acme'}, headers=keyed('k1'))
+    retry = await client.post('/api/tools', json={'tool_name': 'Acme'}, headers=keyed('k1'))
+
+    assert retry.status_code == first.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert len((await client.get('/api/tools')).json()) == 1
+
+
+async def test_replay_keeps_the_response_headers(seed, client):
+    profile = await seed.profile(sends_per_hour=0)
+    params = {'fb_profile_id': profile['id']}
+
+    first = await client.post('/api/outreach/next', params=params, headers=keyed('k2'))
+    retry = await client.post('/api/outreach/next', params=params, headers=keyed('k2'))
+
+    assert first.status_code == retry.status_code == 429
+    assert retry.headers['Retry-After'] == first.headers['Retry-After']
+
+
+async def test_replay_keeps_repeated_headers():
+    app = FastAPI()
+    app.middleware('http')(idempotency_middleware)
+
+    @app.post('/api/login')
+    async def login(response: Response):
+        response.set_cookie('session', 'a')
+        response.set_cookie('csrf', 'b')
+        return {}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        first = await client.post('/api/login', headers=keyed('k6'))
+        retry = await client.post('/api/login', headers=keyed('k6'))
+
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert first.headers.get_list('set-cookie') == retry.headers.get_list('set-cookie')
+    assert len(retry.headers.get_list('set-cookie')) == 2
+
+
+async def test_key_reused_with_another_body_is_rejected(client):
+    await client.post('/api/tools', json={'tool_name': 'Acme'}, headers=keyed('k3'))
+    response = await client.post('/api/tools', json={'tool_name': 'Other'}, headers=keyed('k3'))
+
+    assert response.status_code == 422
+
+
+async def test_key_reused_with_another_query_string_is_rejected(seed, client):
+    first, second = await seed.profile('A'), await seed.profile('B')
+    await seed.outreach(await seed.founder(), first)
+
+    claimed = await client.post('/api/outreach/next', params={'fb_profile_id': first['id']}, headers=keyed('k4'))
+    response = await client.post('/api/outreach/next', params={'fb_profile_id': second['id']}, headers=keyed('k4'))
+
+    assert claimed.status_code == 200
+    assert response.status_code == 422
+
+
+async def test_query_parameter_order_does_not_matter(seed, client):
+    profile = await seed.profile(sends_per_hour=0)
+
+    await client.post(f"/api/outreach/next?fb_profile_id={profile['id']}&operator=ann", headers=keyed('k5'))
+    retry = await client.post(f"/api/outreach/next?operator=ann&fb_profile_id={profile['id']}", headers=keyed('k5'))
+
+    assert retry.headers['Idempotent-Replayed'] == 'true'
@@ -0,0 +1,100 @@
+import anyio
+import pytest
+from sqlalchemy import update
+
+from database import AsyncSessionLocal
+from jobs import JobWorker, job_handler
+from models import Job
+
+pytestmark = pytest.mark.anyio
+
+
+@job_handler('test_count')
+async def count_job(ctx, params):
+    for done in range(1, params['steps'] + 1):
+        await ctx.progress(done, params['steps'])
+    return {'counted': params['steps']}
+
+
+@job_handler('test_fail')
+async def failing_job(ctx, params):
+    raise ValueError('boom')
+
+
+@job_handler('test_taken_over')
+async def taken_over_job(ctx, params):
+    # As if the heartbeat lapsed and another worker claimed the job meanwhile
+    async with ctx.session_factory() as session:
+        await session.execute(
+            update(Job).where(Job.id == ctx.job_id).values(worker_id='other-worker', attempts=Job.attempts + 1)
+        )
+        await session.commit()
+    return {'done': True}
+
+
+@pytest.fixture
+async def worker():
+    worker = JobWorker(AsyncSessionLocal, concurrency=1)
+    await worker.start()
+    yield worker
+    await worker.stop()
+
+
+async def wait_for_job(client, job_id: str) -> dict:
+    with anyio.fail_after(5):
+        while True:
+            job = (await client.get(f'/api/jobs/{job_id}')).json()
+            if job['status'] not in ('queued', 'running'):
+                return job
+            await anyio.sleep(0.05)
+
+
+async def test_worker_runs_a_job_and_records_progress(client, worker):
+    response = await client.post('/api/jobs', json={'kind': 'test_count', 'params': {'steps': 3}})
+    assert response.status_code == 202
+    worker.wake()
+
+    job = await wait_for_job(client, response.json()['id'])
+
+    assert job['status'] == 'succeeded'
+    assert (job['progress'], job['total']) == (3, 3)
+    assert job['result'] == {'counted': 3}
+
+
+async def test_failed_job_keeps_the_error(client, worker):
+    response = await client.post('/api/jobs', json={'kind': 'test_fail'})
+    worker.wake()
+
+    job = await wait_for_job(client, response.json()['id'])
+
+    assert job['status'] == 'failed'
+    assert job['error'] == 'boom'
+
+
+async def test_queued_job_can_be_cancelled(client):
+    job = (await client.post('/api/jobs', json={'kind': 'test_count', 'params': {'steps': 1}})).json()
+
+    response = await client.post(f"/api/jobs/{job['id']}/cancel")
+
+    assert response.json()['status'] == 'cancelled'
+
+
+async def test_unknown_job_kind_is_rejected(client):
+    response = await client.post('/api/jobs', json={'kind': 'no_such_job'})
+
+    assert response.status_code == 400
+
+
+async def test_run_that_lost_its_claim_does_not_overwrite_the_job(client, worker):
+    response = await client.post('/api/jobs', json={'kind': 'test_taken_over'})
+    worker.wake()
+
+    with anyio.fail_after(5):
+        while True:
+            job = (await client.get(f"/api/jobs/{response.json()['id']}")).json()
+            if job['attempts'] == 2 and not worker._running:
+                break
+            await anyio.sleep(0.05)
+
+    assert job['status'] == 'running'
+    assert (job['result'], job['finished_at']) == (None, None)
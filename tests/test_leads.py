@@ -0,0 +1,48 @@
+import pytest
+
+from leads import BloomFilter, normalize_url
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize('url, normalized', [
+    ('https://www.Example.com/', 'example.com'),
+    ('example.com/pricing/?utm_source=x&ref=hn', 'example.com/pricing'),
+    ('http://example.com:8080/a#top', 'example.com:8080/a'),
+    ('https://www.facebook.com/Jane.Doe/', 'facebook.com/jane.doe'),
+    ('https://facebook.com/profile.php?id=42&fbclid=abc', 'facebook.com/profile.php?id=42'),
+    ('https://m.facebook.com/Jane.Doe', 'm.facebook.com/jane.doe'),
+    ('https://x.com/JaneDoe', 'x.com/janedoe'),
+    # Hosts that only end in the same letters keep their case-sensitive paths
+    ('https://dropbox.com/s/AbC', 'dropbox.com/s/AbC'),
+    ('https://www.netflix.com/title/AbC', 'netflix.com/title/AbC'),
+    ('https://notfacebook.com/Jane', 'notfacebook.com/Jane'),
+    ('   ', None),
+])
+def test_normalize_url(url, normalized):
+    assert normalize_url(url) == normalized
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=100)
+    values = [f'example{i}.com' for i in range(100)]
+    for value in values:
+        bloom.add(value)
+
+    assert all(value in bloom for value in values)
+
+
+async def test_lookup_matches_tools_and_founders_by_normalized_url(seed, client):
+    tool = await seed.tool('Acme', website_url='https://www.acme.io/')
+    founder = await seed.founder('Jane', tool=tool, social_profile_url='https://facebook.com/Jane.Doe')
+
+    response = await client.post('/api/leads/lookup', json={'urls': [
+        'acme.io', 'https://m.facebook.com/jane.doe', 'https://www.facebook.com/jane.doe?utm_medium=x', 'unknown.dev'
+    ]})
+
+    assert response.status_code == 200
+    results = {result['url']: result for result in response.json()['results']}
+    assert results['acme.io']['tool_ids'] == [tool['id']]
+    assert not results['https://m.facebook.com/jane.doe']['exists']
+    assert results['https://www.facebook.com/jane.doe?utm_medium=x']['founder_ids'] == [founder['id']]
+    assert not results['unknown.dev']['exists']
@@ -0,0 +1,42 @@
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from database import read_engine
+from lifecycle import DEFAULT_WARMUP_PATHS, prewarm_pool, warm_up
+from server import app
+
+pytestmark = pytest.mark.anyio
+
+PAGED_LISTS = {'/api/tools', '/api/founders', '/api/outreach'}
+
+
+@pytest.fixture
+def cold_app():
+    app.state.ready = False
+    yield app
+    app.state.ready = False
+
+
+def test_warm_up_only_requests_pages_of_the_big_lists():
+    for path in DEFAULT_WARMUP_PATHS:
+        parts = urlsplit(path)
+        if parts.path in PAGED_LISTS:
+            assert int(parse_qs(parts.query)['limit'][0]) <= 50, path
+
+
+async def test_readiness_waits_for_warm_up(client, cold_app, caplog):
+    assert (await client.get('/api/health/live')).status_code == 200
+    assert (await client.get('/api/health/ready')).status_code == 503
+
+    caplog.set_level('INFO', logger='lifecycle')
+    await warm_up(cold_app, read_engine)
+
+    assert (await client.get('/api/health/ready')).json() == {'status': 'ready'}
+    replayed = [record.getMessage() for record in caplog.records if record.getMessage().startswith('Warm-up /api')]
+    assert len(replayed) == len(DEFAULT_WARMUP_PATHS)
+    assert all(' -> 200 ' in message for message in replayed), replayed
+
+
+async def test_prewarm_opens_the_whole_pool():
+    assert await prewarm_pool(read_engine) == read_engine.pool.size()
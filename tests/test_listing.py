@@ -0,0 +1,89 @@
+import pytest
+from sqlalchemy import column
+
+from listing import MAX_CODE_POINT, prefix_filter
+
+pytestmark = pytest.mark.anyio
+
+
+async def names(client, path: str, **params) -> list:
+    response = await client.get(path, params=params)
+    assert response.status_code == 200, response.text
+    key = 'tool_name' if path == '/api/tools' else 'founder_name'
+    return [row[key] for row in response.json()]
+
+
+async def test_name_sort_is_case_insensitive_both_ways(seed, client):
+    for name in ('beta', 'Alpha', 'gamma', 'Beta'):
+        await seed.tool(name)
+
+    ascending = await names(client, '/api/tools', sort='tool_name', order='asc')
+    descending = await names(client, '/api/tools', sort='tool_name', order='desc')
+
+    assert [name.lower() for name in ascending] == ['alpha', 'beta', 'beta', 'gamma']
+    assert descending == ascending[::-1]
+
+
+async def test_name_prefix_is_a_case_insensitive_range(seed, client):
+    for name in ('Ada', 'adam', 'Adz', 'Ae', 'Bob'):
+        await seed.founder(name, tool=False)
+
+    assert sorted(await names(client, '/api/founders', name_prefix='AD')) == ['Ada', 'Adz', 'adam']
+    assert await names(client, '/api/founders', name_prefix='ada', sort='founder_name', order='asc') == ['Ada', 'adam']
+
+
+async def test_name_prefix_folds_case_like_the_database(seed, client):
+    for name in ('Édouard', 'édith', 'Eve'):
+        await seed.founder(name, tool=False)
+
+    # SQLite's lower() leaves non-ASCII letters alone, so the prefix must too
+    assert await names(client, '/api/founders', name_prefix='é') == ['édith']
+    assert await names(client, '/api/founders', name_prefix='É') == ['Édouard']
+    assert await names(client, '/api/founders', name_prefix='E') == ['Eve']
+
+
+async def test_filters_on_tool_website_and_contact(seed, client):
+    profile = await seed.profile()
+    contacted = await seed.founder('Contacted')
+    await seed.founder('Untouched')
+    await seed.founder('Toolless', tool=False)
+    await seed.tool('Site', website_url='https://example.com')
+    await seed.outreach(contacted, profile)
+
+    assert await names(client, '/api/founders', has_tool=False) == ['Toolless']
+    assert await names(client, '/api/founders', contacted=True) == ['Contacted']
+    assert sorted(await names(client, '/api/founders', contacted=False)) == ['Toolless', 'Untouched']
+    assert await names(client, '/api/founders', latest_status='message_generated') == ['Contacted']
+    assert await names(client, '/api/tools', has_website=True) == ['Site']
+
+
+async def test_sorting_by_last_outreach_keeps_uncontacted_founders_lowest(seed, client):
+    profile = await seed.profile()
+    first, second = await seed.founder('First'), await seed.founder('Second')
+    await seed.founder('Never')
+    await seed.outreach(first, profile)
+    await seed.outreach(second, profile)
+
+    assert await names(client, '/api/founders', sort='last_outreach_at', order='desc') == ['Second', 'First', 'Never']
+    assert await names(client, '/api/founders', sort='last_outreach_at', order='asc') == ['Never', 'First', 'Second']
+
+
+async def test_pages_cover_every_row_once(seed, client):
+    for i in range(7):
+        await seed.founder('Same name', tool=False)
+
+    pages = [await client.get('/api/founders', params={'sort': 'founder_name', 'limit': 3, 'offset': offset})
+             for offset in (0, 3, 6)]
+
+    ids = [row['id'] for page in pages for row in page.json()]
+    assert len(ids) == len(set(ids)) == 7
+    assert all(page.headers['x-total-count'] == '7' for page in pages)
+
+
+def test_prefix_filter_ranges():
+    key = column('key')
+
+    assert str(prefix_filter(key, 'Ab')) == 'key >= :key_1 AND key < :key_2'
+    assert prefix_filter(key, 'Ab').compile().params == {'key_1': 'ab', 'key_2': 'ac'}
+    # Nothing sorts after the last code point, so there is no upper bound
+    assert str(prefix_filter(key, 'a' + chr(MAX_CODE_POINT))) == 'key >= :key_1'
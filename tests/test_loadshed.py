@@ -0,0 +1,73 @@
+import anyio
+import httpx
+import pytest
+
+from loadshed import HIGH, LOW, LoadSheddingMiddleware, Overloaded, PoolAdmission, classify
+
+pytestmark = pytest.mark.anyio
+
+
+def test_classify():
+    assert classify('GET', '/api/outreach') == LOW
+    assert classify('POST', '/api/outreach/generate') == HIGH
+    assert classify('GET', '/api/stats') == HIGH
+    assert classify('GET', '/api/health/ready') is None
+
+
+async def test_heavy_reads_are_capped_but_writes_still_get_in():
+    admission = PoolAdmission(capacity=2, heavy_limit=1, max_queue=5, max_wait=0.05)
+    await admission.acquire(LOW)
+
+    with pytest.raises(Overloaded):
+        await admission.acquire(LOW)
+    await admission.acquire(HIGH)
+
+    assert admission.in_flight == {HIGH: 1, LOW: 1}
+
+
+async def test_freed_slot_goes_to_a_waiting_write_first():
+    admission = PoolAdmission(capacity=1, heavy_limit=1, max_queue=5, max_wait=1)
+    await admission.acquire(HIGH)
+    order = []
+
+    async def wait(priority):
+        await admission.acquire(priority)
+        order.append(priority)
+
+    async with anyio.create_task_group() as group:
+        group.start_soon(wait, LOW)
+        group.start_soon(wait, HIGH)
+        await anyio.sleep(0.01)
+        admission.release(HIGH)
+        await anyio.sleep(0.01)
+        admission.release(order[0])
+
+    assert order == [HIGH, LOW]
+
+
+async def test_full_queue_is_shed_with_retry_after():
+    admission = PoolAdmission(capacity=1, heavy_limit=1, max_queue=0, max_wait=1)
+    await admission.acquire(HIGH)
+
+    with pytest.raises(Overloaded) as shed:
+        await admission.acquire(HIGH)
+
+    assert shed.value.retry_after >= 1
+    assert admission.snapshot()['classes'][HIGH]['shed'] == 1
+
+
+async def test_middleware_answers_503_when_overloaded():
+    async def endpoint(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+        await send({'type': 'http.response.body', 'body': b'ok'})
+
+    admission = PoolAdmission(capacity=1, heavy_limit=1, max_queue=0, max_wait=1)
+    await admission.acquire(HIGH)
+    transport = httpx.ASGITransport(app=LoadSheddingMiddleware(endpoint, admission))
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        shed = await client.get('/api/stats')
+        probe = await client.get('/api/health/live')
+
+    assert shed.status_code == 503
+    assert 'Retry-After' in shed.headers
+    assert probe.status_code == 200
@@ -0,0 +1,67 @@
+import io
+
+import pytest
+from alembic import command
+
+import migration_utils
+from tests.test_migrations import execute, scratch  # noqa: F401
+
+NORMALIZED_URLS = 'a3d7f0e85c14'
+BEFORE_NORMALIZED_URLS = '8e2f4c61a9b7'
+
+
+@pytest.fixture
+def tools(scratch):
+    command.upgrade(scratch, BEFORE_NORMALIZED_URLS)
+    execute(
+        scratch,
+        "INSERT INTO tools (id, tool_name, website_url) VALUES "
+        "('a', 'A', 'https://www.Example.com/'), ('b', 'B', NULL), ('c', 'C', 'http://other.io/path/')",
+    )
+    return scratch
+
+
+def test_backfill_fills_values_computed_in_python(tools):
+    command.upgrade(tools, NORMALIZED_URLS)
+
+    [rows] = execute(tools, "SELECT id, website_url_normalized IS NOT NULL FROM tools ORDER BY id")
+    assert rows == [('a', 1), ('b', 0), ('c', 1)]
+
+
+def test_dry_run_reports_and_rolls_everything_back(tools, monkeypatch):
+    monkeypatch.setenv('MIGRATION_DRY_RUN', '1')
+    monkeypatch.setattr(migration_utils, 'dry_run_report', [])
+
+    command.upgrade(tools, NORMALIZED_URLS)
+
+    operations = [entry['operation'] for entry in migration_utils.dry_run_report]
+    assert 'ADD COLUMN website_url_normalized' in operations
+    assert 'CREATE INDEX ix_tools_website_url_normalized' in operations
+    assert any(operation.startswith('backfill of tools') for operation in operations)
+    assert all(entry['rows'] == 3 for entry in migration_utils.dry_run_report if entry['table'] == 'tools')
+    assert migration_utils.estimated_total()['largest_table_rows'] == 3
+    columns, version = execute(tools, "PRAGMA table_info(tools)", "SELECT version_num FROM alembic_version")
+    assert 'website_url_normalized' not in {column[1] for column in columns}
+    assert version == [(BEFORE_NORMALIZED_URLS,)]
+
+
+def test_offline_sql_renders_every_revision(scratch, monkeypatch):
+    monkeypatch.setenv('DATABASE_URL', 'postgresql://migrations@localhost/outreach')
+    scratch.output_buffer = io.StringIO()
+
+    command.upgrade(scratch, 'head', sql=True)
+
+    sql = scratch.output_buffer.getvalue()
+    assert 'CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tools_website_url_normalized' in sql
+    assert 'UPDATE founders SET outreach_count=' in sql
+
+
+def test_estimated_total_sums_the_report():
+    report = [
+        {'rows': 10, 'blocking_seconds': 0.5, 'duration_seconds': 2.0},
+        {'rows': 40, 'blocking_seconds': 0.25, 'duration_seconds': 1.0},
+    ]
+
+    assert migration_utils.estimated_total(report) == {
+        'operations': 2, 'blocking_seconds': 0.75, 'duration_seconds': 3.0, 'largest_table_rows': 40
+    }
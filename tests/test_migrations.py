@@ -0,0 +1,93 @@
+import sqlite3
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+from tests.conftest import BACKEND_DIR
+
+
+@pytest.fixture
+def scratch(tmp_path, monkeypatch):
+    """Alembic config for an empty database of the test's own."""
+    path = tmp_path / 'migrations.db'
+    monkeypatch.setenv('DATABASE_URL', f'sqlite:///{path}')
+    config = Config()
+    config.set_main_option('script_location', str(BACKEND_DIR / 'alembic'))
+    config.attributes['path'] = path
+    return config
+
+
+def execute(config: Config, *statements: str) -> list:
+    connection = sqlite3.connect(config.attributes['path'])
+    try:
+        rows = [connection.execute(statement).fetchall() for statement in statements]
+        connection.commit()
+        return rows
+    finally:
+        connection.close()
+
+
+def test_uniqueness_migration_archives_older_duplicates(scratch):
+    command.upgrade(scratch, 'e5f19c7a2b43')
+    execute(
+        scratch,
+        "INSERT INTO tools (id, tool_name) VALUES ('t', 'Tool')",
+        "INSERT INTO founders (id, founder_name, tool_id) VALUES ('f', 'Founder', 't')",
+        "INSERT INTO facebook_profiles (id, profile_name) VALUES ('p', 'Profile')",
+        "INSERT INTO outreach_records (id, founder_id, tool_id, fb_profile_id, status, updated_at) VALUES "
+        "('old', 'f', 't', 'p', 'MESSAGE_SENT', '2026-01-01 00:00:00'), "
+        "('new', 'f', 't', 'p', 'REPLIED', '2026-02-01 00:00:00'), "
+        "('unset', 'f', 't', 'p', 'MESSAGE_GENERATED', NULL)",
+    )
+
+    command.upgrade(scratch, 'f2c84a9d5e61')
+
+    hot, archived, index = execute(
+        scratch,
+        "SELECT id FROM outreach_records",
+        "SELECT id FROM outreach_records_archive ORDER BY id",
+        "SELECT sql FROM sqlite_master WHERE name = 'uq_outreach_records_founder_id_fb_profile_id'",
+    )
+    assert hot == [('new',)]
+    assert archived == [('old',), ('unset',)]
+    assert index[0][0].startswith('CREATE UNIQUE INDEX')
+
+
+def test_summary_migration_backfills_from_hot_and_archived_records(scratch):
+    command.upgrade(scratch, '2b8e6f0c4d17')
+    execute(
+        scratch,
+        "INSERT INTO tools (id, tool_name) VALUES ('t', 'Tool')",
+        "INSERT INTO founders (id, founder_name, tool_id) VALUES ('f', 'Founder', 't'), ('idle', 'Idle', 't')",
+        "INSERT INTO facebook_profiles (id, profile_name) VALUES ('p', 'Profile'), ('q', 'Other')",
+        "INSERT INTO outreach_records (id, founder_id, tool_id, fb_profile_id, status, created_at) VALUES "
+        "('hot', 'f', 't', 'p', 'REPLIED', '2026-02-01 00:00:00')",
+        "INSERT INTO outreach_records_archive (id, founder_id, tool_id, fb_profile_id, status, created_at, archived_at) "
+        "VALUES ('cold', 'f', 't', 'q', 'CLOSED', '2026-01-01 00:00:00', '2026-03-01 00:00:00')",
+    )
+
+    command.upgrade(scratch, '6c3f9a2d8e14')
+
+    founders, profiles = execute(
+        scratch,
+        "SELECT id, outreach_count, last_outreach_at, latest_status FROM founders ORDER BY id",
+        "SELECT id, outreach_count, last_outreach_at FROM facebook_profiles ORDER BY id",
+    )
+    assert founders == [('f', 2, '2026-02-01 00:00:00', 'REPLIED'), ('idle', 0, None, None)]
+    assert profiles == [('p', 1, '2026-02-01 00:00:00'), ('q', 1, '2026-01-01 00:00:00')]
+
+
+def test_lead_urls_are_renormalized(scratch):
+    command.upgrade(scratch, '3f8a6d2c9e41')
+    execute(
+        scratch,
+        "INSERT INTO tools (id, tool_name, website_url, website_url_normalized) VALUES "
+        "('share', 'Share', 'https://dropbox.com/s/AbC', 'dropbox.com/s/abc'), "
+        "('page', 'Page', 'https://facebook.com/Acme', 'facebook.com/acme')",
+    )
+
+    command.upgrade(scratch, 'b71e4d9c2a58')
+
+    [rows] = execute(scratch, "SELECT id, website_url_normalized FROM tools ORDER BY id")
+    assert rows == [('page', 'facebook.com/acme'), ('share', 'dropbox.com/s/AbC')]
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def preview(client, template: dict, **body) -> list:
+    response = await client.post(f"/api/templates/{template['id']}/preview", json=body)
+    assert response.status_code == 200, response.text
+    assert response.headers['content-type'].startswith('application/x-ndjson')
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+async def test_renders_each_founder_and_counts_missing_values(seed, client):
+    template = await seed.template('Hi {founder_name}, {tool_description} {signature}')
+    described = await seed.founder('Ada', await seed.tool('Engine', tool_description='computes'))
+    await seed.founder('Grace', tool=False)
+
+    header, *rows, footer = await preview(client, template)
+
+    assert header == {
+        'template_id': template['id'],
+        'placeholders': ['founder_name', 'tool_description'],
+        'unknown_placeholders': ['signature'],
+    }
+    by_name = {row['founder_name']: row for row in rows}
+    assert by_name['Ada']['message'] == 'Hi Ada, computes {signature}'
+    assert by_name['Ada']['tool_id'] == described['tool_id']
+    assert by_name['Grace']['missing'] == ['tool_description']
+    assert footer == {'summary': {'rendered': 2, 'missing': {'founder_name': 0, 'tool_description': 1}}}
+
+
+async def test_filters_founders_and_writes_nothing(seed, client):
+    template = await seed.template()
+    founders = [await seed.founder(f'Founder {i}') for i in range(3)]
+
+    _, *rows, _ = await preview(client, template, founder_ids=[founders[0]['id']])
+    _, *without_tool, _ = await preview(client, template, has_tool=False)
+
+    assert [row['founder_id'] for row in rows] == [founders[0]['id']]
+    assert without_tool == []
+    assert (await client.get('/api/outreach', params={'limit': 50, 'offset': 0})).json() == []
+
+
+async def test_unknown_template_is_404(client):
+    response = await client.post('/api/templates/missing/preview', json={})
+
+    assert response.status_code == 404
@@ -0,0 +1,72 @@
+import warnings
+
+import pytest
+from sqlalchemy.exc import SAWarning
+
+pytestmark = pytest.mark.anyio
+
+
+async def claim(client, profile: dict, operator: str = 'ann'):
+    return await client.post('/api/outreach/next', params={'fb_profile_id': profile['id'], 'operator': operator})
+
+
+async def release(client, outreach_id: str, profile: dict, operator: str = 'ann'):
+    return await client.post(
+        f'/api/outreach/{outreach_id}/release', params={'fb_profile_id': profile['id'], 'operator': operator}
+    )
+
+
+async def test_claims_hand_out_the_oldest_unleased_record_once(seed, client):
+    profile = await seed.profile()
+    first = await seed.outreach(await seed.founder('First'), profile)
+    second = await seed.outreach(await seed.founder('Second'), profile)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', SAWarning)
+        claimed = [await claim(client, profile) for _ in range(3)]
+
+    assert [response.status_code for response in claimed] == [200, 200, 204]
+    assert [response.json()['id'] for response in claimed[:2]] == [first['id'], second['id']]
+
+
+async def test_budget_counts_outstanding_leases(seed, client):
+    profile = await seed.profile(sends_per_hour=1)
+    for name in ('First', 'Second'):
+        await seed.outreach(await seed.founder(name), profile)
+
+    assert (await claim(client, profile)).status_code == 200
+    response = await claim(client, profile)
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) > 0
+
+
+async def test_holder_releases_the_lease_for_the_next_claim(seed, client):
+    profile = await seed.profile()
+    outreach = await seed.outreach(await seed.founder(), profile)
+    await claim(client, profile)
+
+    response = await release(client, outreach['id'], profile)
+
+    assert response.status_code == 200
+    assert (await claim(client, profile, operator='bob')).json()['id'] == outreach['id']
+
+
+async def test_only_the_holder_can_release(seed, client):
+    profile, other_profile = await seed.profile('Mine'), await seed.profile('Other')
+    outreach = await seed.outreach(await seed.founder(), profile)
+    await claim(client, profile)
+
+    assert (await release(client, outreach['id'], profile, operator='bob')).status_code == 409
+    assert (await release(client, outreach['id'], other_profile)).status_code == 409
+    assert (await release(client, 'missing', profile)).status_code == 404
+    assert (await claim(client, profile, operator='bob')).status_code == 204
+
+
+async def test_sent_records_have_no_lease_to_release(seed, client):
+    profile = await seed.profile()
+    outreach = await seed.outreach(await seed.founder(), profile)
+    await claim(client, profile)
+    await seed.set_status(outreach, 'message_sent')
+
+    assert (await release(client, outreach['id'], profile)).status_code == 409
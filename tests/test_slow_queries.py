@@ -0,0 +1,54 @@
+import pytest
+
+from slow_queries import _explainable, fingerprint, redact, slow_query_log
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def log_everything(monkeypatch):
+    monkeypatch.setattr(slow_query_log, 'threshold_ms', 0)
+    slow_query_log.reset()
+    yield slow_query_log
+    slow_query_log.reset()
+
+
+async def test_statements_are_grouped_by_fingerprint_and_route(seed, client, log_everything):
+    tool = await seed.tool()
+    for _ in range(3):
+        await client.get(f"/api/tools/{tool['id']}")
+
+    response = await client.get('/api/_internal/slow-queries', params={'limit': 100})
+
+    assert response.status_code == 200
+    queries = response.json()['queries']
+    # The refresh after the INSERT runs the same statement
+    [lookup] = [query for query in queries if query['statement'].startswith('SELECT tools.id')]
+    assert lookup['statement'].endswith('WHERE tools.id = ?')
+    assert lookup['count'] == 4
+    assert lookup['routes'] == {'POST /api/tools': 1, 'GET /api/tools/{tool_id}': 3}
+    assert tool['id'] not in str(lookup)
+
+    assert (await client.delete('/api/_internal/slow-queries')).status_code == 204
+    assert slow_query_log.entries == {}
+
+
+def test_fingerprint_replaces_literals_and_placeholder_lists():
+    assert fingerprint("SELECT * FROM t WHERE a = 'x' AND b IN (?, ?, ?) -- note\nLIMIT 10") == \
+        fingerprint("select * FROM t WHERE a = 'yy' AND b IN (?, ?) LIMIT 20").replace('select', 'SELECT')
+    assert fingerprint("SELECT $1, %(name)s, :id") == 'SELECT ?, ?, ?'
+
+
+def test_only_plain_reads_are_explained():
+    assert _explainable("SELECT * FROM tools WHERE updated_at > ?")
+    assert _explainable("WITH recent AS (SELECT id FROM tools) SELECT * FROM recent WHERE note = 'delete me'")
+    assert not _explainable("SELECT * FROM jobs FOR UPDATE SKIP LOCKED")
+    assert not _explainable("WITH gone AS (DELETE FROM jobs RETURNING id) SELECT count(*) FROM gone")
+    assert not _explainable("with moved as (update tools set note = ? returning id) select * from moved")
+    assert not _explainable("UPDATE tools SET note = ?")
+
+
+def test_redact_keeps_only_shapes_of_text():
+    assert redact({'name': 'Ada Lovelace', 'count': 3, 'ids': ['a', 'bb']}) == {
+        'name': '<str:12>', 'count': 3, 'ids': ['<str:1>', '<str:2>']
+    }
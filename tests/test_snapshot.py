@@ -0,0 +1,90 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+# pyarrow is optional (see snapshot.py), so skip rather than fail without it
+pq = pytest.importorskip('pyarrow.parquet')
+
+import snapshot
+from archive import archive_closed_outreach
+from database import AsyncSessionLocal, ReadSessionLocal
+from snapshot import read_manifest, take_snapshot
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture(autouse=True)
+def settled(monkeypatch):
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_SETTLE', timedelta(0))
+
+
+def parquet_files(directory) -> set:
+    return {str(path.relative_to(directory)) for path in directory.rglob('*.parquet*')}
+
+
+async def test_full_then_incremental_snapshot(seed, client, tmp_path):
+    profile = await seed.profile()
+    kept = await seed.outreach(await seed.founder('Kept'), profile)
+    removed = await seed.outreach(await seed.founder('Removed'), profile)
+
+    full = await take_snapshot(ReadSessionLocal, full=True, batch_size=1, directory=tmp_path)
+    await asyncio.sleep(0.01)
+    await seed.set_status(kept, 'message_sent')
+    await client.delete(f"/api/outreach/{removed['id']}")
+    incremental = await take_snapshot(ReadSessionLocal, batch_size=1, directory=tmp_path)
+
+    assert (full['full'], full['rows'], full['deleted']) == (True, 2, 0)
+    assert (incremental['full'], incremental['rows'], incremental['deleted']) == (False, 1, 1)
+    manifest = read_manifest(tmp_path)
+    assert [entry['id'] for entry in manifest['snapshots']] == [full['id'], incremental['id']]
+    listed = {file['path'] for entry in manifest['snapshots'] for file in entry['files']}
+    assert parquet_files(tmp_path) == listed
+    [changed] = [file for file in incremental['files'] if file['path'].startswith('outreach/')]
+    assert pq.read_table(tmp_path / changed['path']).column('status').to_pylist() == ['message_sent']
+    [tombstones] = [file for file in incremental['files'] if file['path'].startswith('deletions/')]
+    assert pq.read_table(tmp_path / tombstones['path']).column('id').to_pylist() == [removed['id']]
+
+
+async def test_cascade_deleting_an_archived_record_leaves_a_tombstone(seed, client, tmp_path):
+    profile = await seed.profile()
+    founder = await seed.founder('Archived')
+    archived = await seed.outreach(founder, profile)
+    await seed.set_status(archived, 'closed')
+    await archive_closed_outreach(AsyncSessionLocal, older_than_days=0)
+    await take_snapshot(ReadSessionLocal, full=True, directory=tmp_path)
+
+    await asyncio.sleep(0.01)
+    await client.delete(f"/api/founders/{founder['id']}")
+    incremental = await take_snapshot(ReadSessionLocal, directory=tmp_path)
+
+    assert incremental['deleted'] == 1
+    [tombstones] = [file for file in incremental['files'] if file['path'].startswith('deletions/')]
+    assert pq.read_table(tmp_path / tombstones['path']).column('id').to_pylist() == [archived['id']]
+
+
+async def test_failed_manifest_leaves_no_files_behind(seed, client, tmp_path, monkeypatch):
+    profile = await seed.profile()
+    removed = await seed.outreach(await seed.founder('Removed'), profile)
+    await seed.outreach(await seed.founder('Kept'), profile)
+    await take_snapshot(ReadSessionLocal, full=True, directory=tmp_path)
+    before = parquet_files(tmp_path)
+    await asyncio.sleep(0.01)
+    await client.delete(f"/api/outreach/{removed['id']}")
+
+    def fail(directory, manifest):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(snapshot, '_write_manifest', fail)
+    with pytest.raises(OSError):
+        await take_snapshot(ReadSessionLocal, directory=tmp_path)
+
+    assert parquet_files(tmp_path) == before
+    assert len(read_manifest(tmp_path)['snapshots']) == 1
+
+
+async def test_nothing_to_do_before_the_watermark_moves(tmp_path, monkeypatch):
+    await take_snapshot(ReadSessionLocal, full=True, directory=tmp_path)
+    monkeypatch.setattr(snapshot, 'SNAPSHOT_SETTLE', timedelta(days=1))
+
+    assert (await take_snapshot(ReadSessionLocal, directory=tmp_path))['skipped']
@@ -0,0 +1,66 @@
+import pytest
+from sqlalchemy import text
+
+from archive import archive_closed_outreach
+from database import AsyncSessionLocal
+from summaries import rebuild_summaries
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_generate_returns_the_refreshed_founder(seed):
+    founder = await seed.founder()
+    profile = await seed.profile()
+    await seed.client.get(f"/api/founders/{founder['id']}")
+
+    outreach = await seed.outreach(founder, profile)
+
+    assert outreach['founder']['outreach_count'] == 1
+    assert outreach['founder']['latest_status'] == 'message_generated'
+    assert outreach['facebook_profile']['outreach_count'] == 1
+
+
+async def test_summaries_follow_status_changes_and_deletes(seed, client):
+    founder = await seed.founder()
+    first, second = await seed.profile('First'), await seed.profile('Second')
+    await seed.outreach(founder, first)
+    outreach = await seed.outreach(founder, second)
+
+    await seed.set_status(outreach, 'replied')
+    summary = (await client.get(f"/api/founders/{founder['id']}")).json()
+    assert (summary['outreach_count'], summary['latest_status']) == (2, 'replied')
+
+    await client.delete(f"/api/outreach/{outreach['id']}")
+    summary = (await client.get(f"/api/founders/{founder['id']}")).json()
+    assert (summary['outreach_count'], summary['latest_status']) == (1, 'message_generated')
+    assert (await client.get(f"/api/profiles/{second['id']}")).json()['outreach_count'] == 0
+
+
+async def test_archived_records_still_count(seed, client):
+    founder = await seed.founder()
+    outreach = await seed.outreach(founder, await seed.profile())
+    await seed.set_status(outreach, 'closed')
+    await archive_closed_outreach(AsyncSessionLocal, older_than_days=0)
+
+    summary = (await client.get(f"/api/founders/{founder['id']}")).json()
+
+    assert (summary['outreach_count'], summary['latest_status']) == (1, 'closed')
+
+
+async def test_rebuild_repairs_drifted_summaries(seed, client):
+    founders = [await seed.founder(f'Founder {i}') for i in range(3)]
+    profile = await seed.profile()
+    for founder in founders:
+        await seed.outreach(founder, profile)
+    async with AsyncSessionLocal() as session:
+        await session.execute(text("UPDATE founders SET outreach_count = 7, latest_status = NULL"))
+        await session.execute(text("UPDATE facebook_profiles SET outreach_count = 0"))
+        await session.commit()
+
+    totals = await rebuild_summaries(AsyncSessionLocal, batch_size=2)
+
+    assert totals == {'founders': 3, 'facebook_profiles': 1}
+    for founder in founders:
+        summary = (await client.get(f"/api/founders/{founder['id']}")).json()
+        assert (summary['outreach_count'], summary['latest_status']) == (1, 'message_generated')
+    assert (await client.get(f"/api/profiles/{profile['id']}")).json()['outreach_count'] == 3
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone, timedelta
+
+import pytest
+
+from sync import SyncCursor, decode_cursor, encode_cursor, encode_token
+
+pytestmark = pytest.mark.anyio
+
+
+async def sync_all(client, **params) -> list:
+    pages = []
+    while True:
+        response = await client.get('/api/sync', params=params)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        if pages[-1]['next_cursor'] is None:
+            return pages
+        params = {'cursor': pages[-1]['next_cursor'], 'limit': params.get('limit')}
+
+
+def ids(pages: list, section: str) -> list:
+    return [row['id'] for page in pages for row in page[section]]
+
+
+async def test_full_sync_is_paged_across_every_section(seed, client):
+    profile = await seed.profile()
+    founders = [await seed.founder(f'Founder {i}') for i in range(3)]
+    for founder in founders:
+        await seed.outreach(founder, profile)
+
+    pages = await sync_all(client, limit=2)
+
+    assert all(page['full'] for page in pages)
+    assert all(sum(len(page[name]) for name in ('tools', 'founders', 'profiles', 'templates', 'outreach')) <= 2
+               for page in pages)
+    assert sorted(ids(pages, 'founders')) == sorted(founder['id'] for founder in founders)
+    assert len(ids(pages, 'tools')) == 3
+    assert len(set(ids(pages, 'outreach'))) == 3
+    assert [page['token'] is not None for page in pages] == [False] * (len(pages) - 1) + [True]
+
+
+async def test_delta_sync_returns_changes_and_tombstones(seed, client):
+    kept, removed = await seed.tool('Kept'), await seed.tool('Removed')
+    token = (await sync_all(client))[-1]['token']
+
+    await client.put(f"/api/tools/{kept['id']}", json={'tool_name': 'Renamed'})
+    await client.delete(f"/api/tools/{removed['id']}")
+    pages = await sync_all(client, since=token, limit=1)
+
+    assert not pages[0]['full']
+    assert {tool['tool_name'] for page in pages for tool in page['tools']} >= {'Renamed'}
+    assert [(item['entity_type'], item['entity_id']) for page in pages for item in page['deleted']] == [
+        ('tool', removed['id'])
+    ]
+
+
+async def test_expired_token_falls_back_to_a_full_sync(seed, client):
+    await seed.tool()
+    stale = encode_token(datetime.now(timezone.utc) - timedelta(days=365))
+
+    page = (await client.get('/api/sync', params={'since': stale})).json()
+
+    assert page['full']
+    assert len(page['tools']) == 1
+
+
+async def test_rejects_bad_cursors(client):
+    assert (await client.get('/api/sync', params={'cursor': 'nonsense'})).status_code == 400
+    token = encode_token(datetime.now(timezone.utc))
+    cursor = encode_cursor(SyncCursor(datetime.now(timezone.utc), None, 0, None))
+    assert (await client.get('/api/sync', params={'since': token, 'cursor': cursor})).status_code == 400
+
+
+def test_cursor_round_trip():
+    now = datetime(2026, 10, 19, 8, 30, tzinfo=timezone.utc)
+    cursor = SyncCursor(now, now - timedelta(minutes=5), 5, (now, 42))
+
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+
+
+async def test_sync_items_leave_out_outreach_summaries(seed, client):
+    await seed.outreach(await seed.founder(), await seed.profile())
+
+    [page] = await sync_all(client)
+
+    assert page['founders'] and page['profiles']
+    for item in page['founders'] + page['profiles']:
+        assert 'outreach_count' not in item and 'last_outreach_at' not in item
@@ -0,0 +1,63 @@
+import pytest
+
+import tracing
+
+pytestmark = pytest.mark.anyio
+
+TRACE_ID = '4bf92f3577b34da6a3ce929d0e0e4736'
+
+
+@pytest.fixture
+def submitted(monkeypatch) -> list:
+    traces = []
+    monkeypatch.setattr(tracing, '_submit', traces.append)
+    return traces
+
+
+async def test_every_response_gets_a_trace_id(client, submitted):
+    response = await client.get('/api/tools')
+
+    assert len(response.headers['x-trace-id']) == 32
+    assert submitted == []
+
+
+async def test_sampled_traceparent_records_the_span_tree(seed, client, submitted):
+    tool = await seed.tool()
+
+    response = await client.get(
+        f"/api/tools/{tool['id']}", headers={'traceparent': f'00-{TRACE_ID}-00f067aa0ba902b7-01'}
+    )
+
+    assert response.headers['x-trace-id'] == TRACE_ID
+    [trace] = submitted
+    spans = {span.name: span for span in trace.spans}
+    root = trace.spans[0]
+    assert root.parent_id == '00f067aa0ba902b7'
+    assert root.attributes['http.route'] == '/api/tools/{tool_id}'
+    assert root.attributes['http.status_code'] == 200
+    assert spans['handler'].parent is spans['route /api/tools/{tool_id}']
+    assert spans['db.query'].parent is spans['handler']
+    assert spans['db.query'].attributes['db.operation'] == 'SELECT'
+    assert 'serialize' in spans
+    assert all(span.end_ns is not None for span in trace.spans)
+
+
+async def test_unsampled_traceparent_keeps_the_trace_id_only(client, submitted):
+    response = await client.get('/api/tools', headers={'traceparent': f'00-{TRACE_ID}-00f067aa0ba902b7-00'})
+
+    assert response.headers['x-trace-id'] == TRACE_ID
+    assert submitted == []
+
+
+def test_otlp_payload_marks_errors():
+    trace = tracing.Trace(TRACE_ID, sampled=True)
+    token = tracing._current_trace.set(trace)
+    try:
+        with pytest.raises(ValueError), tracing.span('work', rows=3):
+            raise ValueError('boom')
+    finally:
+        tracing._current_trace.reset(token)
+
+    [span] = tracing._otlp_payload([trace])['resourceSpans'][0]['scopeSpans'][0]['spans']
+    assert span['status'] == {'code': 2, 'message': 'ValueError: boom'}
+    assert span['attributes'] == [{'key': 'rows', 'value': {'intValue': '3'}}]
@@ -0,0 +1,61 @@
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from archive import archive_closed_outreach
+from database import AsyncSessionLocal
+from models import FacebookProfile, Founder
+from server import insert_outreach_rows, outreach_row
+
+pytestmark = pytest.mark.anyio
+
+
+async def uncontacted(client, profile: dict) -> list:
+    response = await client.get('/api/founders/uncontacted', params={'fb_profile_id': profile['id']})
+    assert response.status_code == 200
+    return [founder['founder_name'] for founder in response.json()]
+
+
+async def test_lists_founders_this_profile_has_not_messaged(seed, client):
+    mine, other = await seed.profile('Mine'), await seed.profile('Other')
+    messaged = await seed.founder('Messaged')
+    await seed.founder('Fresh')
+    await seed.founder('No tool', tool=False)
+    await seed.outreach(messaged, mine)
+    await seed.outreach(messaged, other)
+
+    assert await uncontacted(client, mine) == ['Fresh']
+
+
+async def test_archived_conversations_count_as_contacted(seed, client):
+    profile = await seed.profile()
+    founder = await seed.founder('Archived')
+    outreach = await seed.outreach(founder, profile)
+    await seed.set_status(outreach, 'closed')
+    await archive_closed_outreach(AsyncSessionLocal, older_than_days=0)
+
+    assert await uncontacted(client, profile) == []
+    response = await client.post(
+        '/api/outreach/generate', json={'founder_id': founder['id'], 'fb_profile_id': profile['id']}
+    )
+    assert response.status_code == 409
+
+
+async def test_bulk_generation_skips_archived_pairs(seed, client):
+    profile = await seed.profile()
+    archived_founder, fresh_founder = await seed.founder('Archived'), await seed.founder('Fresh')
+    outreach = await seed.outreach(archived_founder, profile)
+    await seed.set_status(outreach, 'closed')
+    await archive_closed_outreach(AsyncSessionLocal, older_than_days=0)
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(FacebookProfile).options(selectinload(FacebookProfile.template)).where(FacebookProfile.id == profile['id'])
+        )
+        fb_profile = result.scalar_one()
+        result = await session.execute(select(Founder).options(selectinload(Founder.tool)).order_by(Founder.founder_name))
+        rows = [outreach_row(founder, fb_profile) for founder in result.scalars().all()]
+        inserted = await insert_outreach_rows(session, rows)
+        await session.commit()
+
+    assert [row['founder_id'] for row in rows if row['id'] in inserted] == [fresh_founder['id']]
@@ -0,0 +1,52 @@
+import pytest
+
+from versioning import InvalidIfMatch, parse_if_match
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_updates_bump_the_version_and_etag(seed, client):
+    tool = await seed.tool()
+    assert (await client.get(f"/api/tools/{tool['id']}")).headers['etag'] == f'"{tool["version"]}"'
+
+    response = await client.put(f"/api/tools/{tool['id']}", json={'tool_name': 'Renamed'})
+
+    assert response.json()['version'] == tool['version'] + 1
+    assert response.headers['etag'] == f'"{tool["version"] + 1}"'
+
+
+async def test_stale_if_match_is_rejected_with_the_current_etag(seed, client):
+    tool = await seed.tool()
+    stale = f'"{tool["version"]}"'
+    await client.put(f"/api/tools/{tool['id']}", json={'tool_name': 'First'}, headers={'If-Match': stale})
+
+    response = await client.put(f"/api/tools/{tool['id']}", json={'tool_name': 'Second'}, headers={'If-Match': stale})
+
+    assert response.status_code == 409
+    assert response.headers['etag'] == f'"{tool["version"] + 1}"'
+    assert (await client.get(f"/api/tools/{tool['id']}")).json()['tool_name'] == 'First'
+
+
+async def test_version_in_the_body_works_like_if_match(seed, client):
+    founder = await seed.founder()
+    path = f"/api/founders/{founder['id']}"
+
+    assert (await client.put(path, json={'founder_name': 'A', 'version': founder['version']})).status_code == 200
+    assert (await client.put(path, json={'founder_name': 'B', 'version': founder['version']})).status_code == 409
+    disagree = await client.put(path, json={'founder_name': 'C', 'version': 1}, headers={'If-Match': '"2"'})
+    assert disagree.status_code == 400
+
+
+async def test_missing_rows_and_bad_headers(seed, client):
+    assert (await client.put('/api/tools/missing', json={'tool_name': 'x'}, headers={'If-Match': '"1"'})).status_code == 404
+    tool = await seed.tool()
+    response = await client.put(f"/api/tools/{tool['id']}", json={'tool_name': 'x'}, headers={'If-Match': 'nope'})
+    assert response.status_code == 400
+
+
+def test_parse_if_match():
+    assert parse_if_match(None) is None
+    assert parse_if_match('*') is None
+    assert parse_if_match('W/"7"') == 7
+    with pytest.raises(InvalidIfMatch):
+        parse_if_match('"abc"')